@@ -0,0 +1,220 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+"""
+Benchmark every GET endpoint (API and pages) against synthetic SeedboxSync databases.
+
+Usage:
+    python benchmarks/bench.py                          # 10k, 100k and 1M downloads
+    python benchmarks/bench.py --sizes 10000 --save     # Store the results as the new baseline
+
+Latencies (p50 / p95) and peak memory are compared to benchmarks/baseline.json,
+the exit code is 1 if an endpoint is slower or uses more memory than the tolerance.
+The baseline depends on the machine: save it before the change to measure.
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+import yaml
+from datetime import datetime
+from typing import Any
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from seedboxsync_front import create_app  # noqa: E402
+from seedboxsync_front.synthetic import generate  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'baseline.json')
+SIZES = [10000, 100000, 1000000]
+# Fixed dates of the synthetic data, to keep the databases comparable over time
+SPAN = (datetime(2018, 1, 1), datetime(2026, 1, 1))
+# Values of the URL arguments
+ARGUMENTS = {'id': 1, 'key': 'sync_seedbox'}
+# Other variants of the endpoints
+VARIANTS = [
+    '/api/v1/downloads?limit=1000',
+    '/api/v1/downloads?limit=1000&count=estimate',
+    '/api/v1/downloads?search=lorem%20ipsum',
+    '/api/v1/downloads?finished=false',
+    '/api/v1/uploads?limit=1000',
+    '/api/v1/downloads/export?format=csv',
+]
+# Endpoints reading the whole tables, measured less often
+SLOW = ('/export',)
+# Not measured: assets, documentation, debug, and the Server-Sent Events stream which never ends
+SKIPPED = ('static', 'dist', 'favicon', 'frontend.metrics', 'api.specs', 'api.doc', 'api.root', 'api.debug_slow_queries', 'api.events_events')
+
+
+def endpoints(app: Any) -> list[str]:
+    """
+    List the URLs of all the GET endpoints.
+
+    Args:
+        app (Flask): The Flask app.
+
+    Returns:
+        list[str]: The URLs, sorted.
+    """
+    urls = []
+    for rule in app.url_map.iter_rules():
+        if 'GET' not in (rule.methods or ()) or rule.endpoint in SKIPPED:
+            continue
+        if any(argument not in ARGUMENTS for argument in rule.arguments):
+            continue
+        urls.append(rule.build({argument: ARGUMENTS[argument] for argument in rule.arguments}, append_unknown=False)[1])
+
+    return sorted(urls) + VARIANTS
+
+
+def measure(client: Any, url: str, repeat: int) -> dict[str, Any]:
+    """
+    Measure an endpoint.
+
+    Args:
+        client (FlaskClient): The test client.
+        url (str): The URL.
+        repeat (int): Number of timed requests.
+
+    Returns:
+        dict[str, Any]: Status, p50 and p95 in ms, peak of the Python allocations in KiB.
+    """
+    response = client.get(url)  # Warm up
+    response.get_data()
+    status = response.status_code
+
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        client.get(url).get_data()
+        durations.append((time.perf_counter() - start) * 1000)
+
+    tracemalloc.start()
+    client.get(url).get_data()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    quantiles = statistics.quantiles(durations, n=20, method='inclusive') if len(durations) > 1 else durations * 19
+    return {
+        'status': status,
+        'p50': round(statistics.median(durations), 3),
+        'p95': round(quantiles[18], 3),
+        'peak': round(peak / 1024, 1),
+    }
+
+
+def run(size: int, repeat: int, cache_dir: str) -> dict[str, dict[str, Any]]:
+    """
+    Benchmark all the endpoints against a database.
+
+    Args:
+        size (int): Number of downloads.
+        repeat (int): Number of timed requests per endpoint.
+        cache_dir (str): Directory of the generated databases.
+
+    Returns:
+        dict[str, dict[str, Any]]: URL and its measures.
+    """
+    path = os.path.join(cache_dir, 'seedboxsync-{}.db'.format(size))
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        generate(path, size, start=SPAN[0], end=SPAN[1])
+        print('Built {} ({} downloads) in {:.1f}s'.format(path, size, time.perf_counter() - start))
+
+    with open(os.path.join(ROOT, 'tests', 'resources', 'seedboxsync.yml')) as f:
+        yaml_config = yaml.safe_load(f)
+    front_fd, front_path = tempfile.mkstemp(suffix='-front.db')
+    os.close(front_fd)
+    try:
+        app = create_app({
+            'DATABASE': path,
+            'FRONT_DATABASE': front_path,
+            'SECRET_KEY': 'benchmark',
+            'CACHE_TYPE': 'NullCache',  # Measure the work, not the cache
+            'BABEL_DEFAULT_LOCALE': 'en',
+            'CONFIG_YAML_PATH': os.path.join(ROOT, 'tests', 'resources', 'seedboxsync.yml'),
+        })
+        app.config.update(yaml_config)
+        client = app.test_client()
+
+        results = {}
+        for url in endpoints(app):
+            results[url] = measure(client, url, max(2, repeat // 10) if any(slow in url for slow in SLOW) else repeat)
+            print('{:>8} {:<60} {status:>4} p50 {p50:>9.2f} ms  p95 {p95:>9.2f} ms  peak {peak:>10.1f} KiB'.format(size, url, **results[url]))
+    finally:
+        os.unlink(front_path)
+
+    return results
+
+
+def compare(results: dict[str, dict[str, dict[str, Any]]], baseline: dict[str, dict[str, dict[str, Any]]], tolerance: float) -> list[str]:
+    """
+    Compare the results to the baseline.
+
+    Latencies under 1 ms are not compared, they are mostly noise.
+
+    Args:
+        results (dict[str, dict[str, dict[str, Any]]]): Size, URL and measures.
+        baseline (dict[str, dict[str, dict[str, Any]]]): Same structure, from a previous run.
+        tolerance (float): Accepted ratio (ex: 1.25 for 25% slower).
+
+    Returns:
+        list[str]: The regressions.
+    """
+    regressions = []
+    for size, urls in results.items():
+        for url, measures in urls.items():
+            reference = baseline.get(size, {}).get(url)
+            if reference is None:
+                continue
+            if measures['status'] != reference['status']:
+                regressions.append('{} {}: status {} instead of {}'.format(size, url, measures['status'], reference['status']))
+            for metric, floor in (('p50', 1.0), ('p95', 1.0), ('peak', 64.0)):
+                if measures[metric] > max(reference[metric], floor) * tolerance:
+                    regressions.append('{} {}: {} {} instead of {}'.format(size, url, metric, measures[metric], reference[metric]))
+
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the SeedboxSync front endpoints.')
+    parser.add_argument('--sizes', default=','.join(str(size) for size in SIZES), help='Number of downloads of the databases (default: %(default)s)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed requests per endpoint (default: %(default)s)')
+    parser.add_argument('--baseline', default=BASELINE, help='Baseline file (default: benchmarks/baseline.json)')
+    parser.add_argument('--tolerance', type=float, default=1.25, help='Accepted slowdown ratio (default: %(default)s)')
+    parser.add_argument('--save', action='store_true', help='Save the results as the new baseline')
+    parser.add_argument('--cache-dir', default=os.path.join(ROOT, '.benchmarks'), help='Directory of the generated databases')
+    args = parser.parse_args()
+
+    os.makedirs(args.cache_dir, exist_ok=True)
+    results = {size: run(int(size), args.repeat, args.cache_dir) for size in args.sizes.split(',')}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    if args.save:
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print('Baseline saved to {}'.format(args.baseline))
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print('REGRESSION ' + regression)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -12,11 +12,17 @@ from flask_babel import format_datetime
 from datetime import datetime
 from typing import Callable
 from seedboxsync_front.views import bp as bp_frontend, error as error_front
-from seedboxsync_front.apis import bp as bp_api, error as error_api
+from seedboxsync_front.apis import bp as bp_api, error as error_api, EventWatcher
 from seedboxsync_front.babel import babel, get_locale
 from seedboxsync_front.db import Database
+from seedboxsync_front.sidecar import Sidecar
 from seedboxsync_front.cache import cache
+from seedboxsync_front.cli import cli
+from seedboxsync_front.compress import Compress
 from seedboxsync_front.config import Config
+from seedboxsync_front.metrics import metrics
+from seedboxsync_front.slowlog import slow_queries
+from seedboxsync_front.timing import Timing
 from seedboxsync_front.__version__ import __version__ as version, __api_version__ as api_version, __api_path_version__ as api_path_version
 
 __version__ = version
@@ -67,12 +73,23 @@ def create_app(test_config: dict[str, str] | None = None) -> Flask:
     # Cache loading
     cache.init_app(app)
 
+    # Server-Timing, metrics and slow queries, before the DB to time the whole request
+    Timing(app)
+    metrics.init_app(app)
+    slow_queries.init_app(app)
+
     # DB loading
     Database(app)
+    Sidecar(app)
+    EventWatcher(app)
+
+    # Responses compression and built assets
+    Compress(app)
 
-    # Register blueprint and error handler
+    # Register blueprint, CLI and error handler
     app.register_blueprint(bp_frontend)
     app.register_blueprint(bp_api)
+    app.cli.add_command(cli)
     app.register_error_handler(Exception, __handle_http_exception)  # type: ignore[arg-type]
 
     # Favicon fix
@@ -5,13 +5,19 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
-from flask import Blueprint
+from flask import Blueprint, current_app, g, request, Response
 from flask_restx import Api
+from seedboxsync_front.cache import db_last_modified, versioned_etag
+from seedboxsync_front.compress import Compress
 from seedboxsync_front.__version__ import __api_version__ as api_version, __api_path_version__ as api_path_version
 from seedboxsync_front.apis.resources import DateTimeOrZero, Resource
+from seedboxsync_front.apis.serializer import output_fast_json
 from seedboxsync_front.apis.downloads import api as nsDownloads
 from seedboxsync_front.apis.locks import api as nsLocks
 from seedboxsync_front.apis.uploads import api as nsUploads
+from seedboxsync_front.apis.dashboard import api as nsDashboard
+from seedboxsync_front.apis.debug import api as nsDebug
+from seedboxsync_front.apis.events import api as nsEvents, EventWatcher
 
 bp = Blueprint('api', __name__, url_prefix=f'/api/{api_path_version}')
 
@@ -23,10 +29,68 @@ api = Api(
     description='REST API providing access to the SeedboxSync database and its resources.',
     validate=True,
 )
+api.representation('application/json')(output_fast_json)
 
 # Add namespaces
 api.add_namespace(nsDownloads)
 api.add_namespace(nsLocks)
 api.add_namespace(nsUploads)
+api.add_namespace(nsDashboard)
+api.add_namespace(nsDebug)
+api.add_namespace(nsEvents)
 
-__all__ = ['DateTimeOrZero', 'Resource']
+
+# Conditional requests
+@bp.before_request
+def check_conditional() -> Response | None:
+    """
+    Answer 304 to a conditional read request before executing it, if the database didn't change.
+
+    Returns:
+        Response | None: The 304 response, None to execute the request.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None
+    view = current_app.view_functions.get(str(request.endpoint))
+    if not getattr(getattr(view, 'view_class', None), 'conditional', True):
+        return None
+
+    g.etag = versioned_etag()
+    g.last_modified = db_last_modified()
+    etag = g.etag
+    if request.if_none_match:
+        # The compressed representations have their own ETag
+        matches = [e for e in Compress.encoded_etags(g.etag) if request.if_none_match.contains(e)]
+        not_modified = bool(matches)
+        etag = matches[0] if matches else etag
+    else:
+        not_modified = bool(request.if_modified_since and g.last_modified and g.last_modified <= request.if_modified_since)
+    if not not_modified:
+        return None
+
+    response = Response(status=304)
+    response.set_etag(etag)
+    response.last_modified = g.last_modified
+    response.cache_control.no_cache = True
+    return response
+
+
+@bp.after_request
+def set_conditional(response: Response) -> Response:
+    """
+    Add the validators of a read request, the client must revalidate them on each use.
+
+    Args:
+        response (Response): The response.
+
+    Returns:
+        Response: The response with ETag, Last-Modified and Cache-Control headers.
+    """
+    if response.status_code == 200 and 'etag' in g:
+        response.set_etag(g.etag)
+        response.last_modified = g.last_modified
+        response.cache_control.no_cache = True
+    return response
+
+
+__all__ = ['DateTimeOrZero', 'EventWatcher', 'Resource']
@@ -0,0 +1,76 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from flask_restx import fields, Namespace
+from typing import Any
+from seedboxsync.core.dao import Download, Lock, Torrent
+from seedboxsync_front.cache import versioned
+from seedboxsync_front.progress import rates
+from seedboxsync_front.apis import Resource
+from seedboxsync_front.apis.downloads import download_model, download_query, HUMANIZED_FIELDS
+from seedboxsync_front.apis.locks import lock_model
+from seedboxsync_front.apis.serializer import marshal_with
+from seedboxsync_front.apis.uploads import upload_model
+from seedboxsync_front.utils import humanize_rows
+
+api = Namespace('dashboard', description='Operations related to the homepage')
+
+# Locks shown on the homepage
+DASHBOARD_LOCKS = ('sync_blackhole', 'sync_seedbox')
+DASHBOARD_LIMIT = 5  # Rows per list
+
+
+# ==========================
+# Models
+# ==========================
+dashboard_model = api.model('Dashboard', {
+    'locks': fields.Nested(api.model('DashboardLocks', {
+        key: fields.Nested(lock_model, allow_null=True, description="The {} lock, null if never launched".format(key)) for key in DASHBOARD_LOCKS
+    }), required=True, description="The synchronization locks"),
+    'in_progress': fields.List(fields.Nested(download_model), required=True, description="Downloads in progress"),
+    'downloads': fields.List(fields.Nested(download_model), required=True, description="Last finished downloads"),
+    'uploads': fields.List(fields.Nested(upload_model), required=True, description="Last uploaded torrents"),
+})
+dashboard_envelope = Resource.build_envelope_model(api, 'Dashboard', nested_model=dashboard_model, as_list=False)
+
+
+# ==========================
+# Endpoints
+# ==========================
+@api.route('')
+class Dashboard(Resource):
+    """
+    Endpoint returning all the homepage widgets.
+    """
+
+    @versioned()
+    @api.doc('get_dashboard')  # type: ignore[untyped-decorator]
+    @marshal_with(api, dashboard_envelope, code=200, description="Homepage widgets")
+    def get(self) -> dict[str, Any]:
+        """
+        Retrieve the locks, the downloads in progress, the last downloads and the last uploads at once.
+
+        Same data as /locks/<key>, /downloads?finished=false, /downloads?finished=true and /uploads
+        with a limit of 5, read on one connection and cached until the database changes.
+        """
+        downloads = download_query().order_by(Download.finished.desc(), Download.id).limit(DASHBOARD_LIMIT)
+        uploads = Torrent.select(
+            Torrent.id,
+            Torrent.name,
+            Torrent.sent
+        ).order_by(Torrent.sent.desc(), Torrent.id).limit(DASHBOARD_LIMIT)
+
+        locks: dict[str, Any] = dict.fromkeys(DASHBOARD_LOCKS)
+        for lock in Lock.select(Lock.key, Lock.pid, Lock.locked, Lock.locked_at, Lock.unlocked_at).where(Lock.key.in_(DASHBOARD_LOCKS)).dicts():
+            locks[lock['key']] = lock
+
+        return self.build_envelope({
+            'locks': locks,
+            'in_progress': rates.annotate(humanize_rows(downloads.where(Download.finished == 0).dicts(), HUMANIZED_FIELDS)),
+            'downloads': humanize_rows(downloads.where(Download.finished != 0).dicts(), HUMANIZED_FIELDS),
+            'uploads': list(uploads.dicts()),
+        }, type='Dashboard')
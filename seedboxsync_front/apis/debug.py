@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from flask import current_app
+from flask_restx import abort, fields, Namespace
+from typing import Any
+from seedboxsync_front.apis import Resource
+from seedboxsync_front.slowlog import slow_queries
+
+api = Namespace('debug', description='Diagnostics, disabled by default')
+
+
+# ==========================
+# Models
+# ==========================
+slow_query_model = api.model('SlowQuery', {
+    'time': fields.DateTime(dt_format='iso8601', required=True, description="End of the query"),
+    'duration': fields.Float(required=True, description="Execution time in milliseconds", example=152.4),
+    'sql': fields.String(required=True, description="The query", example='SELECT "t1"."id" FROM "download" AS "t1" LIMIT ?'),
+    'params': fields.List(fields.Raw, required=True, description="Parameters of the query", example=[50]),
+    'endpoint': fields.String(required=False, description="Endpoint which executed the query", example="api.downloads_downloads_list"),
+    'plan': fields.List(fields.String, required=True, description="EXPLAIN QUERY PLAN, one step per line", example=["SCAN t1"]),
+})
+slow_query_list_envelope = Resource.build_envelope_model(api, 'SlowQueryList', nested_model=slow_query_model)
+
+
+# ==========================
+# Endpoints
+# ==========================
+@api.route('/slow-queries')
+@api.response(404, 'Slow query API disabled')
+class SlowQueries(Resource):
+    """
+    Endpoint to read the slow query log of the worker.
+    """
+
+    conditional = False  # Not stored in the database
+
+    @api.doc('list_slow_queries')  # type: ignore[untyped-decorator]
+    @api.marshal_with(slow_query_list_envelope, code=200, description="Slow queries of the worker")  # type: ignore[untyped-decorator]
+    def get(self) -> dict[str, Any]:
+        """
+        Retrieve the last queries slower than SLOW_QUERY_THRESHOLD, most recent first.
+
+        Only the queries of the worker answering the request are listed.
+        """
+        if not current_app.config.get('SLOW_QUERY_API'):
+            abort(404, 'Slow query API is disabled.')
+
+        data = list(reversed(slow_queries.entries))
+        return self.build_envelope(data, data_total=len(data), type='SlowQuery')
@@ -5,13 +5,21 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
-from flask_restx import fields, inputs, Namespace, reqparse
+from datetime import datetime, time, timedelta
+from flask import current_app, Response
+from flask_restx import abort, fields, inputs, Model, Namespace, reqparse
 from peewee import fn
 from typing import Any
-from seedboxsync_front.cache import cache
+from seedboxsync_front.cache import bump_generation, versioned
+from seedboxsync_front.export import export_response
+from seedboxsync_front.progress import rates
+from seedboxsync_front.rollup import aggregate_downloads, downloads_summary, forget_downloads, PERCENTILES, rollup_by_period, THROUGHPUT_BUCKETS, transfer_rates
+from seedboxsync_front.search import filter_search, forget_index
+from seedboxsync_front.tombstones import record_deletions
 from seedboxsync.core.dao import Download
 from seedboxsync_front.apis import DateTimeOrZero, Resource
-from seedboxsync_front.utils import byte_to_gi
+from seedboxsync_front.apis.serializer import marshal_with
+from seedboxsync_front.utils import byte_to_gi, humanize_rows, naturalsize
 
 api = Namespace('downloads', description='Operations related to download management')
 
@@ -19,7 +27,7 @@ api = Namespace('downloads', description='Operations related to download managem
 # ==========================
 # Models
 # ==========================
-download_model = api.model('Download', {
+download_model: Model = api.model('Download', {
     'id': fields.Integer(required=True, description="Unique identifier of the download record", example=999),
     'path': fields.String(required=True, description="Local path of the downloaded file", example="ConvallisMorbi.doc"),
     'started': fields.DateTime(dt_format='iso8601', required=True, description="Download start timestamp"),
@@ -29,11 +37,59 @@ download_model = api.model('Download', {
     'seedbox_size': fields.Integer(required=True, description="File size on seedbox storage in bytes", example=3337353289),
     'human_seedbox_size': fields.String(required=True, description="File size on seedbox storage with related humanization", example="3.1 GiB"),
     'progress': fields.Float(required=True, description="Download progress percentage", example=15.0),
+    'rate_bps': fields.Float(required=False, description="Smoothed transfer rate of a download in progress in bytes per second", example=5242880.0),
+    'eta_seconds': fields.Integer(required=False, description="Estimated seconds before the end of a download in progress", example=540),
 })
+# Exported columns, see DownloadsExport
+EXPORT_FIELDS = [Download.id, Download.path, Download.started, Download.finished, Download.local_size, Download.seedbox_size]
+# Humanized in a single pass after the query, see utils.humanize_rows()
+HUMANIZED_FIELDS = {'local_size': 'human_local_size', 'seedbox_size': 'human_seedbox_size'}
+
 download_list_envelope = Resource.build_envelope_model(api, 'DownloadList', nested_model=download_model)
 download_envelope = Resource.build_envelope_model(api, 'Download', nested_model=download_model, as_list=False)
 download_message_envelope = Resource.build_envelope_model(api, 'DownloadMessage', as_message=True)
 
+bulk_delete_request_model = api.model('DownloadBulkDeleteRequest', {
+    'ids': fields.List(fields.Integer, required=False, description="Identifiers of the downloads to delete", example=[12, 13]),
+    'search': fields.String(required=False, description="Delete the downloads matching this search string", example="Convallis"),
+    'finished_before': fields.DateTime(dt_format='iso8601', required=False, description="Delete the downloads finished before this date"),
+    'dry_run': fields.Boolean(required=False, default=False, description="Only count the downloads to delete", example=True),
+})
+bulk_delete_model = api.model('DownloadBulkDelete', {
+    'deleted': fields.Integer(required=True, description="Number of deleted downloads, or to delete with dry_run", example=42),
+    'dry_run': fields.Boolean(required=True, description="Nothing was deleted", example=False),
+})
+bulk_delete_envelope = Resource.build_envelope_model(api, 'DownloadBulkDelete', nested_model=bulk_delete_model, as_list=False)
+
+stats_summary_model = api.model('StatsSummary', {
+    'files': fields.Integer(required=True, description="Number of files downloaded", example=4989),
+    'total_size': fields.Integer(required=True, description="Total size of files downloaded on seedbox storage in bytes", example=1585267068834),
+    'human_total_size': fields.String(required=True, description="Total size of files downloaded with related humanization", example="1.4 TiB"),
+    'first': fields.DateTime(dt_format='iso8601', required=False, description="Completion timestamp of the first download"),
+    'last': fields.DateTime(dt_format='iso8601', required=False, description="Completion timestamp of the last download"),
+})
+stats_summary_envelope = Resource.build_envelope_model(api, 'StatsSummary', nested_model=stats_summary_model, as_list=False)
+
+stats_day_model = api.model('StatsDay', {
+    'files': fields.Integer(required=True, description="Number of files downloaded in the day", example=12),
+    'day': fields.String(required=True,
+                         description="Day of the statistics (format: yyyy-mm-dd)",
+                         pattern=r'^\d{4}-(0[1-9]|1[0-2])-\d{2}$',
+                         example="2025-08-14"),
+    'total_size': fields.String(required=True, description="Total size of files downloaded", example="38.2GiB"),
+})
+stats_day_envelope = Resource.build_envelope_model(api, 'StatsDay', nested_model=stats_day_model)
+
+stats_week_model = api.model('StatsWeek', {
+    'files': fields.Integer(required=True, description="Number of files downloaded in the week", example=31),
+    'week': fields.String(required=True,
+                          description="Year and week number of the statistics, weeks start on monday (format: yyyy-ww)",
+                          pattern=r'^\d{4}-[0-5]\d$',
+                          example="2025-32"),
+    'total_size': fields.String(required=True, description="Total size of files downloaded", example="97.4GiB"),
+})
+stats_week_envelope = Resource.build_envelope_model(api, 'StatsWeek', nested_model=stats_week_model)
+
 stats_month_model = api.model('StatsMonth', {
     'files': fields.Integer(required=True, description="Number of files downloaded in the month", example=135),
     'month': fields.String(required=True,
@@ -56,16 +112,73 @@ stats_year_model = api.model('StatsYear', {
 })
 stats_year_envelope = Resource.build_envelope_model(api, 'StatsYear', nested_model=stats_year_model)
 
+stats_throughput_file_model = api.model('StatsThroughputFile', {
+    'id': fields.Integer(required=True, description="Unique identifier of the download record", example=998),
+    'path': fields.String(required=True, description="Local path of the downloaded file", example="ConvallisMorbi.doc"),
+    'started': fields.DateTime(dt_format='iso8601', required=True, description="Download start timestamp"),
+    'finished': fields.DateTime(dt_format='iso8601', required=True, description="Download completion timestamp"),
+    'seedbox_size': fields.Integer(required=True, description="File size on seedbox storage in bytes", example=1670034538),
+    'duration': fields.Float(required=True, description="Transfer duration in seconds", example=2758.0),
+    'rate': fields.Float(required=True, description="Transfer rate in bytes per second", example=605523.76),
+    'human_rate': fields.String(required=True, description="Transfer rate with related humanization", example="591.3 KiB/s"),
+})
+stats_throughput_bucket_model = api.model('StatsThroughputBucket', {
+    'period': fields.String(required=True, description="Hour (format: yyyy-mm-dd hh:00) or day (format: yyyy-mm-dd) of the bucket", example="2025-03-14"),
+    'files': fields.Integer(required=True, description="Number of files downloaded in the bucket", example=3),
+    'size': fields.Integer(required=True, description="Size of the files downloaded in bytes", example=5372650008),
+    'duration': fields.Float(required=True, description="Sum of the transfer durations in seconds", example=8211.0),
+    'rate': fields.Float(required=True, description="Average transfer rate of a file (size / duration) in bytes per second", example=654323.7),
+    'throughput': fields.Float(required=True,
+                               description="Throughput of the link with the parallel transfers (size / time from the first start to the last end) in bytes/s",
+                               example=1308647.4),
+})
+stats_throughput_model = api.model('StatsThroughput', {
+    'start': fields.DateTime(dt_format='iso8601', required=True, description="Start of the range, included"),
+    'end': fields.DateTime(dt_format='iso8601', required=True, description="End of the range, excluded"),
+    'bucket': fields.String(required=True, description="Bucket of the aggregates", enum=['hour', 'day'], example="day"),
+    'rate': fields.Float(required=False, description="Average transfer rate of a file over the range in bytes per second", example=654323.7),
+    'human_rate': fields.String(required=False, description="Average transfer rate with related humanization", example="639.0 KiB/s"),
+    'percentiles': fields.Nested(api.model('StatsThroughputPercentiles', {
+        'p{}'.format(p): fields.Float(required=False, description="{}th percentile of the file transfer rates in bytes/s".format(p)) for p in PERCENTILES
+    }), required=True, description="Percentiles of the file transfer rates"),
+    'buckets': fields.List(fields.Nested(stats_throughput_bucket_model), required=True, description="Aggregates by bucket"),
+    'files': fields.List(fields.Nested(stats_throughput_file_model), required=True, description="Last downloaded files with their transfer rate"),
+})
+stats_throughput_envelope = Resource.build_envelope_model(api, 'StatsThroughput', nested_model=stats_throughput_model, as_list=False)
+
 
 # ==========================
 # Request parser
 # ==========================
 parser = reqparse.RequestParser()
 parser.add_argument('offset', type=int, default=0, location='args', help='Number of items to skip before starting to collect the result set (default: 0)')
+parser.add_argument('cursor', type=str, required=False, location='args', help='Cursor of the page to fetch (next_cursor of the previous page), replaces offset')
 parser.add_argument('limit', type=int, default=50, location='args', help='Maximum number of items to return (min=5, max=1000)')
 parser.add_argument('finished', type=inputs.boolean, default=None,
                     location='args', help='Filter only completed downloads (true) or in-progress downloads (false)')
-parser.add_argument('search', type=str, required=False, help='Optional search string to filter items')
+parser.add_argument('search', type=str, required=False, help='Optional search string to filter items (prefix matching on words)')
+parser.add_argument('count', type=str, default='exact', choices=('exact', 'estimate', 'none'), location='args',
+                    help='Compute data_total exactly (default), from a cached count (estimate) or not at all (none)')
+parser.add_argument('sort', type=str, default='date', choices=('date', 'rank'), location='args',
+                    help='Sort by date (default) or by relevance when searching (rank)')
+parser.add_argument('since', type=str, required=False, location='args',
+                    help='Watermark of the previous delta (0 the first time): only the downloads added or updated since, with the deleted ids')
+
+export_parser = reqparse.RequestParser()
+export_parser.add_argument('format', type=str, default='ndjson', choices=('ndjson', 'csv'), location='args', help='Export format (default: ndjson)')
+export_parser.add_argument('gzip', type=inputs.boolean, default=False, location='args', help='Compress the export with gzip (default: false)')
+export_parser.add_argument('finished', type=inputs.boolean, default=None,
+                           location='args', help='Filter only completed downloads (true) or in-progress downloads (false)')
+export_parser.add_argument('search', type=str, required=False, location='args', help='Optional search string to filter items (prefix matching on words)')
+
+throughput_parser = reqparse.RequestParser()
+throughput_parser.add_argument('start', type=str, required=False, location='args',
+                               help='Start of the range, included (ISO 8601, default: 30 days before end)')
+throughput_parser.add_argument('end', type=str, required=False, location='args',
+                               help='End of the range, excluded (ISO 8601, default: the day after the last finished download)')
+throughput_parser.add_argument('bucket', type=str, default='day', choices=tuple(THROUGHPUT_BUCKETS), location='args',
+                               help='Aggregate by hour or by day (default)')
+throughput_parser.add_argument('limit', type=int, default=50, location='args', help='Maximum number of files to return (min=5, max=1000)')
 
 
 # ==========================
@@ -79,41 +192,55 @@ class DownloadsList(Resource):
     Provides a list of downloads with optional filtering for in-progress or completed files.
     """
 
+    @versioned()
     @api.doc('list_downloads')  # type: ignore[untyped-decorator]
     @api.expect(parser)  # type: ignore[untyped-decorator]
-    @api.marshal_with(download_list_envelope, code=200, description="List of downloads")  # type: ignore[untyped-decorator]
+    @marshal_with(api, download_list_envelope, code=200, description="List of downloads")
     def get(self) -> dict[str, Any]:
         """
         Retrieve a list of recent downloads.
 
         Query Parameters:
         - offset: Number of items to skip before starting to collect the result set (default: 0)
+        - cursor: Cursor of the page to fetch (next_cursor of the previous page), replaces offset
         - limit: Maximum number of downloads to return (default=50)
         - search: Optional search string to filter items
+        - sort: Sort by date (default) or by relevance when searching (rank)
+        - count: Compute data_total exactly (default), from a cached count (estimate) or not at all (none)
+        - since: Watermark of the previous delta (0 the first time), returns the downloads added or updated since ordered by id,
+                 the watermark of the next delta and the ids deleted by the front (tombstones)
         - finished: Filter downloads by status (false=in-progress, true=finished)
         """
         args = parser.parse_args()
         offset = args.get('offset')
+        cursor = args.get('cursor')
         limit = self.set_limit(args.get('limit'))
         search = args.get('search')
+        sort = args.get('sort')
+        count_mode = args.get('count')
+        since = args.get('since')
         finished = args.get('finished')
+        if cursor and sort == 'rank':
+            abort(400, 'Cursor pagination is not available when sorting by rank.')
+        if since and (cursor or search or finished is not None):
+            abort(400, 'The since argument can not be combined with cursor, search or finished.')
 
         count = Download.select()
-        select = Download.select(
-            Download.id,
-            Download.path,
-            Download.started,
-            Download.finished,
-            Download.local_size,
-            Download.seedbox_size,
-            fn.humanize(Download.local_size).alias('human_local_size'),
-            fn.humanize(Download.seedbox_size).alias('human_seedbox_size'),
-            fn.round((Download.local_size.cast('REAL') / Download.seedbox_size.cast('REAL')) * 100, 2).alias('progress')
-        ).limit(limit).offset(offset).order_by(Download.finished.desc())
+        select = download_query()
+        if since:
+            data, watermark, tombstones = self.delta(select, since, limit, Download.finished)
+            return self.build_envelope(rates.annotate(humanize_rows(data, HUMANIZED_FIELDS)), watermark=watermark, tombstones=tombstones, type='Download')
+        select = select.limit(limit)
 
         if search:
-            count = count.where(Download.path.contains(search))
-            select = select.where(Download.path.contains(search))
+            count = filter_search(count, Download, search)
+            select = filter_search(select, Download, search, ranked=(sort == 'rank'))
+        # id is the tie-breaker of the keyset, in-progress downloads all share finished = 0
+        select = select.order_by_extend(Download.finished.desc(), Download.id)
+        if cursor:
+            select = self.seek(select, cursor, Download.finished, Download.id)
+        else:
+            select = select.offset(offset)
 
         if finished is not None:
             # Filter downloads by completion status
@@ -124,7 +251,83 @@ class DownloadsList(Resource):
                 count = count.where(Download.finished == 0)
                 select = select.where(Download.finished == 0)
 
-        return self.build_envelope(list(select.dicts()), data_total=count.count(), type='Download')
+        data = rates.annotate(humanize_rows(select.dicts(), HUMANIZED_FIELDS))
+        next_cursor = self.next_cursor(data, limit, 'finished') if sort != 'rank' else None
+        return self.build_envelope(data, data_total=self.count(count, count_mode, search=search, finished=finished),
+                                   data_total_estimated=(count_mode == 'estimate'), next_cursor=next_cursor, type='Download')
+
+
+@api.route('/export')
+class DownloadsExport(Resource):
+    """
+    Endpoint to export the whole downloads history.
+    """
+
+    @api.doc('export_downloads')  # type: ignore[untyped-decorator]
+    @api.expect(export_parser)  # type: ignore[untyped-decorator]
+    @api.produces(['application/x-ndjson', 'text/csv', 'application/gzip'])  # type: ignore[untyped-decorator]
+    @api.response(200, 'Downloads history, one download per line')  # type: ignore[untyped-decorator]
+    def get(self) -> Response:
+        """
+        Stream all the downloads, from the most recent, in NDJSON or CSV.
+
+        Query Parameters:
+        - format: Export format, ndjson (default) or csv
+        - gzip: Compress the export with gzip (default: false)
+        - search: Optional search string to filter items
+        - finished: Filter downloads by status (false=in-progress, true=finished)
+        """
+        args = export_parser.parse_args()
+        search = args.get('search')
+        finished = args.get('finished')
+
+        select = Download.select(*EXPORT_FIELDS)
+        if search:
+            select = filter_search(select, Download, search)
+        if finished is not None:
+            select = select.where(Download.finished != 0) if finished else select.where(Download.finished == 0)
+        select = select.order_by(Download.finished.desc(), Download.id)
+
+        return export_response(select.tuples(), [field.name for field in EXPORT_FIELDS], 'downloads',
+                               format=args.get('format'), compress=args.get('gzip'))
+
+
+@api.route('/bulk-delete')
+@api.response(400, 'No criteria')
+class DownloadsBulkDelete(Resource):
+    """
+    Endpoint to delete many downloads at once.
+    """
+
+    @api.doc('bulk_delete_downloads')  # type: ignore[untyped-decorator]
+    @api.expect(bulk_delete_request_model, validate=True)  # type: ignore[untyped-decorator]
+    @api.marshal_with(bulk_delete_envelope, code=200, description="Downloads deleted")  # type: ignore[untyped-decorator]
+    def post(self) -> dict[str, Any]:
+        """
+        Delete the downloads matching all the given criteria, in a single transaction.
+
+        Body Parameters:
+        - ids: Identifiers of the downloads to delete
+        - search: Delete the downloads matching this search string
+        - finished_before: Delete the downloads finished before this date
+        - dry_run: Only count the downloads to delete
+        """
+        payload = api.payload or {}
+        ids = payload.get('ids')
+        search = payload.get('search')
+        finished_before = self.parse_datetime(payload, 'finished_before')
+        dry_run = bool(payload.get('dry_run'))
+        if ids is None and not search and finished_before is None:
+            abort(400, 'At least one of ids, search or finished_before is required.')
+
+        select = Download.select(Download.id)
+        if search:
+            select = filter_search(select, Download, search)
+        if finished_before is not None:
+            select = select.where(Download.finished != 0, Download.finished < finished_before)
+
+        deleted = self.bulk_delete(select, ids=ids, dry_run=dry_run, around_delete=forget_downloads)
+        return self.build_envelope({'deleted': deleted, 'dry_run': dry_run}, type='DownloadBulkDelete')
 
 
 @api.route('/progress')
@@ -138,8 +341,7 @@ class DownloadsProgress(Resource):
         """
         Delete progress downloads.
         """
-
-        count = Download.delete().where(Download.finished == 0).execute()
+        count = self.bulk_delete(Download.select(Download.id).where(Download.finished == 0), around_delete=forget_downloads)
         return self.build_envelope(None, type='Download', message=f'{count} download(s) deleted.')
 
 
@@ -160,21 +362,11 @@ class Downloads(Resource):
         Retrieve a download.
         """
         try:
-            select = Download.select(
-                Download.id,
-                Download.path,
-                Download.started,
-                Download.finished,
-                Download.local_size,
-                Download.seedbox_size,
-                fn.humanize(Download.local_size).alias('human_local_size'),
-                fn.humanize(Download.seedbox_size).alias('human_seedbox_size'),
-                fn.round((Download.local_size.cast('REAL') / Download.seedbox_size.cast('REAL')) * 100, 2).alias('progress')
-            ).where(Download.id == id).dicts().get()
+            select = download_query().where(Download.id == id).dicts().get()
         except Download.DoesNotExist:
             api.abort(404, "Download {} doesn't exist".format(id))
 
-        return self.build_envelope(select, type='Download')
+        return self.build_envelope(rates.annotate(humanize_rows([select], HUMANIZED_FIELDS))[0], type='Download')
 
     @api.doc('delete_download')  # type: ignore[untyped-decorator]
     @api.marshal_with(download_message_envelope, code=200, description="Delete download element")  # type: ignore[untyped-decorator]
@@ -182,20 +374,82 @@ class Downloads(Resource):
         """
         Retrieve a download.
         """
-        count = Download.delete().where(Download.id == id).execute()
-        if count == 0:
+        self.check_writable()
+        if not Download.select().where(Download.id == id).exists():
             api.abort(404, "Download {} doesn't exist".format(id))
 
+        with forget_downloads([id]):
+            Download.delete().where(Download.id == id).execute()
+        record_deletions(Download, [id])
+        forget_index(Download, [id])
+        bump_generation()
+
         return self.build_envelope(None, type='Download', message='Download {} deleted.'.format(id))
 
 
+@api.route('/stats/summary')
+class DownloadsStatsSummary(Resource):
+    """
+    Endpoint to retrieve the summary of the download statistics.
+    """
+
+    @versioned()
+    @api.doc('stats_downloads_summary')  # type: ignore[untyped-decorator]
+    @api.marshal_with(stats_summary_envelope, code=200, description="Summary of the finished downloads")  # type: ignore[untyped-decorator]
+    def get(self) -> dict[str, Any]:
+        """
+        Return the summary of the finished downloads.
+
+        Returns the number of files, the total size and the first and last completion dates.
+        """
+        summary = dict(downloads_summary())
+        summary['human_total_size'] = naturalsize(summary['total_size'])
+        return self.build_envelope(summary, type='StatsSummary')
+
+
+@api.route('/stats/day')
+class DownloadsStatsByDay(Resource):
+    """
+    Endpoint to retrieve daily download statistics.
+    """
+
+    @versioned()
+    @api.doc('stats_downloads_by_day')  # type: ignore[untyped-decorator]
+    @api.marshal_with(stats_day_envelope, code=200, description="Download statistics aggregated by day")  # type: ignore[untyped-decorator]
+    def get(self) -> dict[str, Any]:
+        """
+        Return download statistics grouped by day.
+
+        Returns the number of files downloaded and total size per day.
+        """
+        return self.build_envelope(stats_by_period('day'), type='StatsDay')
+
+
+@api.route('/stats/week')
+class DownloadsStatsByWeek(Resource):
+    """
+    Endpoint to retrieve weekly download statistics.
+    """
+
+    @versioned()
+    @api.doc('stats_downloads_by_week')  # type: ignore[untyped-decorator]
+    @api.marshal_with(stats_week_envelope, code=200, description="Download statistics aggregated by week")  # type: ignore[untyped-decorator]
+    def get(self) -> dict[str, Any]:
+        """
+        Return download statistics grouped by week.
+
+        Returns the number of files downloaded and total size per week.
+        """
+        return self.build_envelope(stats_by_period('week'), type='StatsWeek')
+
+
 @api.route('/stats/month')
 class DownloadsStatsByMonth(Resource):
     """
     Endpoint to retrieve monthly download statistics.
     """
 
-    @cache.cached(timeout=3600)
+    @versioned()
     @api.doc('stats_downloads_by_month')  # type: ignore[untyped-decorator]
     @api.marshal_with(stats_month_envelope, code=200, description="Download statistics aggregated by month")  # type: ignore[untyped-decorator]
     def get(self) -> dict[str, Any]:
@@ -213,7 +467,7 @@ class DownloadsStatsByYear(Resource):
     Endpoint to retrieve yearly download statistics.
     """
 
-    @cache.cached(timeout=3600)
+    @versioned()
     @api.doc('stats_downloads_by_year')  # type: ignore[untyped-decorator]
     @api.marshal_with(stats_year_envelope, code=200, description="Download statistics aggregated by year")  # type: ignore[untyped-decorator]
     def get(self) -> dict[str, Any]:
@@ -225,45 +479,104 @@ class DownloadsStatsByYear(Resource):
         return self.build_envelope(stats_by_period('year'), type='StatsYear')
 
 
+@api.route('/stats/throughput')
+class DownloadsStatsThroughput(Resource):
+    """
+    Endpoint to retrieve the transfer rates of the downloads.
+    """
+
+    @versioned()
+    @api.doc('stats_downloads_throughput')  # type: ignore[untyped-decorator]
+    @api.expect(throughput_parser)  # type: ignore[untyped-decorator]
+    @api.marshal_with(stats_throughput_envelope, code=200, description="Transfer rates of the downloads")  # type: ignore[untyped-decorator]
+    def get(self) -> dict[str, Any]:
+        """
+        Return the transfer rates of the downloads finished in a time range.
+
+        Returns the rate of the last files, the rate and throughput by hour or day and the p50, p90 and p99 file rates.
+        Rates are computed from the start and completion timestamps, so the throughput of a bucket
+        shows the gain of parallel transfers (max_concurrent_prefetch_requests).
+        """
+        args = throughput_parser.parse_args()
+        end = self.parse_datetime(args, 'end')
+        if end is None:
+            last = downloads_summary()['last'] or datetime.now()
+            end = datetime.combine(last.date() + timedelta(days=1), time())
+        start = self.parse_datetime(args, 'start') or end - timedelta(days=30)
+        if start >= end:
+            abort(400, 'The start of the range must be before its end.')
+
+        stats = transfer_rates(start, end, args['bucket'], self.set_limit(args['limit']))
+        for row in stats['files']:
+            row['human_rate'] = human_rate(row['rate'])
+        if stats['rate'] is not None:
+            stats['human_rate'] = human_rate(stats['rate'])
+        stats.update(start=start, end=end, bucket=args['bucket'])
+
+        return self.build_envelope(stats, type='StatsThroughput')
+
+
 # ==========================
 # Utility functions
 # ==========================
 def stats_by_period(period: str) -> list[dict[str, str | float]]:
     """
-    Compute aggregated download statistics by period (month or year).
+    Compute aggregated download statistics by period (day, week, month or year).
+
+    Read from the per day rollup of the front database when available, else
+    aggregated in SQL.
 
     Args:
-        period (str): Aggregation period, either 'month' or 'year'.
+        period (str): Aggregation period, either 'day', 'week', 'month' or 'year'.
 
     Returns:
         list[dict[str, str | float]]: List of statistics including period, number of files,
                                       and total size.
     """
-    strftime_format = "%Y-%m" if period == "month" else "%Y"
-
-    data = Download.select(
-        Download.id,
-        Download.finished,
-        fn.strftime(strftime_format, Download.finished).alias(period),
-        Download.seedbox_size,
-    ).where(Download.finished != 0).order_by(Download.finished.desc()).dicts()
-
-    tmp = {}
-    for download in data:
-        key = download[period]
-        size = download['seedbox_size']
-        if not key or not size:
-            continue
-        if key not in tmp:
-            tmp[key] = {"files": 0, "total_size": 0.0}
-        tmp[key]["files"] += 1
-        tmp[key]["total_size"] += size
+    if current_app.config.get('STATS_ROLLUP'):
+        rows = rollup_by_period(period)
+    else:
+        rows = aggregate_downloads(period)
 
     return [
         {
             period: key,
-            "files": tmp[key]["files"],
-            "total_size": byte_to_gi(tmp[key]["total_size"]),
+            "files": files,
+            "total_size": byte_to_gi(seedbox_size),
         }
-        for key in sorted(tmp)
+        for key, files, seedbox_size, _ in rows
     ]
+
+
+def download_query() -> Any:
+    """
+    Select the columns of download_model, with the progress in percent.
+
+    Shared by the lists, the dashboard and the events, the rows are then
+    humanized (HUMANIZED_FIELDS) and annotated by progress.rates.
+
+    Returns:
+        ModelSelect: The query, without filter nor order.
+    """
+    return Download.select(
+        Download.id,
+        Download.path,
+        Download.started,
+        Download.finished,
+        Download.local_size,
+        Download.seedbox_size,
+        fn.round((Download.local_size.cast('REAL') / Download.seedbox_size.cast('REAL')) * 100, 2).alias('progress')
+    )
+
+
+def human_rate(rate: float) -> str:
+    """
+    Humanize a transfer rate in bytes per second (e.g. 3.1 MiB/s).
+
+    Args:
+        rate (float): Transfer rate in bytes per second.
+
+    Returns:
+        str: The humanized rate.
+    """
+    return '{}/s'.format(naturalsize(rate))
@@ -8,15 +8,17 @@
 import uuid
 from flask import jsonify, Response
 from flask_babel import gettext
-from werkzeug.exceptions import BadRequest, HTTPException, NotFound
+from werkzeug.exceptions import BadRequest, Forbidden, Gone, HTTPException, NotFound
 from datetime import datetime
 from typing import Any
 from seedboxsync_front.apis import api
 
 
 @api.errorhandler(BadRequest)  # type: ignore[untyped-decorator]
+@api.errorhandler(Forbidden)  # type: ignore[untyped-decorator]
 @api.errorhandler(NotFound)  # type: ignore[untyped-decorator]
-def api_errorhandler(error: BadRequest | NotFound) -> tuple[dict[str, Any], int]:
+@api.errorhandler(Gone)  # type: ignore[untyped-decorator]
+def api_errorhandler(error: BadRequest | Forbidden | NotFound | Gone) -> tuple[dict[str, Any], int]:
     """
     API error handler.
     :param e: Exception
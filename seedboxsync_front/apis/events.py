@@ -0,0 +1,253 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import contextlib
+import json
+import queue
+import threading
+import time
+from flask import current_app, Flask, Response
+from flask_restx import abort, Namespace
+from typing import Any, Iterator
+from seedboxsync.core.dao import Download, Lock
+from seedboxsync_front.cache import db_generation
+from seedboxsync_front.progress import rates
+from seedboxsync_front.apis import Resource
+from seedboxsync_front.apis.downloads import download_model, download_query, HUMANIZED_FIELDS
+from seedboxsync_front.apis.locks import lock_model
+from seedboxsync_front.apis.serializer import compile_model
+from seedboxsync_front.utils import humanize_rows
+
+api = Namespace('events', description='Live updates of the downloads in progress and of the locks')
+
+# Locks followed by the stream
+EVENTS_LOCKS = ('sync_blackhole', 'sync_seedbox')
+EVENTS_BUFFER = 100  # Messages queued per client before dropping it
+EVENTS_MAX_ROWS = 1000  # Downloads in progress sent
+
+serialize_download = compile_model(download_model)
+serialize_lock = compile_model(lock_model)
+
+
+class Subscriber(object):
+    """
+    A client of the stream.
+
+    Attributes:
+        queue (queue.Queue[str]): Messages to send, already encoded.
+        dropped (bool): True if the client was too slow and must reconnect.
+    """
+
+    def __init__(self) -> None:
+        self.queue: queue.Queue[str] = queue.Queue(maxsize=EVENTS_BUFFER)
+        self.dropped = False
+
+
+class EventWatcher(object):
+    """
+    Watch the SeedboxSync database and push the changes to the clients of /api/v1/events.
+
+    A single thread per worker, started with the first client and stopped with
+    the last one, checks the database generation every EVENTS_INTERVAL seconds.
+    On a new generation it reads the downloads in progress and the locks once,
+    and sends only what changed to all the clients.
+
+    Attributes:
+        subscribers (set[Subscriber]): The connected clients.
+        generation (str | None): Database generation of the current state, None if not read yet.
+        downloads (dict[int, dict[str, Any]]): Downloads in progress, serialized as by the API.
+        locks (dict[str, dict[str, Any] | None]): Followed locks, None if they don't exist.
+    """
+
+    def __init__(self, app: Flask):
+        self.__app = app
+        self.__lock = threading.RLock()
+        self.__thread: threading.Thread | None = None
+        self.subscribers: set[Subscriber] = set()
+        self.generation: str | None = None
+        self.downloads: dict[int, dict[str, Any]] = {}
+        self.locks: dict[str, dict[str, Any] | None] = {}
+        app.extensions['seedboxsync_events'] = self
+
+    def subscribe(self) -> Subscriber:
+        """
+        Register a client, its first message is a snapshot of the current state.
+
+        Returns:
+            Subscriber: The client.
+        """
+        subscriber = Subscriber()
+        with self.__lock:
+            if self.generation is None:
+                self.poll()
+            subscriber.queue.put(self.message('snapshot', {'downloads': list(self.downloads.values()), 'locks': self.locks}))
+            self.subscribers.add(subscriber)
+            if self.__thread is None:
+                self.__thread = threading.Thread(target=self.run, name='seedboxsync-events', daemon=True)
+                self.__thread.start()
+
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        """
+        Forget a client.
+
+        Args:
+            subscriber (Subscriber): The client.
+        """
+        with self.__lock:
+            self.subscribers.discard(subscriber)
+
+    def run(self) -> None:
+        """
+        Body of the watcher thread, until the last client leaves.
+        """
+        while True:
+            time.sleep(self.__app.config['EVENTS_INTERVAL'])
+            with self.__lock:
+                if not self.subscribers:
+                    # The state will be outdated, read it again for the next client
+                    self.__thread = None
+                    self.generation = None
+                    return
+                try:
+                    self.poll()
+                except Exception:
+                    self.__app.logger.exception('Unable to read the events')
+
+    def poll(self) -> None:
+        """
+        Read the state if the database generation changed, and send the differences.
+        """
+        with self.__app.app_context():
+            # The request of the first client has a connection, the watcher thread opens its own
+            database = self.__app.extensions['seedboxsync_db'].db
+            with database.connection_context() if database.is_closed() else contextlib.nullcontext():
+                generation = db_generation()
+                if generation == self.generation:
+                    return
+                downloads, locks = self.read()
+
+        with self.__lock:
+            changed = [row for id, row in downloads.items() if self.downloads.get(id) != row]
+            removed = [id for id in self.downloads if id not in downloads]
+            if self.generation is not None and (changed or removed):
+                self.publish('downloads', {'changed': changed, 'removed': removed})
+            for key, lock in locks.items():
+                if self.generation is not None and self.locks.get(key) != lock:
+                    self.publish('lock', {'key': key, 'lock': lock})
+            self.generation, self.downloads, self.locks = generation, downloads, locks
+
+    def read(self) -> tuple[dict[int, dict[str, Any]], dict[str, dict[str, Any] | None]]:
+        """
+        Read the downloads in progress and the followed locks.
+
+        Returns:
+            tuple[dict[int, dict[str, Any]], dict[str, dict[str, Any] | None]]: Downloads by id and locks by key.
+        """
+        select = download_query().where(Download.finished == 0).order_by(Download.id).limit(EVENTS_MAX_ROWS)
+        downloads = {row['id']: serialize_download(row) for row in rates.annotate(humanize_rows(select.dicts(), HUMANIZED_FIELDS))}
+
+        locks: dict[str, dict[str, Any] | None] = dict.fromkeys(EVENTS_LOCKS)
+        for row in Lock.select(Lock.key, Lock.pid, Lock.locked, Lock.locked_at, Lock.unlocked_at).where(Lock.key.in_(EVENTS_LOCKS)).dicts():
+            locks[row['key']] = serialize_lock(row)
+
+        return downloads, locks
+
+    def publish(self, event: str, data: Any) -> None:
+        """
+        Send a message to all the clients, encoded once.
+
+        A client whose queue is full is dropped, it will reconnect and get a new snapshot.
+
+        Args:
+            event (str): Type of the event.
+            data (Any): Payload, serializable in JSON.
+        """
+        message = self.message(event, data)
+        with self.__lock:
+            for subscriber in list(self.subscribers):
+                try:
+                    subscriber.queue.put_nowait(message)
+                except queue.Full:
+                    subscriber.dropped = True
+                    self.subscribers.discard(subscriber)
+
+    @staticmethod
+    def message(event: str, data: Any) -> str:
+        """
+        Encode a Server-Sent Event.
+
+        Args:
+            event (str): Type of the event.
+            data (Any): Payload, serializable in JSON.
+
+        Returns:
+            str: The event.
+        """
+        return 'event: {}\ndata: {}\n\n'.format(event, json.dumps(data, separators=(',', ':')))
+
+    def stream(self, subscriber: Subscriber, keepalive: float, max_duration: float) -> Iterator[str]:
+        """
+        Send the messages of a client, with comments to keep the connection alive.
+
+        The stream ends after max_duration to release the worker thread, the
+        browser reconnects by itself.
+
+        Args:
+            subscriber (Subscriber): The client.
+            keepalive (float): Seconds without message before sending a comment.
+            max_duration (float): Seconds before closing the stream.
+
+        Yields:
+            str: The events.
+        """
+        deadline = time.monotonic() + max_duration
+        try:
+            yield 'retry: {}\n\n'.format(int(self.__app.config['EVENTS_INTERVAL'] * 1000))
+            while not subscriber.dropped and time.monotonic() < deadline:
+                try:
+                    yield subscriber.queue.get(timeout=min(keepalive, max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+        finally:
+            self.unsubscribe(subscriber)
+
+
+# ==========================
+# Endpoints
+# ==========================
+@api.route('')
+@api.response(404, 'Events are disabled')
+class Events(Resource):
+    """
+    Endpoint streaming the live updates.
+    """
+
+    conditional = False
+
+    @api.doc('events')  # type: ignore[untyped-decorator]
+    @api.produces(['text/event-stream'])  # type: ignore[untyped-decorator]
+    @api.response(200, 'Server-Sent Events stream')  # type: ignore[untyped-decorator]
+    def get(self) -> Response:
+        """
+        Stream the changes of the downloads in progress and of the locks.
+
+        Events:
+        - snapshot: The downloads in progress and the locks, sent first
+        - downloads: The downloads in progress added or updated (changed) and the ids of the others (removed)
+        - lock: The new state of a lock (key and lock, null if it doesn't exist)
+        """
+        if not current_app.config.get('EVENTS_ENABLED'):
+            abort(404, 'Events are disabled.')
+
+        watcher: EventWatcher = current_app.extensions['seedboxsync_events']
+        stream = watcher.stream(watcher.subscribe(), current_app.config['EVENTS_KEEPALIVE'], current_app.config['EVENTS_MAX_DURATION'])
+        response = Response(stream, mimetype='text/event-stream')
+        response.cache_control.no_cache = True
+        response.headers['X-Accel-Buffering'] = 'no'  # Disable nginx buffering
+        return response
@@ -5,10 +5,19 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
+import base64
+import binascii
+import contextlib
+import json
 import uuid
-from flask_restx import fields, Model, Namespace, Resource as RestXResource
-from typing import Any
+from flask import current_app
+from flask_restx import abort, fields, inputs, Model, Namespace, Resource as RestXResource
+from peewee import Case, chunked, Field, fn, ModelSelect
+from typing import Any, Callable
 from datetime import datetime
+from seedboxsync_front.cache import bump_generation, versioned_value
+from seedboxsync_front.search import forget_index
+from seedboxsync_front.tombstones import deleted_since, last_seq, record_deletions
 
 
 class Resource(RestXResource):  # type: ignore[misc]
@@ -17,10 +26,18 @@ class Resource(RestXResource):  # type: ignore[misc]
 
     Provides utility methods for:
     - enforcing limits on query parameters
+    - refusing write operations on a read-only database
+    - keyset (cursor) pagination
+    - delta sync from a watermark
+    - exact, estimated (cached) or skipped counts
+    - bulk deletes
     - building consistent API response envelopes
     - generating envelope models for Swagger documentation
     """
 
+    BULK_BATCH = 500  # Rows deleted per statement by bulk_delete()
+    conditional = True  # GET answers only depend on the database, see apis.check_conditional()
+
     def set_limit(self, limit: int) -> int:
         """
         Clamp the limit value within the allowed range [5, 1000].
@@ -37,6 +54,256 @@ class Resource(RestXResource):  # type: ignore[misc]
             return 1000
         return limit
 
+    def check_writable(self) -> None:
+        """
+        Abort with a 403 if the database is opened in read-only mode.
+        """
+        if current_app.config.get('DATABASE_READ_ONLY'):
+            abort(403, 'The database is opened in read-only mode.')
+
+    def parse_datetime(self, payload: dict[str, Any], name: str) -> datetime | None:
+        """
+        Read an ISO 8601 date from a JSON payload, abort with a 400 if it is invalid.
+
+        Args:
+            payload (dict[str, Any]): The JSON payload.
+            name (str): Name of the field.
+
+        Returns:
+            datetime | None: Naive local date, as stored by SeedboxSync, None if not set.
+        """
+        value = payload.get(name)
+        if value is None:
+            return None
+        try:
+            date: datetime = inputs.datetime_from_iso8601(value)
+        except ValueError:
+            abort(400, 'Invalid date for {}.'.format(name))
+        if date.tzinfo is not None:
+            date = date.astimezone().replace(tzinfo=None)
+
+        return date
+
+    def bulk_delete(self, query: ModelSelect, ids: list[int] | None = None, dry_run: bool = False,
+                    around_delete: Callable[[list[int]], contextlib.AbstractContextManager[Any]] | None = None) -> int:
+        """
+        Delete the rows matched by a query, in batches inside a single transaction.
+
+        Args:
+            query (ModelSelect): Query selecting the rows to delete.
+            ids (list[int] | None): Only match these identifiers, selected in batches (SQLite bound variables limit).
+            dry_run (bool): Only count the matched rows.
+            around_delete (Callable[[list[int]], contextlib.AbstractContextManager[Any]] | None): Context entered with the
+                matched ids around the transaction, its exit runs once the delete is committed.
+
+        Returns:
+            int: Number of deleted (or matched) rows.
+        """
+        model: Any = query.model
+        if ids is None:
+            matched = list(query.select(model.id).scalars())
+        else:
+            matched = []
+            for batch in chunked(sorted(set(ids)), Resource.BULK_BATCH):
+                matched += query.select(model.id).where(model.id.in_(batch)).scalars()
+        if dry_run:
+            return len(matched)
+
+        self.check_writable()
+        deleted = 0
+        with around_delete(matched) if around_delete is not None else contextlib.nullcontext():
+            with model._meta.database.atomic():
+                for batch in chunked(matched, Resource.BULK_BATCH):
+                    deleted += model.delete().where(model.id.in_(batch)).execute()
+        record_deletions(model, matched)
+        forget_index(model, matched)
+        bump_generation()
+
+        return deleted
+
+    def count(self, query: ModelSelect, mode: str, **filters: Any) -> int | None:
+        """
+        Count the rows of a list query.
+
+        Args:
+            query (ModelSelect): The filtered query to count.
+            mode (str): 'exact' runs a COUNT, 'estimate' reuses the count cached for
+                        the same filters until the database changes, 'none' skips it.
+            **filters (Any): The filters of the query, part of the cache key.
+
+        Returns:
+            int | None: The number of rows, None if not counted.
+        """
+        if mode == 'none':
+            return None
+        if mode != 'estimate':
+            return int(query.count())
+
+        name = 'count/{}/{}'.format(query.model._meta.table_name, json.dumps(filters, sort_keys=True))
+        return int(versioned_value(name, query.count, timeout=3600))
+
+    def seek(self, query: ModelSelect, cursor: str, field: Field, id_field: Field) -> ModelSelect:
+        """
+        Keyset seek: keep the rows after the cursor of a query ordered by (field DESC, id ASC).
+
+        Args:
+            query (ModelSelect): The query to paginate.
+            cursor (str): The opaque cursor returned as next_cursor by the previous page.
+            field (Field): The ordering field (ex: Download.finished).
+            id_field (Field): The tie-breaker primary key.
+
+        Returns:
+            ModelSelect: The query starting after the cursor.
+        """
+        value, last_id = self.decode_cursor(cursor)
+        return query.where((field < value) | ((field == value) & (id_field > last_id)))
+
+    def next_cursor(self, rows: list[dict[str, Any]], limit: int, field_name: str) -> str | None:
+        """
+        Build the cursor of the next page from the last row of the current one.
+
+        Args:
+            rows (list[dict[str, Any]]): The rows of the current page.
+            limit (int): The page size.
+            field_name (str): Name of the ordering field in the rows.
+
+        Returns:
+            str | None: The cursor, None if this is the last page.
+        """
+        if len(rows) < limit:
+            return None
+        return self.encode_cursor(rows[-1][field_name], rows[-1]['id'])
+
+    def delta(self, query: ModelSelect, since: str, limit: int, finished: Field | None = None) -> tuple[list[dict[str, Any]], str, list[int]]:
+        """
+        Delta sync: keep the rows added or updated after a watermark, and list the rows deleted by the front.
+
+        Rows are only updated while they are in progress (finished is 0): the
+        watermark keeps the last id, the lowest id in progress and the last
+        finished date, so a delta is a range scan on the primary key. Rows in
+        progress are sent again in each delta, clients must upsert by id.
+        Large deltas are split in pages of limit rows, each page returns the
+        watermark of the next one.
+
+        Args:
+            query (ModelSelect): The query of the rows, without order and limit.
+            since (str): Watermark returned by the previous delta, '0' to read all the rows.
+            limit (int): Maximum number of rows.
+            finished (Field | None): Completion date, 0 while in progress, None if the rows are never updated.
+
+        Returns:
+            tuple[list[dict[str, Any]], str, list[int]]: The rows of the page ordered by id, the new watermark and the deleted ids.
+        """
+        model: Any = query.model
+        watermark = self.decode_watermark(since)
+        last_id, low, last_finished, seq = watermark[:4]
+        if len(watermark) == 8:
+            # Next page of a delta, the tombstones were sent with the first one
+            top, next_low, next_finished, after = watermark[4:]
+            deleted: list[int] = []
+        else:
+            top = model.select(fn.MAX(model.id)).scalar() or 0
+            next_low, next_finished, after = top + 1, last_finished, low - 1
+            if finished is not None:
+                pending, latest = model.select(
+                    fn.MIN(Case(None, [(finished == 0, model.id)])),
+                    fn.MAX(Case(None, [(finished != 0, finished)])),
+                ).where(model.id >= low, model.id <= top).scalar(as_tuple=True)
+                next_low = pending or next_low
+                next_finished = max(str(latest or ''), last_finished)
+            if since == '0':
+                deleted, seq = [], last_seq()
+            else:
+                deleted, seq, complete = deleted_since(model, seq)
+                if not complete:
+                    abort(410, 'The watermark expired, read all the rows again with since=0.')
+
+        changed = model.id > last_id
+        if finished is not None:
+            changed = changed | (finished == 0) | (finished >= last_finished)
+        page: Any = query.where(model.id > after, model.id <= top, changed).order_by(model.id).limit(limit).dicts()
+        rows: list[dict[str, Any]] = list(page)
+        if len(rows) == limit:
+            return rows, self.encode_watermark([last_id, low, last_finished, seq, top, next_low, next_finished, rows[-1]['id']]), deleted
+        return rows, self.encode_watermark([top, next_low, next_finished, seq]), deleted
+
+    @staticmethod
+    def encode_watermark(values: list[Any]) -> str:
+        """
+        Encode a delta sync position into an opaque watermark.
+
+        Args:
+            values (list[Any]): Last id, lowest id in progress, last finished date, tombstone sequence
+                                number and, between two pages, the end of the delta.
+
+        Returns:
+            str: URL-safe watermark.
+        """
+        raw = json.dumps(values, separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_watermark(since: str) -> list[Any]:
+        """
+        Decode a watermark built by encode_watermark(), abort with a 400 if it is invalid.
+
+        Args:
+            since (str): The opaque watermark, '0' for the first delta.
+
+        Returns:
+            list[Any]: The values of the watermark.
+        """
+        if since == '0':
+            return [0, 0, '', 0]
+        try:
+            values: list[Any] = json.loads(base64.urlsafe_b64decode(since + '=' * (-len(since) % 4)))
+            if not isinstance(values, list) or len(values) not in (4, 8) or not isinstance(values[2], str) \
+                    or not all(isinstance(value, int) for i, value in enumerate(values) if i not in (2, 6)):
+                raise ValueError(since)
+        except (binascii.Error, TypeError, ValueError):
+            abort(400, 'Invalid watermark.')
+
+        return values
+
+    @staticmethod
+    def encode_cursor(value: Any, id: int) -> str:
+        """
+        Encode a keyset position into an opaque cursor.
+
+        Args:
+            value (Any): Value of the ordering field (datetime or 0).
+            id (int): The row identifier.
+
+        Returns:
+            str: URL-safe cursor.
+        """
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        raw = json.dumps([value, id], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> tuple[Any, int]:
+        """
+        Decode a cursor built by encode_cursor(), abort with a 400 if it is invalid.
+
+        Args:
+            cursor (str): The opaque cursor.
+
+        Returns:
+            tuple[Any, int]: Value of the ordering field and row identifier.
+        """
+        try:
+            value, id = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value)
+            if not isinstance(value, (datetime, int)) or not isinstance(id, int):
+                raise ValueError(cursor)
+        except (binascii.Error, TypeError, ValueError):
+            abort(400, 'Invalid cursor.')
+
+        return value, id
+
     def build_envelope(
         self,
         data: Any,
@@ -44,7 +311,11 @@ class Resource(RestXResource):  # type: ignore[misc]
         type: str = 'about:blank',
         status_code: int = 200,
         message: str | None = None,
-        data_total: int | None = None
+        data_total: int | None = None,
+        data_total_estimated: bool | None = None,
+        next_cursor: str | None = None,
+        watermark: str | None = None,
+        tombstones: list[int] | None = None
     ) -> dict[str, Any]:
         """
         Build a standard API response envelope.
@@ -55,6 +326,10 @@ class Resource(RestXResource):  # type: ignore[misc]
             status_code (int): HTTP status code (default: 200).
             message (str): Send message in place of data.
             data_total (int | None): Optional total number of items if the result is paginated.
+            data_total_estimated (bool | None): Optional flag, True if data_total may be outdated.
+            next_cursor (str | None): Optional cursor of the next page if the result is paginated.
+            watermark (str | None): Optional watermark of the next delta if the result is a delta.
+            tombstones (list[int] | None): Optional identifiers of the rows deleted since the previous delta.
 
         Returns:
             dict[str, Any]: Structured API response containing metadata and payload.
@@ -67,6 +342,10 @@ class Resource(RestXResource):  # type: ignore[misc]
             'traceId': str(uuid.uuid4()),
             **({'data': data} if data is not None else {}),
             **({'data_total': data_total} if data_total is not None else {}),
+            **({'data_total_estimated': data_total_estimated} if data_total_estimated is not None else {}),
+            **({'next_cursor': next_cursor} if next_cursor is not None else {}),
+            **({'watermark': watermark} if watermark is not None else {}),
+            **({'tombstones': tombstones} if tombstones is not None else {}),
             **({'message': message} if message is not None else {}),
             'data': data
         }
@@ -101,10 +380,19 @@ class Resource(RestXResource):  # type: ignore[misc]
             else:
                 data_field = fields.Nested(nested_model, required=True, description=f"The {name} object")
             data_total = fields.Integer(required=False, description=f"Total of {name} object")
+            data_total_estimated = fields.Boolean(required=False, description="True if data_total is an estimate") if as_list else None
+            next_cursor = fields.String(required=False, description="Cursor of the next page, null on the last page") if as_list else None
+            watermark = fields.String(required=False, description="Watermark of the next delta, only with since") if as_list else None
+            tombstones = fields.List(fields.Integer, required=False,
+                                     description="Identifiers of the rows deleted by the front since the watermark, only with since") if as_list else None
             message_field = None
         else:
             data_field = None
             data_total = None
+            data_total_estimated = None
+            next_cursor = None
+            watermark = None
+            tombstones = None
             message_field = fields.String(required=False, description="Response message", example="All is OK")
 
         return api.model(f'Envelope[{name}]', {
@@ -115,6 +403,10 @@ class Resource(RestXResource):  # type: ignore[misc]
             'traceId': fields.String(required=True, description="Unique trace identifier", example="0a8ab95e-a463-424e-bc6d-505503bf200d"),
             **({'data': data_field} if data_field is not None else {}),
             **({'data_total': data_total} if data_total is not None else {}),
+            **({'data_total_estimated': data_total_estimated} if data_total_estimated is not None else {}),
+            **({'next_cursor': next_cursor} if next_cursor is not None else {}),
+            **({'watermark': watermark} if watermark is not None else {}),
+            **({'tombstones': tombstones} if tombstones is not None else {}),
             **({'message': message_field} if message_field is not None else {}),
         })
 
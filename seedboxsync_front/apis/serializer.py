@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from datetime import datetime
+from functools import wraps
+from flask import current_app, request, Response
+from flask_restx import fields, marshal, Model, Namespace
+from flask_restx.marshalling import make
+from flask_restx.representations import output_json
+from flask_restx.utils import merge, unpack
+from time import perf_counter
+from typing import Any, Callable
+from seedboxsync_front.apis.resources import DateTimeOrZero
+from seedboxsync_front.metrics import metrics
+from seedboxsync_front.timing import current as current_timings
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None  # type: ignore[assignment]
+
+Formatter = Callable[[Any], Any]
+
+
+def compile_field(field: Any) -> Formatter | None:
+    """
+    Build the formatter of a non-null value, equivalent to field.format().
+
+    Args:
+        field (Any): The Flask-RestX field.
+
+    Returns:
+        Formatter | None: The formatter, None if the field must go through field.output().
+    """
+    if field.attribute is not None:
+        return None
+
+    kind = type(field)
+    if kind is fields.Raw:
+        return lambda value: value
+    if kind is fields.String:
+        return str
+    if kind is fields.Integer:
+        return int
+    if kind is fields.Float:
+        return float
+    if kind is fields.Boolean:
+        return lambda value: value if type(value) is bool else field.format(value)
+    if kind in (fields.DateTime, DateTimeOrZero) and field.dt_format == 'iso8601':
+        def format_datetime(value: Any) -> Any:
+            if type(value) is datetime:
+                return value.isoformat()
+            return field.format(value)
+        if kind is DateTimeOrZero:
+            return lambda value: 0 if value == 0 else format_datetime(value)
+        return format_datetime
+    if kind is fields.Nested and not field.skip_none:
+        return compile_model(field.nested)
+    if kind is fields.List and type(field.container) is fields.Nested and not field.container.skip_none:
+        container = field.container
+        nested = compile_model(container.nested)
+
+        def format_list(value: Any) -> Any:
+            if not isinstance(value, list):
+                return field.format(value)
+            return [nested(row) if row is not None else container.output(index, value) for index, row in enumerate(value)]
+        return format_list
+
+    return None
+
+
+def compile_model(model: Model | dict[str, Any]) -> Formatter:
+    """
+    Compile a model into a function returning the same dict as marshal(), without the per-field dispatch.
+
+    Only dicts are formatted by the compiled fields, other objects and missing
+    or null values go through the Flask-RestX fields.
+
+    Args:
+        model (Model | dict[str, Any]): The Flask-RestX model.
+
+    Returns:
+        Formatter: Serialize one object.
+    """
+    resolved = getattr(model, 'resolved', model)
+    if any(isinstance(field, fields.Wildcard) for field in resolved.values()):
+        return lambda obj: marshal(obj, model)
+
+    compiled: list[tuple[str, Formatter | None, Any]] = []
+    for key, field in resolved.items():
+        if isinstance(field, dict):
+            nested = compile_model(field)
+            compiled.append((key, None, fields.Raw(attribute=lambda obj, nested=nested: nested(obj))))
+            continue
+        field = make(field)
+        compiled.append((key, compile_field(field), field))
+
+    def serialize(obj: Any) -> Any:
+        if type(obj) is not dict:
+            return marshal(obj, model)
+
+        out = {}
+        for key, format, field in compiled:
+            value = obj.get(key)
+            if format is None or value is None:
+                out[key] = field.output(key, obj)
+                continue
+            try:
+                out[key] = format(value)
+            except (TypeError, ValueError):
+                out[key] = field.format(value)  # Same error as marshal()
+        return out
+
+    return serialize
+
+
+def marshal_with(api: Namespace, model: Model, code: int = 200, description: str | None = None) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """
+    Same as Namespace.marshal_with(), with a model compiled once by compile_model().
+
+    The Swagger documentation is unchanged, requests with a fields mask use the
+    Flask-RestX marshalling.
+
+    Args:
+        api (Namespace): The Flask-RestX namespace.
+        model (Model): The response model.
+        code (int): HTTP status code documented.
+        description (str | None): Description of the response.
+
+    Returns:
+        Callable[[Callable[..., Any]], Callable[..., Any]]: The decorator.
+    """
+    serialize = compile_model(model)
+
+    def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            response = func(*args, **kwargs)
+            data, status, headers = unpack(response)
+            if metrics.enabled and isinstance(data, dict) and isinstance(data.get('data'), list):
+                metrics.inc('seedboxsync_front_rows_returned_total', len(data['data']), endpoint=str(request.endpoint))
+            if request.headers.get(current_app.config['RESTX_MASK_HEADER']):
+                return marshal(data, model, mask=request.headers[current_app.config['RESTX_MASK_HEADER']]), status, headers
+            timings = current_timings.get()
+            if timings is None:
+                return serialize(data), status, headers
+            start = perf_counter()
+            data = serialize(data)
+            timings.add('marshal', perf_counter() - start)
+            return data, status, headers
+
+        wrapper.__apidoc__ = merge(getattr(func, '__apidoc__', {}), {  # type: ignore[attr-defined]
+            'responses': {str(code): (description, model, {})},
+            '__mask__': True,
+        })
+        return wrapper
+
+    return decorator
+
+
+def output_fast_json(data: Any, code: int, headers: dict[str, Any] | None = None) -> Response:
+    """
+    JSON representation of the API, encoded with orjson when available.
+
+    Falls back to the Flask-RestX representation when it is configured (RESTX_JSON, debug indent).
+
+    Args:
+        data (Any): The serialized data.
+        code (int): HTTP status code.
+        headers (dict[str, Any] | None): Additional headers.
+
+    Returns:
+        Response: The JSON response.
+    """
+    timings = current_timings.get()
+    start = perf_counter()
+    try:
+        if orjson is None or current_app.debug or current_app.config.get('RESTX_JSON') or not current_app.config.get('FAST_JSON'):
+            return output_json(data, code, headers)  # type: ignore[no-any-return]
+
+        try:
+            dumped = orjson.dumps(data, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            return output_json(data, code, headers)  # type: ignore[no-any-return]
+        response = current_app.response_class(dumped, code, mimetype='application/json')
+        response.headers.extend(headers or {})
+        return response
+    finally:
+        if timings is not None:
+            timings.add('marshal', perf_counter() - start)
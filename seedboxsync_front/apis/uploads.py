@@ -5,10 +5,16 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
-from flask_restx import fields, Namespace, reqparse
+from flask import Response
+from flask_restx import abort, fields, inputs, Namespace, reqparse
 from typing import Any
 from seedboxsync.core.dao import Torrent
 from seedboxsync_front.apis import Resource
+from seedboxsync_front.apis.serializer import marshal_with
+from seedboxsync_front.cache import bump_generation, versioned
+from seedboxsync_front.export import export_response
+from seedboxsync_front.search import filter_search, forget_index
+from seedboxsync_front.tombstones import record_deletions
 
 api = Namespace('uploads', description='Operations related to uploaded torrents management')
 
@@ -23,18 +29,45 @@ upload_model = api.model('Upload', {
                               example="https://serversecret.com/anounce"),
     'sent': fields.DateTime(dt_format='iso8601', required=True, description="Timestamp when the torrent was uploaded"),
 })
+# Exported columns, see UploadsExport
+EXPORT_FIELDS = [Torrent.id, Torrent.name, Torrent.announce, Torrent.sent]
+
 upload_list_envelope = Resource.build_envelope_model(api, 'UploadList', nested_model=upload_model)
 upload_envelope = Resource.build_envelope_model(api, 'Upload', nested_model=upload_model, as_list=False)
 upload_message_envelope = Resource.build_envelope_model(api, 'UploadMessage', as_message=True)
 
+bulk_delete_request_model = api.model('UploadBulkDeleteRequest', {
+    'ids': fields.List(fields.Integer, required=False, description="Identifiers of the uploads to delete", example=[12, 13]),
+    'search': fields.String(required=False, description="Delete the uploads matching this search string", example="Convallis"),
+    'sent_before': fields.DateTime(dt_format='iso8601', required=False, description="Delete the uploads sent before this date"),
+    'dry_run': fields.Boolean(required=False, default=False, description="Only count the uploads to delete", example=True),
+})
+bulk_delete_model = api.model('UploadBulkDelete', {
+    'deleted': fields.Integer(required=True, description="Number of deleted uploads, or to delete with dry_run", example=42),
+    'dry_run': fields.Boolean(required=True, description="Nothing was deleted", example=False),
+})
+bulk_delete_envelope = Resource.build_envelope_model(api, 'UploadBulkDelete', nested_model=bulk_delete_model, as_list=False)
+
 
 # ==========================
 # Request parser
 # ==========================
 parser = reqparse.RequestParser()
 parser.add_argument('offset', type=int, default=0, location='args', help='Number of items to skip before starting to collect the result set (default: 0)')
+parser.add_argument('cursor', type=str, required=False, location='args', help='Cursor of the page to fetch (next_cursor of the previous page), replaces offset')
 parser.add_argument('limit', type=int, default=50, location='args', help='Maximum number of items to return (min=5, max=1000)')
-parser.add_argument('search', type=str, required=False, help='Optional search string to filter items')
+parser.add_argument('search', type=str, required=False, help='Optional search string to filter items (prefix matching on words)')
+parser.add_argument('count', type=str, default='exact', choices=('exact', 'estimate', 'none'), location='args',
+                    help='Compute data_total exactly (default), from a cached count (estimate) or not at all (none)')
+parser.add_argument('sort', type=str, default='date', choices=('date', 'rank'), location='args',
+                    help='Sort by date (default) or by relevance when searching (rank)')
+parser.add_argument('since', type=str, required=False, location='args',
+                    help='Watermark of the previous delta (0 the first time): only the uploads added since, with the deleted ids')
+
+export_parser = reqparse.RequestParser()
+export_parser.add_argument('format', type=str, default='ndjson', choices=('ndjson', 'csv'), location='args', help='Export format (default: ndjson)')
+export_parser.add_argument('gzip', type=inputs.boolean, default=False, location='args', help='Compress the export with gzip (default: false)')
+export_parser.add_argument('search', type=str, required=False, location='args', help='Optional search string to filter items (prefix matching on words)')
 
 
 # ==========================
@@ -48,35 +81,131 @@ class UploadsList(Resource):
     Provides a list of uploaded torrents with optional limit on the number of items returned.
     """
 
+    @versioned()
     @api.doc('list_uploads')  # type: ignore[untyped-decorator]
     @api.expect(parser)  # type: ignore[untyped-decorator]
-    @api.marshal_with(upload_list_envelope, code=200, description="List of uploaded torrents")  # type: ignore[untyped-decorator]
+    @marshal_with(api, upload_list_envelope, code=200, description="List of uploaded torrents")
     def get(self) -> dict[str, Any]:
         """
         Retrieve the most recent uploaded torrents.
 
         Query Parameters:
         - offset: Number of items to skip before starting to collect the result set (default: 0)
+        - cursor: Cursor of the page to fetch (next_cursor of the previous page), replaces offset
         - limit: Maximum number of downloads to return (default=50)
         - search: Optional search string to filter items
+        - sort: Sort by date (default) or by relevance when searching (rank)
+        - count: Compute data_total exactly (default), from a cached count (estimate) or not at all (none)
+        - since: Watermark of the previous delta (0 the first time), returns the uploads added since ordered by id,
+                 the watermark of the next delta and the ids deleted by the front (tombstones)
         """
         args = parser.parse_args()
         offset = args.get('offset')
+        cursor = args.get('cursor')
         limit = self.set_limit(args.get('limit'))
         search = args.get('search')
+        sort = args.get('sort')
+        count_mode = args.get('count')
+        since = args.get('since')
+        if cursor and sort == 'rank':
+            abort(400, 'Cursor pagination is not available when sorting by rank.')
+        if since and (cursor or search):
+            abort(400, 'The since argument can not be combined with cursor or search.')
 
         count = Torrent.select()
         select = Torrent.select(
             Torrent.id,
             Torrent.name,
             Torrent.sent
-        ).limit(limit).offset(offset).order_by(Torrent.sent.desc())
+        )
+        if since:
+            # Uploads are never updated, the new ones are after the last id
+            data, watermark, tombstones = self.delta(select, since, limit)
+            return self.build_envelope(data, watermark=watermark, tombstones=tombstones, type='Upload')
+        select = select.limit(limit)
+
+        if search:
+            count = filter_search(count, Torrent, search)
+            select = filter_search(select, Torrent, search, ranked=(sort == 'rank'))
+        select = select.order_by_extend(Torrent.sent.desc(), Torrent.id)
+        if cursor:
+            select = self.seek(select, cursor, Torrent.sent, Torrent.id)
+        else:
+            select = select.offset(offset)
+
+        data = list(select.dicts())
+        next_cursor = self.next_cursor(data, limit, 'sent') if sort != 'rank' else None
+        return self.build_envelope(data, data_total=self.count(count, count_mode, search=search),
+                                   data_total_estimated=(count_mode == 'estimate'), next_cursor=next_cursor, type='Upload')
+
+
+@api.route('/bulk-delete')
+@api.response(400, 'No criteria')
+class UploadsBulkDelete(Resource):
+    """
+    Endpoint to delete many uploads at once.
+    """
+
+    @api.doc('bulk_delete_uploads')  # type: ignore[untyped-decorator]
+    @api.expect(bulk_delete_request_model, validate=True)  # type: ignore[untyped-decorator]
+    @api.marshal_with(bulk_delete_envelope, code=200, description="Uploads deleted")  # type: ignore[untyped-decorator]
+    def post(self) -> dict[str, Any]:
+        """
+        Delete the uploads matching all the given criteria, in a single transaction.
+
+        Body Parameters:
+        - ids: Identifiers of the uploads to delete
+        - search: Delete the uploads matching this search string
+        - sent_before: Delete the uploads sent before this date
+        - dry_run: Only count the uploads to delete
+        """
+        payload = api.payload or {}
+        ids = payload.get('ids')
+        search = payload.get('search')
+        sent_before = self.parse_datetime(payload, 'sent_before')
+        dry_run = bool(payload.get('dry_run'))
+        if ids is None and not search and sent_before is None:
+            abort(400, 'At least one of ids, search or sent_before is required.')
+
+        select = Torrent.select(Torrent.id)
+        if search:
+            select = filter_search(select, Torrent, search)
+        if sent_before is not None:
+            select = select.where(Torrent.sent < sent_before)
+
+        deleted = self.bulk_delete(select, ids=ids, dry_run=dry_run)
+        return self.build_envelope({'deleted': deleted, 'dry_run': dry_run}, type='UploadBulkDelete')
+
+
+@api.route('/export')
+class UploadsExport(Resource):
+    """
+    Endpoint to export the whole uploaded torrents history.
+    """
+
+    @api.doc('export_uploads')  # type: ignore[untyped-decorator]
+    @api.expect(export_parser)  # type: ignore[untyped-decorator]
+    @api.produces(['application/x-ndjson', 'text/csv', 'application/gzip'])  # type: ignore[untyped-decorator]
+    @api.response(200, 'Uploaded torrents history, one torrent per line')  # type: ignore[untyped-decorator]
+    def get(self) -> Response:
+        """
+        Stream all the uploaded torrents, from the most recent, in NDJSON or CSV.
+
+        Query Parameters:
+        - format: Export format, ndjson (default) or csv
+        - gzip: Compress the export with gzip (default: false)
+        - search: Optional search string to filter items
+        """
+        args = export_parser.parse_args()
+        search = args.get('search')
 
+        select = Torrent.select(*EXPORT_FIELDS)
         if search:
-            count = count.where(Torrent.name.contains(search))
-            select = select.where(Torrent.name.contains(search))
+            select = filter_search(select, Torrent, search)
+        select = select.order_by(Torrent.sent.desc(), Torrent.id)
 
-        return self.build_envelope(list(select.dicts()), data_total=count.count(), type='Upload')
+        return export_response(select.tuples(), [field.name for field in EXPORT_FIELDS], 'uploads',
+                               format=args.get('format'), compress=args.get('gzip'))
 
 
 @api.route('/<int:id>')
@@ -112,8 +241,12 @@ class Uploads(Resource):
         """
         Retrieve a download.
         """
+        self.check_writable()
         count = Torrent.delete().where(Torrent.id == id).execute()
         if count == 0:
             api.abort(404, "Upload {} doesn't exist".format(id))
+        record_deletions(Torrent, [id])
+        forget_index(Torrent, [id])
+        bump_generation()
 
         return self.build_envelope(None, type='Upload', message='Upload {} deleted.'.format(id))
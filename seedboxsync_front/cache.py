@@ -5,6 +5,161 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
+import hashlib
+import os
+from datetime import datetime, timezone
+from flask import current_app, request
 from flask_caching import Cache
+from typing import Any, Callable
+from urllib.parse import urlencode
+from seedboxsync_front.babel import get_locale
 
 cache = Cache()
+
+# Versioned entries are invalidated by a new database generation, the TTL only evicts them
+VERSIONED_TIMEOUT = 86400
+
+
+# FrontState key of the front write counter, shared by all the workers
+GENERATION_KEY = 'generation'
+
+
+def front_generation() -> str:
+    """
+    Counter of the writes made by the front, stored in the front database.
+
+    Read on the SeedboxSync connection of the request (the front database is
+    attached to it), else on a connection of the front database.
+
+    Returns:
+        str: The counter, '0' without front database.
+    """
+    from seedboxsync_front.sidecar import FrontState, sidecar
+
+    state = current_app.extensions.get('seedboxsync_sidecar')
+    if state is None or not state.enabled:
+        return '0'
+
+    database = current_app.extensions.get('seedboxsync_db')
+    if database is not None and hasattr(database, 'db') and not database.db.is_closed():
+        row = database.db.execute(FrontState.select(FrontState.value).where(FrontState.key == GENERATION_KEY)).fetchone()
+        return row[0] if row else '0'
+
+    with sidecar.connection_context():
+        return str(FrontState.get_value(GENERATION_KEY, 0))
+
+
+def bump_generation() -> None:
+    """
+    Count a write made by the front, invalidating the versioned entries and ETags of all the workers.
+
+    The SeedboxSync database mtime may not change with a coarse timestamp resolution.
+    """
+    from seedboxsync_front.sidecar import FrontState, sidecar
+
+    state = current_app.extensions.get('seedboxsync_sidecar')
+    if state is None or not state.enabled:
+        return
+
+    with sidecar.connection_context():
+        with sidecar.atomic('IMMEDIATE'):
+            FrontState.set_value(GENERATION_KEY, int(FrontState.get_value(GENERATION_KEY, 0)) + 1)
+
+
+def db_generation() -> str:
+    """
+    Token changing each time the SeedboxSync database is written.
+
+    Built from the size and mtime of the database file and of its WAL (two
+    stat()), plus the front write counter: only state shared by all the workers,
+    so they compute the same cache keys and ETags.
+
+    Returns:
+        str: The generation token.
+    """
+    db_file = current_app.config['DATABASE']
+    parts = []
+    for path in (db_file, db_file + '-wal'):
+        try:
+            st = os.stat(path)
+            parts.append('{}.{}'.format(st.st_mtime_ns, st.st_size))
+        except OSError:
+            parts.append('0')
+    parts.append(front_generation())
+
+    return '-'.join(parts)
+
+
+def db_last_modified() -> datetime | None:
+    """
+    Last write of the SeedboxSync database, from the mtime of the database file and of its WAL.
+
+    Returns:
+        datetime | None: UTC date, None if the database doesn't exist.
+    """
+    db_file = current_app.config['DATABASE']
+    mtimes = []
+    for path in (db_file, db_file + '-wal'):
+        try:
+            mtimes.append(os.stat(path).st_mtime)
+        except OSError:
+            pass
+
+    return datetime.fromtimestamp(int(max(mtimes)), timezone.utc) if mtimes else None
+
+
+def versioned_value(name: str, compute: Callable[[], Any], timeout: int = VERSIONED_TIMEOUT) -> Any:
+    """
+    Get a value from the cache, computed once per database generation.
+
+    Args:
+        name (str): Name of the value, with its parameters.
+        compute (Callable[[], Any]): Compute the value on a cache miss.
+        timeout (int): TTL of the entry, the database generation expires it before.
+
+    Returns:
+        Any: The cached or computed value.
+    """
+    key = 'value/{}/{}'.format(name, db_generation())
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout=timeout)
+
+    return value
+
+
+def versioned_key(*args: Any, **kwargs: Any) -> str:
+    """
+    Cache key of a view: path, sorted query args, locale and database generation.
+
+    Returns:
+        str: The cache key.
+    """
+    query = urlencode(sorted(request.args.items(multi=True)))
+    return 'view/{}?{}/{}/{}'.format(request.path, query, get_locale(), db_generation())
+
+
+def versioned(timeout: int = VERSIONED_TIMEOUT) -> Callable[..., Any]:
+    """
+    Cache a view until the database changes.
+
+    Args:
+        timeout (int): TTL of the entry, the database generation expires it before.
+
+    Returns:
+        Callable[..., Any]: The decorator.
+    """
+    return cache.cached(timeout=timeout, make_cache_key=versioned_key)
+
+
+def versioned_etag() -> str:
+    """
+    Strong ETag of a read request, changing with the database generation.
+
+    Computed from the same parts as versioned_key(), without executing the request.
+
+    Returns:
+        str: The ETag, unquoted.
+    """
+    return hashlib.sha1(versioned_key().encode()).hexdigest()
@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import click
+import time
+from datetime import datetime
+from flask import current_app, Flask
+from flask.cli import AppGroup, FlaskGroup
+from seedboxsync.core.dao import Download, Torrent
+from seedboxsync_front.rollup import rebuild_rollup
+from seedboxsync_front.search import rebuild_index
+from seedboxsync_front.synthetic import generate
+
+cli = AppGroup('seedboxsync-front', help='SeedboxSync front commands.')
+
+
+@cli.command('rebuild-stats')
+def rebuild_stats() -> None:
+    """
+    Rebuild the statistics rollup, needed when downloads are deleted outside the front.
+    """
+    if not current_app.config.get('STATS_ROLLUP'):
+        raise click.ClickException('The statistics rollup is disabled (no front database or STATS_ROLLUP is false).')
+
+    count = rebuild_rollup()
+    click.echo('{} download(s) in the statistics rollup.'.format(count))
+
+
+@cli.command('rebuild-search')
+def rebuild_search() -> None:
+    """
+    Rebuild the search index, needed when rows are deleted outside the front.
+    """
+    if not current_app.config.get('SEARCH_INDEX'):
+        raise click.ClickException('The search index is disabled (no front database, no FTS5 or SEARCH_INDEX is false).')
+
+    downloads = rebuild_index(Download)
+    torrents = rebuild_index(Torrent)
+    click.echo('{} download(s) and {} upload(s) in the search index.'.format(downloads, torrents))
+
+
+@cli.command('gen-data')
+@click.argument('path', type=click.Path(dir_okay=False))
+@click.option('--downloads', type=click.IntRange(0), default=100000, show_default=True, help='Number of downloads.')
+@click.option('--torrents', type=click.IntRange(0), default=None, help='Number of uploaded torrents (default: a quarter of the downloads).')
+@click.option('--in-progress', type=click.IntRange(0), default=10, show_default=True, help='Number of downloads in progress.')
+@click.option('--start', type=click.DateTime(['%Y-%m-%d']), default=None, help='First day (default: 3 years before the end).')
+@click.option('--end', type=click.DateTime(['%Y-%m-%d']), default=None, help='Last day (default: today).')
+@click.option('--seed', type=int, default=42, show_default=True, help='Random seed, the same options build the same database.')
+def gen_data(path: str, downloads: int, torrents: int | None, in_progress: int, start: datetime | None, end: datetime | None, seed: int) -> None:
+    """
+    Write a SeedboxSync database filled with synthetic data, for benchmarks and load tests.
+    """
+    begin = time.perf_counter()
+    try:
+        counts = generate(path, downloads, torrents, min(in_progress, downloads), start, end, seed)
+    except FileExistsError:
+        raise click.ClickException('{} already exists.'.format(path))
+    except ValueError as e:
+        raise click.ClickException(str(e))
+
+    rows = ', '.join('{} {}'.format(count, table) for table, count in counts.items())
+    click.echo('{} written in {:.1f}s: {}.'.format(path, time.perf_counter() - begin, rows))
+
+
+@cli.command('serve', with_appcontext=False)
+@click.option('--bind', '-b', default=None, help='Address to listen on (default: GUNICORN_BIND or 0.0.0.0:8000).')
+@click.option('--workers', '-w', type=click.IntRange(1), default=None, help='Worker processes (default: GUNICORN_WORKERS or from the CPU count).')
+@click.option('--threads', type=click.IntRange(1), default=None, help='Threads per worker (default: GUNICORN_THREADS or 8).')
+def serve(bind: str | None, workers: int | None, threads: int | None) -> None:
+    """
+    Run the front with gunicorn, configured by the GUNICORN_* environment variables.
+
+    Send SIGHUP to reload the configuration and replace the workers gracefully.
+    """
+    try:
+        from seedboxsync_front.serve import Server
+    except ImportError:
+        raise click.ClickException('gunicorn is not installed, install the "gunicorn" extra.')
+
+    Server({'bind': bind, 'workers': workers, 'threads': threads}).run()
+
+
+def load_app() -> Flask:
+    """
+    Create the app of the seedboxsync-front command.
+
+    Returns:
+        Flask: The app.
+    """
+    from seedboxsync_front import create_app
+
+    return create_app()
+
+
+# seedboxsync-front script: the commands above and the Flask ones (run, routes, shell)
+main = FlaskGroup(name='seedboxsync-front', help='SeedboxSync front commands.', create_app=load_app)
+for command in cli.commands.values():
+    main.add_command(command)
@@ -0,0 +1,210 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import gzip
+import json
+import mimetypes
+import os
+from flask import Flask, request, Response, send_from_directory, url_for
+from typing import Any
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+
+class Compress(object):
+    """
+    Negotiated gzip/brotli compression of the responses and precompressed static assets.
+
+    Attributes:
+        encodings (list[str]): Supported encodings, by order of preference.
+        assets (dict[str, str]): Asset name (ex: main.js) and its hashed file in static/dist.
+        hashed (set[str]): All the files of the manifest (entries, chunks, CSS and assets), cached forever.
+    """
+
+    DIST = 'dist'
+
+    def __init__(self, app: Flask):
+        """
+        Register the compression and the static assets route.
+
+        Args:
+            app (Flask): The Flask app.
+        """
+        self.__app = app
+        self.__app.extensions['seedboxsync_compress'] = self
+        self.encodings = (['br'] if brotli is not None else []) + ['gzip']
+        self.dist_path = os.path.join(str(self.__app.static_folder), Compress.DIST)
+        self.assets: dict[str, str] = {}
+        self.hashed: set[str] = set()
+        self.__load_manifest()
+
+        if self.__app.config.get('COMPRESS_ENABLED'):
+            self.__app.after_request(self.__compress)
+
+        # More static parts than the static route, so it takes precedence
+        self.__app.add_url_rule('{}/{}/<path:filename>'.format(self.__app.static_url_path, Compress.DIST), 'dist', self.__send_dist)
+        self.__app.add_template_global(self.asset_url)
+
+    def __load_manifest(self) -> None:
+        """
+        Read the Vite manifest: the entry names with their hashed files, and all the hashed files.
+
+        The assets stay empty if they are not built.
+        """
+        try:
+            with open(os.path.join(self.dist_path, '.vite', 'manifest.json'), encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            self.__app.logger.debug('No Vite manifest in %s', self.dist_path)
+            manifest = {}
+
+        assets = {}
+        hashed = set()
+        for chunk in manifest.values():
+            # Imported chunks are manifest entries too, only their CSS and assets are listed by name
+            hashed.add(chunk['file'])
+            hashed.update(chunk.get('css', []))
+            hashed.update(chunk.get('assets', []))
+            if not chunk.get('isEntry'):
+                continue
+            assets['{}.js'.format(chunk['name'])] = chunk['file']
+            for css in chunk.get('css', []):
+                assets['{}.css'.format(chunk['name'])] = css
+
+        self.assets, self.hashed = assets, hashed
+
+    def asset_url(self, name: str) -> str:
+        """
+        URL of a built asset, hashed if built with the manifest (Jinja global).
+
+        Args:
+            name (str): Name of the asset (ex: main.js).
+
+        Returns:
+            str: The asset URL.
+        """
+        return url_for('static', filename='{}/{}'.format(Compress.DIST, self.assets.get(name, name)))
+
+    def negotiate(self, encodings: list[str]) -> str | None:
+        """
+        Choose the encoding accepted by the client.
+
+        Args:
+            encodings (list[str]): Available encodings, by order of preference.
+
+        Returns:
+            str | None: The encoding, None for identity.
+        """
+        encoding: str | None = request.accept_encodings.best_match(encodings)
+        return encoding
+
+    def __send_dist(self, filename: str) -> Response:
+        """
+        Serve a built asset, precompressed if possible, cached forever if its name is hashed.
+
+        Args:
+            filename (str): Path in static/dist.
+
+        Returns:
+            Response: The asset.
+        """
+        available = [e for e in self.encodings if os.path.isfile(os.path.join(self.dist_path, filename + Compress.suffix(e)))]
+        encoding = self.negotiate(available) if available else None
+        mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+        if encoding is not None:
+            response = send_from_directory(self.dist_path, filename + Compress.suffix(encoding), mimetype=mimetype)
+            response.headers['Content-Encoding'] = encoding
+        else:
+            response = send_from_directory(self.dist_path, filename, mimetype=mimetype)
+        if available:
+            response.vary.add('Accept-Encoding')
+
+        if filename in self.hashed:
+            response.cache_control.public = True
+            response.cache_control.max_age = 31536000
+            response.cache_control.immutable = True
+        return response
+
+    def __compress(self, response: Response) -> Response:
+        """
+        Compress a response on the fly (after_request).
+
+        Args:
+            response (Response): The response.
+
+        Returns:
+            Response: The response, compressed if possible.
+        """
+        if response.mimetype not in self.__app.config['COMPRESS_MIMETYPES'] or response.status_code < 200 or response.status_code in (204, 304):
+            return response
+        if response.direct_passthrough or response.is_streamed or 'Content-Encoding' in response.headers:
+            return response
+
+        response.vary.add('Accept-Encoding')
+        data = response.get_data()
+        if len(data) < self.__app.config['COMPRESS_MIN_SIZE']:
+            return response
+        encoding = self.negotiate(self.encodings)
+        if encoding is None:
+            return response
+
+        response.set_data(self.compress(data, encoding))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # Another representation, see encoded_etags()
+            response.set_etag(etag + Compress.suffix(encoding).replace('.', '-'), weak=bool(weak))
+        return response
+
+    def compress(self, data: bytes, encoding: str) -> bytes:
+        """
+        Compress data.
+
+        Args:
+            data (bytes): The data.
+            encoding (str): 'br' or 'gzip'.
+
+        Returns:
+            bytes: The compressed data.
+        """
+        if encoding == 'br':
+            compressed: bytes = brotli.compress(data, quality=self.__app.config['COMPRESS_BR_QUALITY'])
+            return compressed
+        return gzip.compress(data, compresslevel=self.__app.config['COMPRESS_LEVEL'])
+
+    @staticmethod
+    def suffix(encoding: str) -> str:
+        """
+        Extension of a file compressed with an encoding.
+
+        Args:
+            encoding (str): 'br' or 'gzip'.
+
+        Returns:
+            str: '.br' or '.gz'.
+        """
+        return '.br' if encoding == 'br' else '.gz'
+
+    @staticmethod
+    def encoded_etags(etag: str) -> list[str]:
+        """
+        ETags of all the representations of a response.
+
+        Args:
+            etag (str): ETag of the uncompressed response.
+
+        Returns:
+            list[str]: The ETags, uncompressed first.
+        """
+        return [etag] + [etag + Compress.suffix(encoding).replace('.', '-') for encoding in ('br', 'gzip')]
+
+
+__all__: list[Any] = ['Compress']
@@ -53,6 +53,51 @@ class Config(object):
         db_path = str((self.app.config.get('local') or {}).get('db_file', 'default.db'))
         db_path = os.path.abspath(os.path.expanduser(db_path))
         self.app.config.setdefault('DATABASE', db_path)
+        self.app.config.setdefault('DATABASE_READ_ONLY', False)  # Open DB with mode=ro and query_only
+        self.app.config.setdefault('DATABASE_PRAGMAS', {})  # Override Database.DEFAULT_PRAGMAS
+        self.app.config.setdefault('DATABASE_CONNECTION', 'request')  # 'request' (open/close per request) or 'pool'
+        self.app.config.setdefault('DATABASE_POOL_RECYCLE', 1000)  # Requests served before recycling a pooled connection
+
+        # Front-owned database (search index, stats rollup, ...), next to the SeedboxSync one
+        front_db_path = os.path.splitext(self.app.config['DATABASE'])[0] + '-front.db'
+        self.app.config.setdefault('FRONT_DATABASE', front_db_path)
+        self.app.config.setdefault('SEARCH_INDEX', True)  # FTS5 index for the search argument
+        self.app.config.setdefault('STATS_ROLLUP', True)  # Per day rollup of the download statistics
+        self.app.config.setdefault('TOMBSTONES_RETENTION', 30)  # Days the deletions are kept for the delta sync (since argument)
+
+        # Responses compression, brotli needs the "brotli" extra
+        self.app.config.setdefault('COMPRESS_ENABLED', True)
+        self.app.config.setdefault('COMPRESS_MIN_SIZE', 1024)  # Smaller bodies are sent as is
+        self.app.config.setdefault('COMPRESS_LEVEL', 6)  # gzip level
+        self.app.config.setdefault('COMPRESS_BR_QUALITY', 4)  # brotli quality, the static assets are precompressed at 11
+        self.app.config.setdefault('COMPRESS_MIMETYPES', [
+            'text/html', 'text/css', 'text/csv', 'text/plain', 'application/javascript',
+            'application/json', 'application/x-ndjson', 'image/svg+xml',
+        ])
+
+        self.app.config.setdefault('FAST_JSON', True)  # Encode the API responses with orjson when installed
+
+        # Per request timing breakdown, see timing.py
+        self.app.config.setdefault('TIMING_ENABLED', False)  # Server-Timing header
+        self.app.config.setdefault('TIMING_FOOTER', False)  # Also in a footer of the pages
+
+        # Prometheus /metrics, see metrics.py
+        self.app.config.setdefault('METRICS_ENABLED', False)
+        self.app.config.setdefault('METRICS_DIR', None)  # Files shared by the workers, default in the temporary directory
+
+        # Slow query log, see slowlog.py
+        self.app.config.setdefault('SLOW_QUERY_THRESHOLD', 0)  # In ms, 0 to disable
+        self.app.config.setdefault('SLOW_QUERY_LOG_SIZE', 100)  # Slow queries kept per process
+        self.app.config.setdefault('SLOW_QUERY_API', False)  # Expose them on /api/v1/debug/slow-queries
+
+        # Server-Sent Events on /api/v1/events, each client holds a worker thread: needs threaded workers (gthread with serve)
+        self.app.config.setdefault('EVENTS_ENABLED', False)
+        self.app.config.setdefault('EVENTS_INTERVAL', 2)  # Seconds between two checks of the database
+        self.app.config.setdefault('EVENTS_KEEPALIVE', 15)  # Seconds without event before a keep-alive comment
+        self.app.config.setdefault('EVENTS_MAX_DURATION', 300)  # Seconds before closing a stream, the browser reconnects
+
+        # Rate and ETA of the downloads in progress, see progress.py
+        self.app.config.setdefault('RATE_SMOOTHING', 60)  # Time constant of the moving average in seconds
 
         self.app.config.setdefault('SWAGGER_UI_DOC_EXPANSION', 'list')  # Expense swager namespaces
         self.app.config['PROPAGATE_EXCEPTIONS'] = False
@@ -6,13 +6,80 @@
 # file that was distributed with this source code.
 #
 import os
-import humanize
+import threading
+import time
+from collections import deque
 from flask import Flask
+from peewee import DatabaseError, OperationalError, SqliteDatabase
 from playhouse.flask_utils import FlaskDB
+from typing import Any
+from urllib.parse import quote
 from seedboxsync.core.dao import Download, Lock, SeedboxSync, Torrent
+from seedboxsync_front.metrics import metrics
+from seedboxsync_front.slowlog import slow_queries
+from seedboxsync_front.timing import current as current_timings
 from seedboxsync_front.utils import byte_to_gi
 
 
+class TimedSqliteDatabase(SqliteDatabase):
+    """
+    SqliteDatabase adding the query execution time to the request timings, the metrics and the slow query log.
+    """
+
+    def execute_sql(self, sql: str, params: Any = None) -> Any:
+        """
+        Execute a query, timed if the timing of the request, the metrics or the slow query log are enabled.
+        """
+        timings = current_timings.get()
+        if timings is None and not metrics.enabled and not slow_queries.enabled:
+            return super().execute_sql(sql, params)  # type: ignore[no-untyped-call]
+        start = time.perf_counter()
+        try:
+            return super().execute_sql(sql, params)  # type: ignore[no-untyped-call]
+        except OperationalError as e:
+            if 'locked' in str(e):
+                metrics.inc('seedboxsync_front_db_busy_total')
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            if timings is not None:
+                timings.add('db', elapsed)
+            metrics.observe('seedboxsync_front_db_query_duration_seconds', elapsed)
+            slow_queries.check(self, sql, params, elapsed)
+
+
+class CountingSqliteDatabase(TimedSqliteDatabase):
+    """
+    SqliteDatabase keeping track of the connections it opens.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.connects: deque[float] = deque()
+
+    def _connect(self) -> Any:
+        """
+        Open a new connection and record when it happened.
+        """
+        conn = super()._connect()  # type: ignore[misc]
+        now = time.monotonic()
+        self.connects.append(now)
+        while self.connects and self.connects[0] < now - 60:
+            self.connects.popleft()
+
+        return conn
+
+    def connects_per_minute(self) -> int:
+        """
+        Number of connections opened during the last minute.
+
+        Returns:
+            int: The connection count.
+        """
+        since = time.monotonic() - 60
+        return len([t for t in list(self.connects) if t >= since])
+
+
 class Database(object):
     """
     Database connector using peewee.
@@ -21,6 +88,17 @@ class Database(object):
         app (Flask): The database object.
     """
 
+    # Pragmas applied on each new connection, overridable by DATABASE_PRAGMAS
+    DEFAULT_PRAGMAS: dict[str, Any] = {
+        'cache_size': -65536,  # 64 MiB page cache
+        'mmap_size': 268435456,  # 256 MiB memory-mapped I/O
+        'temp_store': 'memory',
+        'busy_timeout': 5000,  # Wait for the SeedboxSync writer instead of failing
+    }
+
+    # Pragmas reported on the info page
+    REPORTED_PRAGMAS = ['journal_mode', 'query_only', 'cache_size', 'mmap_size', 'temp_store', 'busy_timeout', 'page_size']
+
     def __init__(self, app: Flask):
         """
         Initialize a new Database instance.
@@ -30,6 +108,8 @@ class Database(object):
             database (SqliteDatabase | None): The database object.
         """
         self.__app = app
+        self.__app.extensions['seedboxsync_db'] = self
+        self.__local = threading.local()
         self.__load_database()
         self.__register_functions()
 
@@ -41,29 +121,129 @@ class Database(object):
         # Get DB from config
         db_file = self.__app.config['DATABASE']
         db_url = 'sqlite:///' + db_file
+        self.read_only = bool(self.__app.config.get('DATABASE_READ_ONLY'))
+        self.mode = self.__app.config.get('DATABASE_CONNECTION', 'request')
+        self.pool_recycle = int(self.__app.config.get('DATABASE_POOL_RECYCLE', 1000))
+        if self.mode not in ('request', 'pool'):
+            self.__app.logger.warning('Unknown DATABASE_CONNECTION %s, fallback to request', self.mode)
+            self.mode = 'request'
+        self.wal = self.is_wal(db_file)
+        self.pragmas = self.__build_pragmas()
 
         if not os.path.exists(db_file):
             self.__app.logger.error('No database %s found', db_url)
             self.__app.config['INIT_ERROR'] = "Can't load seedbox database!"
         else:
-            db_wrapper = FlaskDB(self.__app, db_url)
-            self.db = db_wrapper.database
+            if self.read_only:
+                database = CountingSqliteDatabase('file:{}?mode=ro'.format(quote(db_file)), pragmas=self.pragmas, uri=True)
+            else:
+                database = CountingSqliteDatabase(db_file, pragmas=self.pragmas)
+
+            if self.mode == 'pool':
+                # One long-lived connection per thread, never closed on teardown
+                self.db = database
+                self.__app.before_request(self.__acquire_connection)
+            else:
+                # Open on before_request, close on teardown_request
+                db_wrapper = FlaskDB(self.__app, database)
+                self.db = db_wrapper.database
             self.db.bind([Download, Lock, SeedboxSync, Torrent])
-            self.__app.logger.debug('Use database %s', db_url)
+            self.__app.logger.debug('Use database %s (mode: %s, read-only: %s, WAL: %s)', db_url, self.mode, self.read_only, self.wal)
+
+            if self.read_only and not self.wal:
+                self.__app.logger.warning('Database %s is not in WAL mode: read-only readers can still delay SeedboxSync writes', db_url)
+
+    def __build_pragmas(self) -> dict[str, Any]:
+        """
+        Build the pragmas applied at connect time.
+
+        Returns:
+            dict[str, Any]: Defaults merged with DATABASE_PRAGMAS.
+        """
+        pragmas = dict(Database.DEFAULT_PRAGMAS)
+        pragmas.update(self.__app.config.get('DATABASE_PRAGMAS') or {})
+        if self.read_only:
+            pragmas['query_only'] = 1
+
+        return pragmas
+
+    def __acquire_connection(self) -> None:
+        """
+        Reuse the connection of the current thread, recycling it when needed.
+
+        The connection is recycled after DATABASE_POOL_RECYCLE requests, when
+        the database file has been replaced or when the health check fails.
+        """
+        local = self.__local
+        if not self.db.is_closed():
+            local.requests = getattr(local, 'requests', 0) + 1
+            if local.requests <= self.pool_recycle and local.file_id == self.__file_id() and self.__is_healthy():
+                return
+            self.db.close()
+
+        self.db.connect()
+        local.requests = 1
+        local.file_id = self.__file_id()
+
+    def __is_healthy(self) -> bool:
+        """
+        Health check of the current connection.
+
+        Returns:
+            bool: True if the connection answers.
+        """
+        try:
+            self.db.execute_sql('SELECT 1')
+        except DatabaseError:
+            self.__app.logger.warning('Database connection is broken, reconnecting')
+            return False
+        return True
+
+    def __file_id(self) -> tuple[int, int] | None:
+        """
+        Identify the database file, to detect a replacement.
+
+        Returns:
+            tuple[int, int] | None: Device and inode of the database file.
+        """
+        try:
+            st = os.stat(self.__app.config['DATABASE'])
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino
 
     def __register_functions(self) -> None:
         """
         Register DB functions.
         """
-        @self.db.func('byte_to_gi')  # type: ignore
+        @self.db.func('byte_to_gi')
         def db_byte_to_gi(num: float, suffix: str = 'B') -> str:
             return byte_to_gi(num, suffix)
 
-        @self.db.func('humanize')  # type: ignore
-        def db_humanize(num: float) -> str:
-            try:
-                # Treat None or invalid type as 0
-                num = float(num or 0)
-            except (ValueError, TypeError):
-                num = 0.0
-            return humanize.filesize.naturalsize(num, True)
+    def get_pragmas(self) -> dict[str, Any]:
+        """
+        Read the pragmas active on the current connection.
+
+        Returns:
+            dict[str, Any]: Pragma name and its current value.
+        """
+        return {pragma: self.db.pragma(pragma) for pragma in Database.REPORTED_PRAGMAS}
+
+    @staticmethod
+    def is_wal(db_file: str) -> bool:
+        """
+        Detect a WAL database from its header, without opening a connection.
+
+        Args:
+            db_file (str): Path to the SQLite database.
+
+        Returns:
+            bool: True if the file format read/write versions are set to WAL.
+        """
+        try:
+            with open(db_file, 'rb') as f:
+                header = f.read(20)
+        except OSError:
+            return False
+
+        return len(header) == 20 and header[18] == 2 and header[19] == 2
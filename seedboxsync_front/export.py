@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from flask import Response, stream_with_context
+from peewee import ModelSelect
+from typing import Any, Iterable, Iterator
+
+# Export format: mimetype
+FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+CHUNK_SIZE = 65536  # Bytes buffered before being sent
+
+
+def iterate_query(query: ModelSelect) -> Iterator[tuple[Any, ...]]:
+    """
+    Read the rows of a query one by one from the SQLite cursor.
+
+    The response is streamed after the request teardown, which closes the
+    per-request connection: open one for the time of the export if needed.
+
+    Args:
+        query (ModelSelect): The query, returning tuples.
+
+    Yields:
+        tuple[Any, ...]: A row.
+    """
+    database = query.model._meta.database
+    opened = database.is_closed()
+    if opened:
+        database.connect()
+    try:
+        yield from query.iterator()
+    finally:
+        if opened:
+            database.close()
+
+
+def export_value(value: Any) -> Any:
+    """
+    Serialize a database value for the export.
+
+    Args:
+        value (Any): The value.
+
+    Returns:
+        Any: ISO 8601 string for the dates, the value as is otherwise.
+    """
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def export_lines(rows: Iterable[tuple[Any, ...]], columns: list[str], format: str) -> Iterator[str]:
+    """
+    Serialize rows, one line per row.
+
+    Args:
+        rows (Iterable[tuple[Any, ...]]): The rows, in the columns order.
+        columns (list[str]): Names of the columns.
+        format (str): 'ndjson' or 'csv'.
+
+    Yields:
+        str: A line, ending with a new line.
+    """
+    if format == 'csv':
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([export_value(value) for value in row])
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue()
+        return
+
+    for row in rows:
+        yield json.dumps({column: export_value(value) for column, value in zip(columns, row)}, separators=(',', ':')) + '\n'
+
+
+def export_chunks(lines: Iterable[str], compress: bool = False) -> Iterator[bytes]:
+    """
+    Group lines in chunks of about CHUNK_SIZE bytes, optionally gzip-compressed.
+
+    Args:
+        lines (Iterable[str]): The lines to send.
+        compress (bool): Compress on the fly with gzip.
+
+    Yields:
+        bytes: A chunk of the response body.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None  # wbits 31: gzip container
+    chunk: list[bytes] = []
+    size = 0
+    for line in lines:
+        data = line.encode()
+        chunk.append(data)
+        size += len(data)
+        if size >= CHUNK_SIZE:
+            body = b''.join(chunk)
+            chunk, size = [], 0
+            if compressor is not None:
+                body = compressor.compress(body)
+            if body:
+                yield body
+
+    body = b''.join(chunk)
+    if compressor is not None:
+        body = compressor.compress(body) + compressor.flush()
+    if body:
+        yield body
+
+
+def export_response(query: ModelSelect, columns: list[str], name: str, format: str = 'ndjson', compress: bool = False) -> Response:
+    """
+    Stream the rows of a query as an NDJSON or CSV file, with constant memory.
+
+    Args:
+        query (ModelSelect): The query, returning tuples in the columns order.
+        columns (list[str]): Names of the columns.
+        name (str): Name of the exported file, without extension.
+        format (str): 'ndjson' or 'csv'.
+        compress (bool): Compress on the fly with gzip.
+
+    Returns:
+        Response: The streamed response.
+    """
+    filename = '{}.{}{}'.format(name, format, '.gz' if compress else '')
+    response = Response(
+        stream_with_context(export_chunks(export_lines(iterate_query(query), columns, format), compress)),
+        mimetype='application/gzip' if compress else FORMATS[format],
+    )
+    response.headers['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+    return response
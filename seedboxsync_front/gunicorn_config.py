@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+# Gunicorn configuration of seedboxsync-front serve, each setting can be changed
+# by its GUNICORN_* environment variable. Also usable directly:
+#   gunicorn -c python:seedboxsync_front.gunicorn_config seedboxsync_front.app:app
+#
+import glob
+import os
+from typing import Any
+
+
+def env_int(name: str, default: int) -> int:
+    """
+    Read an integer from the environment.
+
+    Args:
+        name (str): Name of the variable.
+        default (int): Value if the variable is not set.
+
+    Returns:
+        int: The value.
+    """
+    return int(os.environ.get(name) or default)
+
+
+def env_bool(name: str, default: bool) -> bool:
+    """
+    Read a boolean from the environment (1, true, yes or on).
+
+    Args:
+        name (str): Name of the variable.
+        default (bool): Value if the variable is not set.
+
+    Returns:
+        bool: The value.
+    """
+    value = os.environ.get(name)
+    if not value:
+        return default
+    return value.lower() in ('1', 'true', 'yes', 'on')
+
+
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:8000')
+
+# SQLite reads scale with the processes, the threads absorb the I/O waits and the
+# Server-Sent Events streams (EVENTS_ENABLED), each holding a thread.
+# More than 4 processes mostly multiply the caches and connections on a NAS.
+worker_class = 'gthread'
+workers = env_int('GUNICORN_WORKERS', max(2, min(os.cpu_count() or 1, 4)))
+threads = env_int('GUNICORN_THREADS', 8)
+
+# Load the app once in the master: faster forks, shared memory. On SIGHUP,
+# seedboxsync-front serve loads it again and replaces the workers gracefully.
+preload_app = env_bool('GUNICORN_PRELOAD', True)
+
+# Recycle the workers to bound the memory, the jitter avoids restarting them all at once
+max_requests = env_int('GUNICORN_MAX_REQUESTS', 1000)
+max_requests_jitter = env_int('GUNICORN_MAX_REQUESTS_JITTER', 100)
+
+keepalive = env_int('GUNICORN_KEEPALIVE', 5)  # Seconds, reuse the connections of the browser polling
+timeout = env_int('GUNICORN_TIMEOUT', 60)
+graceful_timeout = env_int('GUNICORN_GRACEFUL_TIMEOUT', 30)
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG') or None
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
+
+
+def on_starting(server: Any) -> None:
+    """
+    Remove the metrics files of the previous run, only the live server is counted.
+
+    Args:
+        server (Arbiter): The gunicorn master.
+    """
+    from seedboxsync_front.metrics import metrics
+
+    if metrics.enabled and metrics.directory:
+        for path in glob.glob(os.path.join(metrics.directory, '*.db')):
+            os.unlink(path)
+
+
+def worker_exit(server: Any, worker: Any) -> None:
+    """
+    Merge the metrics of a worker exiting gracefully (max_requests, reload), in the worker.
+
+    Args:
+        server (Arbiter): The gunicorn master.
+        worker (Worker): The exiting worker.
+    """
+    from seedboxsync_front.metrics import metrics
+
+    metrics.merge(worker.pid)
+
+
+def child_exit(server: Any, worker: Any) -> None:
+    """
+    Merge the metrics of a worker killed or crashed, in the master (needs preload_app).
+
+    Args:
+        server (Arbiter): The gunicorn master.
+        worker (Worker): The exited worker.
+    """
+    from seedboxsync_front.metrics import metrics
+
+    metrics.merge(worker.pid)
@@ -0,0 +1,392 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import fcntl
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+from contextlib import contextmanager
+from flask import Flask, g, request, Response
+from time import perf_counter
+from typing import Any, Iterator
+from seedboxsync_front.cache import cache
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+# Samples of the exited workers, and lock of the merges
+MERGED_FILE = 'merged.db'
+LOCK_FILE = 'merge.lock'
+
+# Metric: type, help and buckets of the histograms
+METRICS: dict[str, tuple[str, str, tuple[float, ...]]] = {
+    'seedboxsync_front_requests_total': ('counter', 'Requests served, by endpoint and status.', ()),
+    'seedboxsync_front_request_duration_seconds': ('histogram', 'Request latency, by endpoint.', LATENCY_BUCKETS),
+    'seedboxsync_front_db_query_duration_seconds': ('histogram', 'SQLite query execution time.', QUERY_BUCKETS),
+    'seedboxsync_front_db_busy_total': ('counter', 'Queries failed on a locked database after busy_timeout.', ()),
+    'seedboxsync_front_cache_requests_total': ('counter', 'Cache lookups, by result (hit or miss).', ()),
+    'seedboxsync_front_rows_returned_total': ('counter', 'Rows returned by the API lists, by endpoint.', ()),
+}
+
+
+class MmapStore(object):
+    """
+    Values of one process in a memory-mapped file, read by all the workers.
+
+    Layout: used size (8 bytes), then entries of key length (4 bytes), UTF-8 key
+    padded to 8 bytes and value (double). Entries are written before the used
+    size, so readers never see a partial entry.
+    """
+
+    INITIAL_SIZE = 65536
+
+    def __init__(self, path: str):
+        """
+        Open or create the file of the current process.
+
+        Args:
+            path (str): Path of the file.
+        """
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__file = open(path, 'a+b')
+        size = max(os.fstat(self.__file.fileno()).st_size, MmapStore.INITIAL_SIZE)
+        self.__file.truncate(size)
+        self.__mmap = mmap.mmap(self.__file.fileno(), size)
+        self.__used = struct.unpack_from('Q', self.__mmap, 0)[0] or 8
+        self.__positions = {key: position for key, _, position in MmapStore.entries(self.__mmap)}
+
+    def close(self) -> None:
+        """
+        Unmap and close the file.
+        """
+        with self.__lock:
+            self.__mmap.close()
+            self.__file.close()
+
+    def inc(self, key: str, amount: float = 1.0) -> None:
+        """
+        Increment a value.
+
+        Args:
+            key (str): The sample key.
+            amount (float): The increment.
+        """
+        with self.__lock:
+            position = self.__positions.get(key)
+            if position is None:
+                position = self.__append(key)
+            struct.pack_into('d', self.__mmap, position, struct.unpack_from('d', self.__mmap, position)[0] + amount)
+
+    def __append(self, key: str) -> int:
+        """
+        Add a new key, growing the file if needed.
+
+        Args:
+            key (str): The sample key.
+
+        Returns:
+            int: Position of the value.
+        """
+        encoded = key.encode()
+        padded = (len(encoded) + 4 + 7) // 8 * 8
+        size = padded + 8
+        if self.__used + size > len(self.__mmap):
+            capacity = max(len(self.__mmap) * 2, self.__used + size)
+            self.__mmap.close()
+            self.__file.truncate(capacity)
+            self.__mmap = mmap.mmap(self.__file.fileno(), capacity)
+
+        struct.pack_into('i{}sd'.format(padded - 4), self.__mmap, self.__used, len(encoded), encoded, 0.0)
+        position = self.__used + padded
+        self.__used += size
+        struct.pack_into('Q', self.__mmap, 0, self.__used)
+        self.__positions[key] = position
+
+        return position
+
+    @staticmethod
+    def entries(data: Any) -> Iterator[tuple[str, float, int]]:
+        """
+        Read the entries of a file.
+
+        Args:
+            data (Any): Content of the file (bytes or mmap).
+
+        Yields:
+            tuple[str, float, int]: Key, value and position of the value.
+        """
+        used = struct.unpack_from('Q', data, 0)[0] if len(data) >= 8 else 0
+        position = 8
+        while position < used:
+            length = struct.unpack_from('i', data, position)[0]
+            key = bytes(data[position + 4:position + 4 + length]).decode()
+            position += (length + 4 + 7) // 8 * 8
+            yield key, struct.unpack_from('d', data, position)[0], position
+            position += 8
+
+
+class CountedCache(object):
+    """
+    Proxy of the cache backend counting the hits and misses.
+    """
+
+    def __init__(self, backend: Any, metrics: 'Metrics'):
+        self.__backend = backend
+        self.__metrics = metrics
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.__backend, name)
+
+    def get(self, *args: Any, **kwargs: Any) -> Any:
+        value = self.__backend.get(*args, **kwargs)
+        self.__metrics.inc('seedboxsync_front_cache_requests_total', result='miss' if value is None else 'hit')
+        return value
+
+
+class Metrics(object):
+    """
+    Prometheus metrics aggregated across the worker processes, without external service.
+
+    Each process writes its samples in its own memory-mapped file of METRICS_DIR,
+    /metrics sums the files of all the processes. When a worker exits, gunicorn
+    calls merge() to move its samples into merged.db: workers recycled by
+    max_requests don't pile up files.
+
+    Attributes:
+        enabled (bool): True if METRICS_ENABLED.
+        directory (str): Directory of the per process files.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.directory = ''
+        self.__store: MmapStore | None = None
+        self.__pid = 0
+        self.__lock = threading.Lock()
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Register the request and cache instrumentation if METRICS_ENABLED.
+
+        Args:
+            app (Flask): The Flask app.
+        """
+        self.enabled = bool(app.config.get('METRICS_ENABLED'))
+        if not self.enabled:
+            return
+
+        self.directory = app.config.get('METRICS_DIR') or os.path.join(
+            tempfile.gettempdir(), 'seedboxsync-front-metrics-' + hashlib.sha1(app.config['DATABASE'].encode()).hexdigest()[:8]
+        )
+        os.makedirs(self.directory, exist_ok=True)
+        self.__store = None
+
+        app.extensions['cache'][cache] = CountedCache(app.extensions['cache'][cache], self)
+        app.before_request(self.__start)
+        app.after_request(self.__observe)
+        app.logger.debug('Metrics stored in %s', self.directory)
+
+    @property
+    def store(self) -> MmapStore:
+        """
+        File of the current process, reopened after a fork.
+
+        Returns:
+            MmapStore: The store.
+        """
+        store = self.__store
+        if store is None or self.__pid != os.getpid():
+            with self.__lock:
+                if self.__store is None or self.__pid != os.getpid():
+                    self.__pid = os.getpid()
+                    self.__store = MmapStore(os.path.join(self.directory, '{}.db'.format(self.__pid)))
+                store = self.__store
+        return store
+
+    def inc(self, name: str, amount: float = 1.0, **labels: str) -> None:
+        """
+        Increment a counter.
+
+        Args:
+            name (str): A key of METRICS.
+            amount (float): The increment.
+            **labels (str): The labels of the sample.
+        """
+        if self.enabled:
+            self.store.inc(json.dumps([name, sorted(labels.items())]), amount)
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        """
+        Add an observation to a histogram.
+
+        Args:
+            name (str): A key of METRICS.
+            value (float): The observed value.
+            **labels (str): The labels of the sample.
+        """
+        if not self.enabled:
+            return
+
+        store = self.store
+        items = sorted(labels.items())
+        le = next((str(bucket) for bucket in METRICS[name][2] if value <= bucket), '+Inf')
+        store.inc(json.dumps([name + '_bucket', items, le]))  # Not cumulative, see render()
+        store.inc(json.dumps([name + '_sum', items]), value)
+        store.inc(json.dumps([name + '_count', items]))
+
+    def collect(self) -> dict[str, float]:
+        """
+        Sum the samples of all the processes.
+
+        Returns:
+            dict[str, float]: Sample key and value.
+        """
+        samples: dict[str, float] = {}
+        with self.__locked(fcntl.LOCK_SH):  # Not while a file is merged, it would be counted twice
+            for path in glob.glob(os.path.join(self.directory, '*.db')):
+                try:
+                    with open(path, 'rb') as f:
+                        data = f.read()
+                except OSError:
+                    continue
+                for key, value, _ in MmapStore.entries(data):
+                    samples[key] = samples.get(key, 0.0) + value
+
+        return samples
+
+    def merge(self, pid: int) -> None:
+        """
+        Add the samples of an exited process to merged.db and remove its file.
+
+        Args:
+            pid (int): Process identifier of the worker.
+        """
+        if not self.enabled:
+            return
+
+        path = os.path.join(self.directory, '{}.db'.format(pid))
+        with self.__locked(fcntl.LOCK_EX):
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+            except OSError:
+                return  # Already merged
+            merged = MmapStore(os.path.join(self.directory, MERGED_FILE))
+            try:
+                for key, value, _ in MmapStore.entries(data):
+                    merged.inc(key, value)
+            finally:
+                merged.close()
+            os.unlink(path)
+
+    @contextmanager
+    def __locked(self, operation: int) -> Iterator[None]:
+        """
+        Lock the directory between the processes, released on exit.
+
+        Args:
+            operation (int): fcntl.LOCK_SH or fcntl.LOCK_EX.
+        """
+        with open(os.path.join(self.directory, LOCK_FILE), 'a') as f:
+            fcntl.flock(f, operation)
+            yield
+
+    def render(self) -> str:
+        """
+        Render the metrics in the Prometheus text format.
+
+        Returns:
+            str: The exposition.
+        """
+        series: dict[str, dict[Any, Any]] = {}
+        for key, value in self.collect().items():
+            sample, items, *le = json.loads(key)
+            labels = tuple(tuple(item) for item in items)
+            series.setdefault(sample, {})
+            if le:
+                series[sample].setdefault(labels, {})[le[0]] = value
+            else:
+                series[sample][labels] = value
+
+        lines = []
+        for name, (kind, description, buckets) in METRICS.items():
+            lines.append('# HELP {} {}'.format(name, description))
+            lines.append('# TYPE {} {}'.format(name, kind))
+            if kind == 'counter':
+                for labels, value in sorted(series.get(name, {}).items()):
+                    lines.append('{}{} {}'.format(name, Metrics.labels(labels), Metrics.value(value)))
+                continue
+
+            for labels, counts in sorted(series.get(name + '_bucket', {}).items()):
+                total = 0.0
+                for le in [str(bucket) for bucket in buckets] + ['+Inf']:
+                    total += counts.get(le, 0.0)
+                    lines.append('{}_bucket{} {}'.format(name, Metrics.labels(labels + (('le', le),)), Metrics.value(total)))
+                lines.append('{}_sum{} {}'.format(name, Metrics.labels(labels), Metrics.value(series[name + '_sum'].get(labels, 0.0))))
+                lines.append('{}_count{} {}'.format(name, Metrics.labels(labels), Metrics.value(series[name + '_count'].get(labels, 0.0))))
+
+        return '\n'.join(lines) + '\n'
+
+    @staticmethod
+    def labels(labels: tuple[tuple[str, str], ...]) -> str:
+        """
+        Format the labels of a sample.
+
+        Args:
+            labels (tuple[tuple[str, str], ...]): Label names and values.
+
+        Returns:
+            str: The labels, empty if none.
+        """
+        if not labels:
+            return ''
+        return '{' + ','.join('{}="{}"'.format(name, str(value).replace('\\', '\\\\').replace('"', '\\"')) for name, value in labels) + '}'
+
+    @staticmethod
+    def value(value: float) -> str:
+        """
+        Format a sample value.
+
+        Args:
+            value (float): The value.
+
+        Returns:
+            str: Integers without decimals.
+        """
+        return str(int(value)) if value.is_integer() else repr(value)
+
+    def __start(self) -> None:
+        """
+        Start the request latency measure (before_request).
+        """
+        g.metrics_start = perf_counter()
+
+    def __observe(self, response: Response) -> Response:
+        """
+        Record the request latency and status (after_request).
+
+        Args:
+            response (Response): The response.
+
+        Returns:
+            Response: The response unchanged.
+        """
+        start = g.pop('metrics_start', None)
+        if start is not None:
+            endpoint = request.endpoint or 'none'  # Unknown paths share a label
+            self.observe('seedboxsync_front_request_duration_seconds', perf_counter() - start, endpoint=endpoint, method=request.method)
+            self.inc('seedboxsync_front_requests_total', endpoint=endpoint, method=request.method, status=str(response.status_code))
+        return response
+
+
+metrics = Metrics()
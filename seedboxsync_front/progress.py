@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import math
+import threading
+import time
+from datetime import datetime
+from flask import current_app
+from typing import Any
+from seedboxsync_front.cache import db_generation
+
+# Samples of the downloads not read since are forgotten
+FORGET_AFTER = 3600
+
+
+class Sample(object):
+    """
+    Last state seen of a download in progress.
+
+    Attributes:
+        generation (str): Database generation of the last sample.
+        size (int): Local size at the last change.
+        changed (float): Monotonic time of the last change.
+        seen (float): Monotonic time of the last read.
+        rate (float | None): Smoothed rate in bytes per second, None if unknown.
+    """
+
+    def __init__(self, generation: str, size: int, now: float, rate: float | None) -> None:
+        self.generation = generation
+        self.size = size
+        self.changed = now
+        self.seen = now
+        self.rate = rate
+
+
+class RateEstimator(object):
+    """
+    Estimate the rate and the remaining time of the downloads in progress.
+
+    SeedboxSync saves local_size every 50 MB. The rows already read by the API
+    are sampled in memory, once per database generation: the rate of a download
+    is the size written since its previous change over the elapsed time,
+    smoothed by an exponential moving average with a time constant of
+    RATE_SMOOTHING seconds. The first estimate is the average rate since the
+    start of the download.
+
+    Each worker has its own samples, a download stalled keeps its last rate
+    until local_size changes.
+    """
+
+    def __init__(self) -> None:
+        self.samples: dict[int, Sample] = {}
+        self.__lock = threading.Lock()
+
+    def annotate(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Add rate_bps and eta_seconds to the downloads in progress of query rows.
+
+        Args:
+            rows (list[dict[str, Any]]): Rows with id, started, finished, local_size and seedbox_size.
+
+        Returns:
+            list[dict[str, Any]]: The rows, finished downloads are unchanged.
+        """
+        in_progress = [row for row in rows if row.get('finished') == 0]
+        if not in_progress:
+            return rows
+
+        generation = db_generation()
+        smoothing = current_app.config['RATE_SMOOTHING']
+        now = time.monotonic()
+        with self.__lock:
+            for row in in_progress:
+                sample = self.sample(row, generation, now, smoothing)
+                remaining = (row['seedbox_size'] or 0) - (row['local_size'] or 0)
+                row['rate_bps'] = sample.rate
+                row['eta_seconds'] = int(remaining / sample.rate) if sample.rate and remaining >= 0 else None
+
+            for id in [id for id, sample in self.samples.items() if now - sample.seen > FORGET_AFTER]:
+                del self.samples[id]
+
+        return rows
+
+    def sample(self, row: dict[str, Any], generation: str, now: float, smoothing: float) -> Sample:
+        """
+        Update the sample of a download with a row, if it was not already read in this generation.
+
+        Args:
+            row (dict[str, Any]): The row of the download.
+            generation (str): Current database generation.
+            now (float): Monotonic time of the read.
+            smoothing (float): Time constant of the moving average, in seconds.
+
+        Returns:
+            Sample: The sample of the download.
+        """
+        size = row['local_size'] or 0
+        sample = self.samples.get(row['id'])
+        if sample is None or size < sample.size:
+            # New or restarted download: average rate since the start
+            elapsed = (datetime.now() - row['started']).total_seconds() if isinstance(row['started'], datetime) else 0
+            sample = self.samples[row['id']] = Sample(generation, size, now, size / elapsed if size and elapsed > 0 else None)
+        elif sample.generation != generation:
+            sample.generation = generation
+            elapsed = now - sample.changed
+            if size > sample.size and elapsed > 0:
+                rate = (size - sample.size) / elapsed
+                if sample.rate is None:
+                    sample.rate = rate
+                else:
+                    sample.rate += (1 - math.exp(-elapsed / smoothing)) * (rate - sample.rate)
+                sample.size, sample.changed = size, now
+        sample.seen = now
+
+        return sample
+
+
+rates = RateEstimator()
@@ -0,0 +1,306 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from contextlib import contextmanager
+from datetime import datetime
+from flask import current_app
+from peewee import Case, chunked, EXCLUDED, fn
+from typing import Any, Iterator
+from seedboxsync.core.dao import Download
+from seedboxsync_front.cache import versioned_value
+from seedboxsync_front.sidecar import DownloadDaily, DownloadPending, FrontState, sidecar
+
+# Period: strftime format of the bucket
+PERIODS = {
+    'day': '%Y-%m-%d',
+    'week': '%Y-%W',
+    'month': '%Y-%m',
+    'year': '%Y',
+}
+# Throughput bucket: strftime format of the bucket
+THROUGHPUT_BUCKETS = {
+    'hour': '%Y-%m-%d %H:00',
+    'day': '%Y-%m-%d',
+}
+PERCENTILES = (50, 90, 99)
+ROLLUP_KEY = 'download_daily_id'
+SYNC_BATCH = 500
+
+
+def aggregate_downloads(period: str, where: Any = None) -> list[tuple[str, int, int, int]]:
+    """
+    Aggregate the finished downloads by period in SQL.
+
+    As the historical statistics, downloads without seedbox size are ignored.
+
+    Args:
+        period (str): A key of PERIODS.
+        where (Any): Optional extra filter on Download.
+
+    Returns:
+        list[tuple[str, int, int, int]]: Period, files, seedbox size and local size, ordered by period.
+    """
+    key = fn.strftime(PERIODS[period], Download.finished)
+    query = Download.select(
+        key,
+        fn.COUNT(Download.id),
+        fn.COALESCE(fn.SUM(Download.seedbox_size), 0),
+        fn.COALESCE(fn.SUM(Download.local_size), 0),
+    ).where(Download.finished != 0, Download.seedbox_size != 0, key.is_null(False))
+    if where is not None:
+        query = query.where(where)
+
+    return list(query.group_by(key).order_by(key).tuples())
+
+
+def downloads_summary() -> dict[str, Any]:
+    """
+    Summary of the finished downloads, one query cached until the database changes.
+
+    Returns:
+        dict[str, Any]: Number of files, total seedbox size, first and last finished dates.
+    """
+    def compute() -> dict[str, Any]:
+        summary: dict[str, Any] = Download.select(
+            fn.COUNT(Download.id).alias('files'),
+            fn.COALESCE(fn.SUM(Download.seedbox_size), 0).alias('total_size'),
+            fn.MIN(Download.finished).alias('first'),
+            fn.MAX(Download.finished).alias('last'),
+        ).where(Download.finished != 0).dicts().get()
+        return summary
+
+    return versioned_value('downloads_summary', compute)  # type: ignore[no-any-return]
+
+
+def rollup_by_period(period: str) -> list[tuple[str, int, int, int]]:
+    """
+    Statistics by period, read from the per day rollup.
+
+    Args:
+        period (str): A key of PERIODS.
+
+    In read-only mode the front doesn't write: an outdated rollup is replaced
+    by the aggregation in SQL.
+
+    Returns:
+        list[tuple[str, int, int, int]]: Period, files, seedbox size and local size, ordered by period.
+    """
+    if not current_app.config.get('DATABASE_READ_ONLY'):
+        sync_rollup()
+    else:
+        max_id = Download.select(fn.MAX(Download.id)).scalar() or 0
+        with sidecar.connection_context():
+            if rollup_outdated(max_id):
+                return aggregate_downloads(period)
+
+    key = fn.strftime(PERIODS[period], DownloadDaily.day)
+    with sidecar.connection_context():
+        return list(DownloadDaily.select(  # type: ignore[arg-type]
+            key,
+            fn.SUM(DownloadDaily.files),
+            fn.SUM(DownloadDaily.seedbox_size),
+            fn.SUM(DownloadDaily.local_size),
+        ).where(DownloadDaily.files > 0).group_by(key).order_by(key).tuples())
+
+
+def rollup_outdated(max_id: int) -> bool:
+    """
+    Check without lock if downloads were added, or pending downloads finished or deleted, since the last sync.
+
+    Needs a connection of the front database.
+
+    Args:
+        max_id (int): Last identifier of the downloads.
+
+    Returns:
+        bool: True if the rollup must be synced.
+    """
+    if int(FrontState.get_value(ROLLUP_KEY, 0)) != max_id:
+        return True
+    pending = DownloadPending.select().count()
+    if not pending:
+        return False
+
+    # Read on the SeedboxSync connection, the front database is attached to it
+    in_progress = Download.select().where(Download.id.in_(DownloadPending.select(DownloadPending.id)), Download.finished == 0).count()
+    return bool(in_progress != pending)
+
+
+def sync_rollup() -> int:
+    """
+    Add the downloads finished since the last sync to the rollup.
+
+    New rows are read from the last processed id (watermark), rows seen in
+    progress are kept as pending until they are finished or deleted.
+
+    Returns:
+        int: Number of downloads added to the rollup.
+    """
+    max_id = Download.select(fn.MAX(Download.id)).scalar() or 0
+
+    with sidecar.connection_context():
+        if not rollup_outdated(max_id):
+            return 0
+
+        with sidecar.atomic('IMMEDIATE'):
+            last_id = int(FrontState.get_value(ROLLUP_KEY, 0))  # Another worker may have synced
+            if last_id > max_id:
+                # Last rows deleted outside the front, use the rebuild command to fix the buckets
+                DownloadPending.delete().where(DownloadPending.id > max_id).execute()
+                last_id = max_id
+
+            # Pending downloads: finished, still in progress or deleted
+            rows = []
+            pending = list(DownloadPending.select(DownloadPending.id).scalars())
+            # In progress rows are read first: a row finishing meanwhile stays pending for the next sync
+            for batch in chunked(pending, SYNC_BATCH):
+                in_progress = list(Download.select(Download.id).where(Download.id.in_(batch), Download.finished == 0).scalars())
+                rows += aggregate_downloads('day', Download.id.in_(batch) & Download.id.not_in(in_progress))
+                DownloadPending.delete().where(DownloadPending.id.in_(batch), DownloadPending.id.not_in(in_progress)).execute()
+
+            # New downloads, aggregated up to each batch of downloads in progress
+            if max_id > last_id:
+                new = (Download.id > last_id) & (Download.id <= max_id)
+                in_progress = list(Download.select(Download.id).where(new, Download.finished == 0).order_by(Download.id).scalars())
+                start = last_id
+                for batch in chunked(in_progress, SYNC_BATCH):
+                    rows += aggregate_downloads('day', (Download.id > start) & (Download.id <= batch[-1]) & Download.id.not_in(batch))
+                    DownloadPending.insert_many([(id,) for id in batch], fields=[DownloadPending.id]).on_conflict_ignore().execute()
+                    start = batch[-1]
+                rows += aggregate_downloads('day', (Download.id > start) & (Download.id <= max_id))
+
+            for batch in chunked(rows, SYNC_BATCH):
+                DownloadDaily.insert_many(batch, fields=[
+                    DownloadDaily.day,
+                    DownloadDaily.files,
+                    DownloadDaily.seedbox_size,
+                    DownloadDaily.local_size,
+                ]).on_conflict(conflict_target=[DownloadDaily.day], update={
+                    DownloadDaily.files: DownloadDaily.files + EXCLUDED.files,
+                    DownloadDaily.seedbox_size: DownloadDaily.seedbox_size + EXCLUDED.seedbox_size,
+                    DownloadDaily.local_size: DownloadDaily.local_size + EXCLUDED.local_size,
+                }).execute()
+            FrontState.set_value(ROLLUP_KEY, max_id)
+
+    return sum(row[1] for row in rows)
+
+
+def rebuild_rollup() -> int:
+    """
+    Drop and rebuild the rollup, needed when downloads are deleted outside the front.
+
+    Returns:
+        int: Number of downloads in the rollup.
+    """
+    with sidecar.connection_context():
+        with sidecar.atomic('IMMEDIATE'):
+            DownloadDaily.delete().execute()
+            DownloadPending.delete().execute()
+            FrontState.set_value(ROLLUP_KEY, 0)
+
+    return sync_rollup()
+
+
+@contextmanager
+def forget_downloads(ids: list[int]) -> Iterator[None]:
+    """
+    Remove downloads from the rollup, around their delete by the front.
+
+    Their buckets are read before the delete and updated once it is committed,
+    the rollup stays locked meanwhile so another worker can't sync them. If the
+    delete fails, the rollup is unchanged.
+
+    Args:
+        ids (list[int]): Identifiers of the downloads to delete.
+    """
+    if not current_app.config.get('STATS_ROLLUP'):
+        yield
+        return
+
+    with sidecar.connection_context():
+        with sidecar.atomic('IMMEDIATE'):
+            last_id = int(FrontState.get_value(ROLLUP_KEY, 0))
+            rows = []
+            pending = []
+            for batch in chunked([id for id in ids if id <= last_id], SYNC_BATCH):  # Others are not in the rollup yet
+                # Downloads seen in progress are not in the buckets
+                batch_pending = list(DownloadPending.select(DownloadPending.id).where(DownloadPending.id.in_(batch)).scalars())
+                rows += aggregate_downloads('day', Download.id.in_(batch) & Download.id.not_in(batch_pending))
+                pending += batch_pending
+
+            yield
+
+            for batch in chunked(pending, SYNC_BATCH):
+                DownloadPending.delete().where(DownloadPending.id.in_(batch)).execute()
+            for day, files, seedbox_size, local_size in rows:
+                DownloadDaily.update(
+                    files=DownloadDaily.files - files,
+                    seedbox_size=DownloadDaily.seedbox_size - seedbox_size,
+                    local_size=DownloadDaily.local_size - local_size,
+                ).where(DownloadDaily.day == day).execute()
+
+
+def transfer_rates(start: datetime, end: datetime, bucket: str, limit: int) -> dict[str, Any]:
+    """
+    Transfer rates of the downloads finished in a time range, computed in SQL.
+
+    The rate of a file is its seedbox size divided by its transfer duration,
+    downloads without seedbox size or duration are ignored. The throughput of a
+    bucket is its size divided by the time between its first start and its last
+    end, so it includes the parallel transfers.
+
+    Args:
+        start (datetime): Start of the range, included.
+        end (datetime): End of the range, excluded.
+        bucket (str): 'hour' or 'day'.
+        limit (int): Maximum number of files, the last finished first.
+
+    Returns:
+        dict[str, Any]: Files, buckets, overall rate and percentiles of the file rates, in bytes per second.
+    """
+    def seconds(date: Any) -> Any:
+        return fn.strftime('%s', date).cast('INTEGER')
+
+    duration = seconds(Download.finished) - seconds(Download.started)
+    rate = Download.seedbox_size.cast('REAL') / duration
+    where = (Download.finished != 0) & (Download.finished >= start) & (Download.finished < end) & (Download.seedbox_size > 0) & (duration > 0)
+
+    files = list(Download.select(
+        Download.id,
+        Download.path,
+        Download.started,
+        Download.finished,
+        Download.seedbox_size,
+        duration.alias('duration'),
+        rate.alias('rate'),
+    ).where(where).order_by(Download.finished.desc(), Download.id).limit(limit).dicts())
+
+    key = fn.strftime(THROUGHPUT_BUCKETS[bucket], Download.finished)
+    buckets = list(Download.select(
+        key.alias('period'),
+        fn.COUNT(Download.id).alias('files'),
+        fn.SUM(Download.seedbox_size).alias('size'),
+        fn.SUM(duration).alias('duration'),
+        (seconds(fn.MAX(Download.finished)) - seconds(fn.MIN(Download.started))).alias('span'),
+    ).where(where).group_by(key).order_by(key).dicts())
+    for row in buckets:
+        row['rate'] = row['size'] / row['duration']
+        row['throughput'] = row['size'] / row['span']
+
+    # Nearest rank percentiles: the lowest rate with a cumulative distribution reaching p
+    ranked = Download.select(rate.alias('rate'), fn.CUME_DIST().over(order_by=[rate]).alias('cume_dist')).where(where)
+    percentiles = Download.select(*[
+        fn.MIN(Case(None, [(ranked.c.cume_dist >= p / 100, ranked.c.rate)])) for p in PERCENTILES
+    ]).from_(ranked).tuples().get()
+
+    size = sum(row['size'] for row in buckets)
+    return {
+        'files': files,
+        'buckets': buckets,
+        'rate': size / sum(row['duration'] for row in buckets) if buckets else None,
+        'percentiles': {'p{}'.format(p): value for p, value in zip(PERCENTILES, percentiles)},
+    }
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import re
+from flask import current_app, g, has_request_context
+from peewee import chunked, fn, ModelSelect, SQL
+from typing import Any
+from seedboxsync.core.dao import Download, Torrent
+from seedboxsync_front.sidecar import DownloadIndex, FrontState, TorrentIndex, sidecar
+
+# Model: (FTS5 index, searched field, indexed field)
+INDEXES: dict[Any, tuple[Any, Any, Any]] = {
+    Download: (DownloadIndex, Download.path, DownloadIndex.path),
+    Torrent: (TorrentIndex, Torrent.name, TorrentIndex.name),
+}
+SYNC_BATCH = 1000
+WORD_RE = re.compile(r'\w+')
+# Shorter words have no trigram
+MIN_WORD_LENGTH = 3
+
+
+def build_match(search: str) -> str | None:
+    """
+    Translate a search string into an FTS5 query.
+
+    Every word must match a part of the indexed text (trigram tokenizer).
+
+    Args:
+        search (str): The search string.
+
+    Returns:
+        str | None: The FTS5 query, None if there is nothing to search or a word is too short for the index.
+    """
+    words = WORD_RE.findall(search)
+    if not words or any(len(word) < MIN_WORD_LENGTH for word in words):
+        return None
+    return ' '.join('"{}"'.format(word) for word in words)
+
+
+def filter_search(query: ModelSelect, model: Any, search: str, ranked: bool = False) -> ModelSelect:
+    """
+    Filter a query with a search string.
+
+    Use the FTS5 index of the front database when available, else fallback
+    to a LIKE '%search%' (also for the words shorter than 3 characters).
+
+    Args:
+        query (ModelSelect): Query on Download or Torrent.
+        model (Any): Download or Torrent.
+        search (str): The search string.
+        ranked (bool): Order by relevance (only with the FTS5 index).
+
+    Returns:
+        ModelSelect: The filtered query.
+    """
+    index, source, indexed = INDEXES[model]
+    match = build_match(search)
+    if not current_app.config.get('SEARCH_INDEX') or match is None:
+        return query.where(source.contains(search))
+
+    sync_once(model)
+    query = query.join(index, on=(index.rowid == model.id)).where(indexed.match(match))
+    if ranked:
+        query = query.order_by(SQL('rank'))
+    return query
+
+
+def sync_once(model: Any) -> None:
+    """
+    Sync an index once per request.
+
+    Args:
+        model (Any): Download or Torrent.
+    """
+    if not has_request_context():
+        sync_index(model)
+        return
+
+    synced = g.setdefault('search_index_synced', set())
+    if model not in synced:
+        sync_index(model)
+        synced.add(model)
+
+
+def sync_index(model: Any) -> int:
+    """
+    Index the rows added since the last sync (max id watermark).
+
+    Args:
+        model (Any): Download or Torrent.
+
+    Returns:
+        int: Number of indexed rows.
+    """
+    index, source, indexed = INDEXES[model]
+    key = '{}_id'.format(index._meta.table_name)
+    max_id = model.select(fn.MAX(model.id)).scalar() or 0
+
+    with sidecar.connection_context():
+        if int(FrontState.get_value(key, 0)) == max_id:
+            return 0
+
+        indexed_rows = 0
+        with sidecar.atomic('IMMEDIATE'):
+            last_id = int(FrontState.get_value(key, 0))  # Another worker may have synced
+            if last_id > max_id:
+                # Last rows deleted, their ids can be reused
+                index.delete().where(index.rowid > max_id).execute()
+                last_id = max_id
+
+            rows = model.select(model.id, source).where(model.id > last_id, model.id <= max_id).order_by(model.id).tuples().iterator()
+            for batch in chunked(rows, SYNC_BATCH):
+                index.insert_many(batch, fields=[index.rowid, indexed]).on_conflict_replace().execute()
+                indexed_rows += len(batch)
+            FrontState.set_value(key, max_id)
+
+    return indexed_rows
+
+
+def forget_index(model: Any, ids: list[int]) -> None:
+    """
+    Remove rows deleted by the front from an index.
+
+    Without AUTOINCREMENT, SeedboxSync reuses the ids above the last row: the
+    watermark is moved back to the last row, so they are indexed again.
+
+    Args:
+        model (Any): Download or Torrent.
+        ids (list[int]): Identifiers of the deleted rows.
+    """
+    if not current_app.config.get('SEARCH_INDEX') or not ids:
+        return
+
+    index, _, _ = INDEXES[model]
+    key = '{}_id'.format(index._meta.table_name)
+    max_id = model.select(fn.MAX(model.id)).scalar() or 0
+    with sidecar.connection_context():
+        with sidecar.atomic('IMMEDIATE'):
+            for batch in chunked(ids, SYNC_BATCH):
+                index.delete().where(index.rowid.in_(batch)).execute()
+            if int(FrontState.get_value(key, 0)) > max_id:
+                FrontState.set_value(key, max_id)
+
+
+def rebuild_index(model: Any) -> int:
+    """
+    Drop and rebuild an index.
+
+    Args:
+        model (Any): Download or Torrent.
+
+    Returns:
+        int: Number of indexed rows.
+    """
+    index, _, _ = INDEXES[model]
+    with sidecar.connection_context():
+        with sidecar.atomic('IMMEDIATE'):
+            index.delete().execute()
+            FrontState.set_value('{}_id'.format(index._meta.table_name), 0)
+
+    return sync_index(model)
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from flask import Flask
+from gunicorn.app.base import BaseApplication
+from typing import Any
+from seedboxsync_front import create_app, gunicorn_config
+
+
+class Server(BaseApplication):  # type: ignore[misc]
+    """
+    Gunicorn server of the front, configured by gunicorn_config.py.
+
+    On SIGHUP, the configuration and the app are loaded again (also with
+    preload_app) and the workers are replaced gracefully.
+    """
+
+    def __init__(self, options: dict[str, Any] | None = None):
+        self.options = {key: value for key, value in (options or {}).items() if value is not None}
+        super().__init__()
+
+    def load_config(self) -> None:
+        """
+        Apply the bundled configuration, then the options.
+        """
+        settings = {key: value for key, value in vars(gunicorn_config).items() if key in self.cfg.settings}
+        settings.update(self.options)
+        for key, value in settings.items():
+            self.cfg.set(key, value)
+
+    def load(self) -> Flask:
+        """
+        Create the app, in the master with preload_app.
+
+        Returns:
+            Flask: The app.
+        """
+        return create_app()
+
+    def reload(self) -> None:
+        """
+        Reload the configuration and forget the preloaded app, the new workers get a new one.
+        """
+        super().reload()
+        self.callable = None
@@ -0,0 +1,194 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from flask import Flask
+from datetime import datetime
+from peewee import CharField, DatabaseError, DateTimeField, IntegerField, Model, TextField
+from playhouse.sqlite_ext import AutoIncrementField, FTS5Model, RowIDField, SearchField
+from typing import Any
+from seedboxsync_front.db import TimedSqliteDatabase
+
+# Front-owned database, attached as "front" so the SeedboxSync schema is untouched.
+# Writes go through this connection, reads can also join from the SeedboxSync connection.
+SCHEMA = 'front'
+sidecar = TimedSqliteDatabase(None)
+
+
+class SidecarModel(Model):
+    """
+    Basemodel for the front-owned tables.
+    """
+    class Meta:
+        database = sidecar
+        schema = SCHEMA
+
+
+class FrontState(SidecarModel):
+    """
+    Key-value store for the front-owned state (watermarks, ...).
+    """
+    key = CharField(primary_key=True)
+    value = TextField()
+
+    @staticmethod
+    def get_value(key: str, default: Any = None) -> Any:
+        """
+        Get a state value.
+
+        Args:
+            key (str): The state key.
+            default (Any): Returned value if the key doesn't exist.
+
+        Returns:
+            Any: The stored value or default.
+        """
+        row = FrontState.select(FrontState.value).where(FrontState.key == key).first()
+        return row.value if row else default
+
+    @staticmethod
+    def set_value(key: str, value: Any) -> None:
+        """
+        Upsert a state value.
+
+        Args:
+            key (str): The state key.
+            value (Any): The value to store.
+        """
+        FrontState.replace(key=key, value=str(value)).execute()  # type: ignore[no-untyped-call]
+
+
+class DownloadDaily(SidecarModel):
+    """
+    Rollup of the finished downloads per day, only downloads with a seedbox size are counted.
+    """
+    day = CharField(primary_key=True)  # yyyy-mm-dd
+    files = IntegerField(default=0)
+    seedbox_size = IntegerField(default=0)
+    local_size = IntegerField(default=0)
+
+
+class DownloadPending(SidecarModel):
+    """
+    Downloads already seen by the rollup but not finished yet.
+    """
+    id = IntegerField(primary_key=True)
+
+
+class Tombstone(SidecarModel):
+    """
+    Rows deleted by the front, returned by the delta sync (since argument of the lists).
+    """
+    seq = AutoIncrementField()  # Never reused, even after a purge
+    table = CharField()  # Table name of the deleted row
+    row_id = IntegerField()
+    deleted = DateTimeField(default=datetime.now)
+
+
+class DownloadIndex(FTS5Model):  # type: ignore[misc]
+    """
+    Full-text index of Download.path, rowid is Download.id.
+
+    Trigrams match any part of the path, as the LIKE '%search%' they replace.
+    """
+    rowid = RowIDField()
+    path = SearchField()
+
+    class Meta:
+        database = sidecar
+        schema = SCHEMA
+        options = {'tokenize': 'trigram'}
+
+
+class TorrentIndex(FTS5Model):  # type: ignore[misc]
+    """
+    Full-text index of Torrent.name, rowid is Torrent.id.
+
+    Trigrams match any part of the name, as the LIKE '%search%' they replace.
+    """
+    rowid = RowIDField()
+    name = SearchField()
+
+    class Meta:
+        database = sidecar
+        schema = SCHEMA
+        options = {'tokenize': 'trigram'}
+
+
+class Sidecar(object):
+    """
+    Front-owned SQLite database, stored next to the SeedboxSync database.
+
+    Attributes:
+        enabled (bool): False if the database can't be created.
+    """
+
+    MODELS: list[Any] = [FrontState, DownloadDaily, DownloadPending, Tombstone]
+    SEARCH_MODELS: list[Any] = [DownloadIndex, TorrentIndex]
+
+    def __init__(self, app: Flask):
+        """
+        Initialize the front database and attach it to the SeedboxSync connection.
+
+        Args:
+            app (Flask): The Flask app.
+        """
+        self.__app = app
+        self.__app.extensions['seedboxsync_sidecar'] = self
+        self.enabled = False
+        self.path = self.__app.config['FRONT_DATABASE']
+
+        if not self.path:
+            self.__disable()
+            return
+
+        sidecar.init(':memory:', pragmas={'busy_timeout': 5000})
+        sidecar.detach(SCHEMA)
+        sidecar.attach(self.path, SCHEMA)
+        try:
+            with sidecar.connection_context():
+                sidecar.create_tables(Sidecar.MODELS)
+        except DatabaseError as e:
+            self.__app.logger.warning('Front database %s disabled: %s', self.path, e)
+            self.__disable()
+            return
+
+        if self.__app.config.get('SEARCH_INDEX'):
+            try:
+                with sidecar.connection_context():
+                    self.__drop_outdated_indexes()
+                    sidecar.create_tables(Sidecar.SEARCH_MODELS)
+            except DatabaseError as e:
+                self.__app.logger.warning('Search index disabled, FTS5 is not available: %s', e)
+                self.__app.config['SEARCH_INDEX'] = False
+
+        database = self.__app.extensions['seedboxsync_db']
+        if hasattr(database, 'db'):
+            database.db.detach(SCHEMA)
+            database.db.attach(self.path, SCHEMA)
+        self.enabled = True
+        self.__app.logger.debug('Use front database %s', self.path)
+
+    def __drop_outdated_indexes(self) -> None:
+        """
+        Drop the search indexes built with another tokenizer, they are rebuilt from the first row.
+        """
+        with sidecar.atomic('IMMEDIATE'):
+            for model in Sidecar.SEARCH_MODELS:
+                table = model._meta.table_name
+                sql = sidecar.execute_sql('SELECT sql FROM {}.sqlite_master WHERE name = ?'.format(SCHEMA), (table,)).fetchone()
+                if sql is None or model._meta.options['tokenize'] in sql[0]:
+                    continue
+                self.__app.logger.info('Rebuild the search index %s', table)
+                model.drop_table()
+                FrontState.delete().where(FrontState.key == '{}_id'.format(table)).execute()  # Watermark of search.sync_index()
+
+    def __disable(self) -> None:
+        """
+        Disable the features relying on the front database.
+        """
+        self.__app.config['SEARCH_INDEX'] = False
+        self.__app.config['STATS_ROLLUP'] = False
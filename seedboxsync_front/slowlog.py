@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import logging
+import sqlite3
+from collections import deque
+from datetime import datetime
+from flask import Flask, has_request_context, request
+from typing import Any
+
+# Statements EXPLAIN QUERY PLAN can describe
+EXPLAINED = ('SELECT', 'WITH', 'INSERT', 'UPDATE', 'DELETE', 'REPLACE')
+
+
+class SlowQueryLog(object):
+    """
+    Log the queries slower than SLOW_QUERY_THRESHOLD with their query plan.
+
+    The last SLOW_QUERY_LOG_SIZE slow queries of the process are kept in a ring
+    buffer, exposed by /api/v1/debug/slow-queries if SLOW_QUERY_API.
+
+    Attributes:
+        enabled (bool): True if a threshold is set.
+        threshold (float): Threshold in seconds.
+        entries (deque[dict[str, Any]]): The last slow queries, most recent last.
+    """
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.threshold = 0.0
+        self.entries: deque[dict[str, Any]] = deque(maxlen=100)
+        self.logger = logging.getLogger(__name__)
+
+    def init_app(self, app: Flask) -> None:
+        """
+        Read the threshold and the size of the ring buffer.
+
+        Args:
+            app (Flask): The Flask app.
+        """
+        threshold = float(app.config.get('SLOW_QUERY_THRESHOLD') or 0)
+        self.enabled = threshold > 0
+        self.threshold = threshold / 1000
+        self.entries = deque(maxlen=int(app.config.get('SLOW_QUERY_LOG_SIZE', 100)))
+        self.logger = app.logger
+        if self.enabled:
+            app.logger.debug('Log the queries slower than %s ms', threshold)
+
+    def check(self, database: Any, sql: str, params: Any, elapsed: float) -> None:
+        """
+        Record a query if it is slower than the threshold.
+
+        Args:
+            database (Any): The peewee database which executed the query.
+            sql (str): The query.
+            params (Any): The parameters of the query.
+            elapsed (float): Execution time in seconds.
+        """
+        if not self.enabled or elapsed < self.threshold:
+            return
+
+        entry: dict[str, Any] = {
+            'time': datetime.now().astimezone(),
+            'duration': round(elapsed * 1000, 3),
+            'sql': sql,
+            'params': [value if isinstance(value, (int, float, str)) or value is None else str(value) for value in params or ()],
+            'endpoint': request.endpoint if has_request_context() else None,
+            'plan': self.explain(database, sql, params),
+        }
+        self.entries.append(entry)
+        self.logger.warning('Slow query (%.1f ms) on %s: %s %s\n%s', entry['duration'], entry['endpoint'], sql, entry['params'],
+                            '\n'.join(entry['plan']))
+
+    def explain(self, database: Any, sql: str, params: Any) -> list[str]:
+        """
+        Read the query plan of a query, on the raw connection to bypass the hooks.
+
+        Args:
+            database (Any): The peewee database which executed the query.
+            sql (str): The query.
+            params (Any): The parameters of the query.
+
+        Returns:
+            list[str]: The plan, one line per step indented by depth, empty if not available.
+        """
+        if not sql.lstrip().upper().startswith(EXPLAINED) or database.is_closed():
+            return []
+
+        try:
+            rows = database.connection().execute('EXPLAIN QUERY PLAN ' + sql, params or ()).fetchall()
+        except sqlite3.Error as e:
+            self.logger.debug('No query plan for %s: %s', sql, e)
+            return []
+
+        depths: dict[int, int] = {}
+        plan = []
+        for id, parent, _, detail in rows:
+            depths[id] = depths.get(parent, -1) + 1
+            plan.append('  ' * depths[id] + detail)
+
+        return plan
+
+
+slow_queries = SlowQueryLog()
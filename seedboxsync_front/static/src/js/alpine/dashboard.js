@@ -0,0 +1,59 @@
+/**
+ * Copyright (C) 2025 Guillaume Kulakowski <guillaume@kulakowski.fr>
+ *
+ * For the full copyright and license information, please view the LICENSE
+ * file that was distributed with this source code.
+ */
+
+import { subscribeEvents } from "./events";
+
+/**
+ * Build AlpineJS dashboard component.
+ *
+ * Fetch all the homepage widgets in one request and dispatch them with a
+ * "dashboard" window event (or "dashboard-error"), read by the components
+ * built with their dashboard option.
+ * The dashboard is polled every refreshMs. With eventsUrl, it is also reloaded
+ * when a download finishes or a lock changes, and polled every eventsRefreshMs
+ * only: the stream doesn't carry the uploads and the last downloads.
+ * @param {string} url
+ * @param {string} eventsUrl
+ * @param {number} refreshMs
+ * @param {number} eventsRefreshMs
+ * @returns
+ */
+export function DashboardComponent(url, eventsUrl = "", refreshMs = 30000, eventsRefreshMs = 120000) {
+  return {
+    init() {
+      this.load();
+      window.addEventListener("force-refresh", () => this.load());
+      let timer = null;
+      const poll = (ms) => {
+        clearInterval(timer);
+        timer = setInterval(() => this.load(), ms);
+      };
+      if (eventsUrl) {
+        poll(eventsRefreshMs);
+        subscribeEvents(eventsUrl, {
+          downloads: (data) => data.removed.length > 0 && this.load(),
+          lock: () => this.load(),
+          closed: () => poll(refreshMs),
+        });
+      } else {
+        poll(refreshMs);
+      }
+    },
+
+    async load() {
+      try {
+        const res = await fetch(url);
+        if (!res.ok) throw new Error(`HTTP error ${res.status}`);
+        const json = await res.json();
+        window.dispatchEvent(new CustomEvent("dashboard", { detail: json.data }));
+      } catch (e) {
+        console.error(e);
+        window.dispatchEvent(new CustomEvent("dashboard-error"));
+      }
+    },
+  };
+}
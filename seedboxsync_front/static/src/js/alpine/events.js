@@ -0,0 +1,38 @@
+/**
+ * Copyright (C) 2025 Guillaume Kulakowski <guillaume@kulakowski.fr>
+ *
+ * For the full copyright and license information, please view the LICENSE
+ * file that was distributed with this source code.
+ */
+
+const EVENT_TYPES = ["snapshot", "downloads", "lock"];
+const sources = {};
+
+/**
+ * Subscribe to the Server-Sent Events of the API.
+ *
+ * All the components of a page share one EventSource per URL. The browser
+ * reconnects by itself and a new snapshot is sent on each connection.
+ * @param {string} url
+ * @param {object} handlers Callbacks by event type (snapshot, downloads, lock), and closed
+ *                          called if the stream is not available (disabled, error).
+ */
+export function subscribeEvents(url, handlers) {
+  let entry = sources[url];
+  if (!entry) {
+    entry = sources[url] = { source: new EventSource(url), handlers: [] };
+    for (const type of EVENT_TYPES) {
+      entry.source.addEventListener(type, (e) => {
+        const data = JSON.parse(e.data);
+        entry.handlers.forEach((h) => h[type] && h[type](data));
+      });
+    }
+    entry.source.onerror = () => {
+      if (entry.source.readyState === EventSource.CLOSED) {
+        delete sources[url];
+        entry.handlers.forEach((h) => h.closed && h.closed());
+      }
+    };
+  }
+  entry.handlers.push(handlers);
+}
@@ -6,15 +6,18 @@
  */
 import Alpine from "alpinejs";
 import * as validators from "./validators";
-import { TableComponent } from "./table";
+import { ProgressTableComponent, TableComponent } from "./table";
 import { TablePaginedComponent } from "./table_pagined";
 import { LockBoxComponent } from "./lockbox";
+import { DashboardComponent } from "./dashboard";
 import { ModalConfirmCallComponent, OpenModalConfirmCall } from "./modal";
 
 // Tables
 window.TableComponent = TableComponent;
+window.ProgressTableComponent = ProgressTableComponent;
 window.TablePaginedComponent = TablePaginedComponent;
 window.LockBoxComponent = LockBoxComponent;
+window.DashboardComponent = DashboardComponent;
 
 // Modales
 window.ModalConfirmCallComponent = ModalConfirmCallComponent;
@@ -6,15 +6,22 @@
  */
 
 import { toast } from "bulma-toast";
+import { subscribeEvents } from "./events";
 
 /**
  * Build AlpineJS lock box components.
+ *
+ * With eventsUrl, the lock is updated by the Server-Sent Events of the API.
+ * With dashboard, it is read from the DashboardComponent instead of url.
+ * Polling is only used if none of them is available.
  * @param {string} apiUrl
  * @param {string} title
  * @param {number} refreshMs
+ * @param {string} eventsUrl
+ * @param {boolean} dashboard
  * @returns
  */
-export function LockBoxComponent(url, title, refreshMs = 30000) {
+export function LockBoxComponent(url, title, refreshMs = 30000, eventsUrl = "", dashboard = false) {
   return {
     loading: true,
     error: null,
@@ -23,12 +30,39 @@ export function LockBoxComponent(url, title, refreshMs = 30000) {
     lockTitle: title,
     previousLockMessage: "",
 
-    async init() {
+    init() {
+      const key = url.split("/").pop();
+      const update = (lock) => {
+        this.error = null;
+        this.applyLock(lock);
+        this.loading = false;
+      };
+      const fallback = () => {
+        if (!dashboard) return this.poll();
+        window.addEventListener("dashboard", (e) => update(e.detail.locks[key]));
+        window.addEventListener("dashboard-error", () => {
+          this.error = Translations.error_loading_lock_status;
+          this.loading = false;
+        });
+      };
+
+      if (eventsUrl) {
+        subscribeEvents(eventsUrl, {
+          snapshot: (data) => update(data.locks[key]),
+          lock: (data) => data.key === key && update(data.lock),
+          closed: fallback,
+        });
+      } else {
+        fallback();
+      }
+    },
+
+    async poll() {
+      window.addEventListener("force-refresh", () => this.loadLock());
       await this.loadLock();
       if (refreshMs > 0) {
         setInterval(() => this.loadLock(), refreshMs);
       }
-      window.addEventListener("force-refresh", () => this.loadLock());
     },
 
     async loadLock() {
@@ -39,29 +73,14 @@ export function LockBoxComponent(url, title, refreshMs = 30000) {
 
         if (res.status === 404) {
           // Specific handling for never launched
-          this.lockData = null;
-          this.updateLockMessage(Translations.never_launched);
+          this.applyLock(null);
           this.loading = false;
           return;
         };
 
         if (!res.ok) throw new Error(`HTTP error ${res.status}`);
         const json = await res.json();
-        this.lockData = json.data;
-
-        if (this.lockData.locked) {
-          this.updateLockMessage(
-            `${Translations.in_progress_since} ${new Date(
-              this.lockData.locked_at
-            ).toLocaleString(undefined, dateTimeOption)}`
-          );
-        } else {
-          this.updateLockMessage(
-            `${Translations.completed_since} ${new Date(
-              this.lockData.unlocked_at
-            ).toLocaleString(undefined, dateTimeOption)}`
-          );
-        }
+        this.applyLock(json.data);
       } catch (e) {
         this.error = Translations.error_loading_lock_status;
         console.error(e);
@@ -70,6 +89,25 @@ export function LockBoxComponent(url, title, refreshMs = 30000) {
       }
     },
 
+    applyLock(lock) {
+      this.lockData = lock;
+      if (!lock) {
+        this.updateLockMessage(Translations.never_launched);
+      } else if (lock.locked) {
+        this.updateLockMessage(
+          `${Translations.in_progress_since} ${new Date(
+            lock.locked_at
+          ).toLocaleString(undefined, dateTimeOption)}`
+        );
+      } else {
+        this.updateLockMessage(
+          `${Translations.completed_since} ${new Date(
+            lock.unlocked_at
+          ).toLocaleString(undefined, dateTimeOption)}`
+        );
+      }
+    },
+
     updateLockMessage(newMessage) {
       // Trigger toast if message changed
       if (this.lockMessage !== "" && this.lockMessage !== newMessage) {
@@ -5,13 +5,19 @@
  * file that was distributed with this source code.
  */
 
+import { subscribeEvents } from "./events";
+
 /**
  * Build AlpineJS table components.
+ *
+ * With dashboardKey, the rows are read from this key of the DashboardComponent
+ * data instead of apiUrl.
  * @param {string} apiUrl
  * @param {number} refreshMs
+ * @param {string} dashboardKey
  * @returns
  */
-export function TableComponent(apiUrl, refreshMs = 30000) {
+export function TableComponent(apiUrl, refreshMs = 30000, dashboardKey = "") {
   return {
     data: [],
     loading: true,
@@ -36,9 +42,67 @@ export function TableComponent(apiUrl, refreshMs = 30000) {
         });
     },
     init() {
+      if (dashboardKey) {
+        window.addEventListener("dashboard", (e) => {
+          this.data = e.detail[dashboardKey];
+          this.error = false;
+          this.loading = false;
+        });
+        window.addEventListener("dashboard-error", () => {
+          this.error = true;
+          this.data = [];
+          this.loading = false;
+        });
+        return;
+      }
       this.load();
       setInterval(() => this.load(), refreshMs);
       window.addEventListener("force-refresh", () => this.load());
     },
   };
 };
+
+/**
+ * Build AlpineJS table of the downloads in progress.
+ *
+ * With eventsUrl, the rows are updated by the Server-Sent Events of the API,
+ * the table falls back to the dashboard or to polling apiUrl if the stream is
+ * not available.
+ * @param {string} apiUrl
+ * @param {string} eventsUrl
+ * @param {number} limit
+ * @param {number} refreshMs
+ * @param {string} dashboardKey
+ * @returns
+ */
+export function ProgressTableComponent(apiUrl, eventsUrl = "", limit = 5, refreshMs = 30000, dashboardKey = "") {
+  const table = TableComponent(apiUrl, refreshMs, dashboardKey);
+  const rows = new Map();
+
+  return {
+    ...table,
+    init() {
+      if (!eventsUrl) return table.init.call(this);
+
+      subscribeEvents(eventsUrl, {
+        snapshot: (data) => {
+          rows.clear();
+          data.downloads.forEach((row) => rows.set(row.id, row));
+          this.render(rows);
+        },
+        downloads: (data) => {
+          data.changed.forEach((row) => rows.set(row.id, row));
+          data.removed.forEach((id) => rows.delete(id));
+          this.render(rows);
+        },
+        closed: () => table.init.call(this),
+      });
+    },
+    render(rows) {
+      // Same order as the API: finished (0) then id
+      this.data = [...rows.values()].sort((a, b) => a.id - b.id).slice(0, limit);
+      this.error = false;
+      this.loading = false;
+    },
+  };
+}
@@ -7,6 +7,10 @@
 
 /**
  * Build AlpineJS table pagined components.
+ *
+ * Pages are fetched with the next_cursor returned by the API (keyset
+ * pagination), offset is only used to jump to a page not visited yet.
+ * The total is an estimate cached server side until the database changes.
  * @param {string} apiUrl
  * @param {number} perPage
  * @returns
@@ -19,6 +23,7 @@ export function TablePaginedComponent(apiUrl, perPage = 20) {
     page: 1,
     perPage,
     offset: 0,
+    cursors: { 1: null },
     total: 0,
     search: "",
 
@@ -28,7 +33,10 @@ export function TablePaginedComponent(apiUrl, perPage = 20) {
       try {
         const url = new URL(apiUrl, window.location.origin);
         url.searchParams.set("limit", this.perPage);
-        url.searchParams.set("offset", this.offset);
+        url.searchParams.set("count", "estimate");
+        const cursor = this.cursors[this.page];
+        if (cursor) url.searchParams.set("cursor", cursor);
+        else url.searchParams.set("offset", this.offset);
         if (this.search) url.searchParams.set("search", this.search);
 
         const r = await fetch(url);
@@ -37,6 +45,7 @@ export function TablePaginedComponent(apiUrl, perPage = 20) {
         const json = await r.json();
         this.data = json.data;
         this.total = json.data_total;
+        if (json.next_cursor) this.cursors[this.page + 1] = json.next_cursor;
       } catch (e) {
         this.error = true;
         this.data = [];
@@ -99,12 +108,17 @@ export function TablePaginedComponent(apiUrl, perPage = 20) {
       this.search = value;
       this.page = 1;
       this.offset = 0;
+      this.cursors = { 1: null };
       this.load();
     },
 
     init() {
       this.load();
-      window.addEventListener("force-refresh", () => this.load());
+      window.addEventListener("force-refresh", () => {
+        // Rows may have been deleted, cursors of the next pages are stale
+        this.cursors = { 1: null, [this.page]: this.cursors[this.page] };
+        this.load();
+      });
     },
   };
 }
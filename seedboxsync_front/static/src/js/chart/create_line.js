@@ -0,0 +1,72 @@
+/**
+ * Copyright (C) 2025 Guillaume Kulakowski <guillaume@kulakowski.fr>
+ *
+ * For the full copyright and license information, please view the LICENSE
+ * file that was distributed with this source code.
+ */
+import Chart from "chart.js/auto";
+
+const MIB = 1024 * 1024;
+
+/**
+ * Create a line chart of the transfer rates (MiB/s).
+ *
+ * Average file rate and throughput by bucket, with the p50, p90 and p99
+ * file rates of the range as flat lines.
+ */
+export function createThroughputChart(
+  ctx,
+  data,
+  labelRate = "File rate (MiB/s)",
+  labelThroughput = "Throughput (MiB/s)"
+) {
+  const labels = data.buckets.map((d) => d.period);
+  const toMib = (value) => (value === null ? null : value / MIB);
+  const percentiles = Object.entries(data.percentiles).map(([key, value], i) => ({
+    label: `${key} (MiB/s)`,
+    data: labels.map(() => toMib(value)),
+    borderColor: ["#88c0d0", "#ebcb8b", "#bf616a"][i],
+    borderDash: [6, 4],
+    borderWidth: 1,
+    pointRadius: 0,
+  }));
+
+  return new Chart(ctx, {
+    type: "line",
+    data: {
+      labels: labels,
+      datasets: [
+        {
+          label: labelRate,
+          data: data.buckets.map((d) => toMib(d.rate)),
+          backgroundColor: "#9fee5c",
+          borderColor: "#a3be8c",
+        },
+        {
+          label: labelThroughput,
+          data: data.buckets.map((d) => toMib(d.throughput)),
+          backgroundColor: "#ee54d2",
+          borderColor: "#b48ead",
+        },
+        ...percentiles,
+      ],
+    },
+    options: {
+      responsive: true,
+      interaction: { mode: "index", intersect: false },
+      scales: { y: { beginAtZero: true } },
+    },
+  });
+}
+
+/**
+ * Load the transfer rates from a URL and create a line chart.
+ * @param {*} ctx
+ * @param {*} url
+ */
+export function loadThroughputChart(ctx, url) {
+  fetch(url)
+    .then((res) => res.json())
+    .then((json) => createThroughputChart(ctx, json.data))
+    .catch((err) => console.error("Error loading chart:", err));
+}
@@ -7,7 +7,10 @@
 
 import Chart from "chart.js/auto";
 import { createBarChart, loadChart } from "./create_bar";
+import { createThroughputChart, loadThroughputChart } from "./create_line";
 
 window.Chart = Chart;
 window.createBarChart = createBarChart;
 window.loadChart = loadChart;
+window.createThroughputChart = createThroughputChart;
+window.loadThroughputChart = loadThroughputChart;
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import os
+import random
+from datetime import datetime, timedelta
+from importlib.metadata import version
+from peewee import chunked, Model, SqliteDatabase
+from typing import Any, Iterable, Iterator
+from seedboxsync.core.dao import Download, Lock, SeedboxSync, Torrent
+
+MODELS = [Download, Lock, SeedboxSync, Torrent]
+BATCH = 20000  # Rows per executemany()
+WORDS = ['Lorem', 'Ipsum', 'Dolor', 'Sit', 'Amet', 'Convallis', 'Morbi', 'Justo', 'Felis', 'Lacus', 'Quis', 'Ligula', 'Suscipit', 'Sed',
+         'Vitae', 'Nulla', 'Tempus', 'Magna', 'Aliquam', 'Orci']
+QUALITIES = ['720p', '1080p', '1080p', '1080p', '2160p']
+SOURCES = ['WEB', 'WEB-DL', 'BluRay', 'HDTV']
+# Kind: weight, median size (bytes) and sigma of the log-normal distribution
+KINDS = {
+    'episode': (70, 1.2e9, 0.6),
+    'movie': (20, 6e9, 0.8),
+    'season': (5, 25e9, 0.7),
+    'extra': (5, 40e3, 1.5),
+}
+
+
+def generate(
+    path: str,
+    downloads: int = 100000,
+    torrents: int | None = None,
+    in_progress: int = 10,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    seed: int = 42,
+) -> dict[str, int]:
+    """
+    Write a SeedboxSync database filled with realistic synthetic data.
+
+    Downloads are mostly TV episodes with a few movies, full seasons and small
+    extras (subtitles, nfo), with log-normal sizes and bursty start dates spread
+    over the span. The most recent ones are in progress (finished is 0). Rows are
+    written by executemany() in a single transaction, with the same seed and
+    arguments building the same database.
+
+    Args:
+        path (str): Path of the database, must not exist.
+        downloads (int): Number of downloads.
+        torrents (int | None): Number of uploaded torrents, a quarter of the downloads if None.
+        in_progress (int): Number of downloads in progress, the most recent ones.
+        start (datetime | None): First download, 3 years before end if None.
+        end (datetime | None): Last download, today at midnight if None.
+        seed (int): Random seed.
+
+    Returns:
+        dict[str, int]: Number of rows by table.
+    """
+    if os.path.exists(path):
+        raise FileExistsError(path)
+    end = end or datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+    start = start or end - timedelta(days=3 * 365)
+    if start >= end:
+        raise ValueError('The start of the span must be before its end.')
+    torrents = downloads // 4 if torrents is None else torrents
+    rand = random.Random(seed)
+
+    database = SqliteDatabase(path, pragmas={'journal_mode': 'wal', 'synchronous': 0})
+    with database.bind_ctx(MODELS):
+        database.create_tables(MODELS)
+        with database.atomic():
+            insert(database, Download, _downloads(rand, downloads, in_progress, start, end))
+            insert(database, Torrent, _torrents(rand, torrents, start, end))
+            insert(database, Lock, [
+                ('sync_blackhole', 0, False, _format(end), _format(end)),
+                ('sync_seedbox', rand.randint(1000, 65535), True, _format(end), None),
+            ])
+            insert(database, SeedboxSync, [('db_version', '1'), ('version', version('seedboxsync'))])
+    database.close()
+
+    return {'download': downloads, 'torrent': torrents, 'lock': 2, 'seedboxsync': 2}
+
+
+def insert(database: SqliteDatabase, model: type[Model], rows: Iterable[tuple[Any, ...]]) -> None:
+    """
+    Insert rows in batches, on the raw connection to skip the peewee query building.
+
+    Args:
+        database (SqliteDatabase): The database, inside a transaction.
+        model (type[Model]): The model, rows have the values of all its fields in order.
+        rows (Iterable[tuple[Any, ...]]): The rows.
+    """
+    columns = [field.column_name for field in model._meta.sorted_fields]
+    sql = 'INSERT INTO "{}" ({}) VALUES ({})'.format(model._meta.table_name, ', '.join('"{}"'.format(column) for column in columns),
+                                                     ', '.join('?' * len(columns)))
+    for batch in chunked(rows, BATCH):
+        database.connection().executemany(sql, batch)  # type: ignore[no-untyped-call]
+
+
+def _downloads(rand: random.Random, count: int, in_progress: int, start: datetime, end: datetime) -> Iterator[tuple[Any, ...]]:
+    """
+    Yield the rows of Download: id, path, seedbox_size, local_size, started and finished.
+    """
+    kinds = list(KINDS)
+    weights = [KINDS[kind][0] for kind in kinds]
+    span = (end - start).total_seconds()
+    shows = ['.'.join(rand.sample(WORDS, rand.randint(1, 3))) for _ in range(max(1, count // 200))]
+    started = 0.0
+    for id in range(1, count + 1):
+        # Bursty: most downloads come right after the previous one, some after a long pause
+        started = min(span, started + rand.expovariate(1.0) * span / count * (0.2 if rand.random() < 0.8 else 4.2))
+        kind = rand.choices(kinds, weights)[0]
+        size = max(1, int(rand.lognormvariate(0, KINDS[kind][2]) * KINDS[kind][1]))
+        show = rand.choice(shows)
+        release = '{}.{}.{}-{}'.format(rand.choice(QUALITIES), rand.choice(SOURCES), rand.choice(['x264', 'x265']), rand.choice(WORDS).upper())
+        if kind == 'episode':
+            season, episode = rand.randint(1, 12), rand.randint(1, 24)
+            path = '{0}/Season {1:02d}/{0}.S{1:02d}E{2:02d}.{3}.mkv'.format(show, season, episode, release)
+        elif kind == 'season':
+            path = '{0}/{0}.S{1:02d}.{2}.mkv'.format(show, rand.randint(1, 12), release)
+        elif kind == 'movie':
+            path = '{}.{}.{}.mkv'.format(rand.choice(WORDS), rand.randint(1950, end.year), release)
+        else:
+            path = '{}/{}.{}'.format(show, rand.choice(WORDS), rand.choice(['srt', 'nfo', 'jpg']))
+
+        begin = start + timedelta(seconds=int(started))
+        if id > count - in_progress:
+            yield id, path, size, rand.randint(0, size), _format(begin), 0
+        else:
+            rate = rand.lognormvariate(16, 1)  # ~9 MB/s
+            yield id, path, size, size, _format(begin), _format(begin + timedelta(seconds=int(size / rate) + 1))
+
+
+def _torrents(rand: random.Random, count: int, start: datetime, end: datetime) -> Iterator[tuple[Any, ...]]:
+    """
+    Yield the rows of Torrent: id, name, announce and sent, ordered by date.
+    """
+    span = int((end - start).total_seconds())
+    trackers = ['https://tracker{}.example/announce'.format(i) for i in range(1, 4)] + [None]
+    for id, sent in enumerate(sorted(rand.randint(0, span) for _ in range(count)), 1):
+        name = '{}.{}.torrent'.format('.'.join(rand.sample(WORDS, rand.randint(1, 4))), rand.choice(QUALITIES))
+        yield id, name, rand.choice(trackers), _format(start + timedelta(seconds=sent))
+
+
+def _format(date: datetime) -> str:
+    """
+    Format a date as stored by peewee.
+    """
+    return date.strftime('%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from contextvars import ContextVar
+from flask import Flask, Response, before_render_template, template_rendered
+from time import perf_counter
+from typing import Any
+from seedboxsync_front.cache import cache
+
+# Metric: description in the Server-Timing header
+METRICS = {
+    'db': 'SQLite',
+    'cache': 'Cache',
+    'marshal': 'Serialization',
+    'render': 'Templates',
+    'total': 'Total',
+}
+
+
+class Timings(object):
+    """
+    Time spent per metric during a request.
+
+    Attributes:
+        start (float): perf_counter() at the beginning of the request.
+        durations (dict[str, float]): Metric and seconds spent.
+        counts (dict[str, int]): Metric and number of timed calls.
+    """
+
+    def __init__(self) -> None:
+        self.start = perf_counter()
+        self.durations: dict[str, float] = {}
+        self.counts: dict[str, int] = {}
+        self.render_start: list[float] = []
+
+    def add(self, metric: str, elapsed: float) -> None:
+        """
+        Add a timed call to a metric.
+
+        Args:
+            metric (str): A key of METRICS.
+            elapsed (float): Seconds spent.
+        """
+        self.durations[metric] = self.durations.get(metric, 0.0) + elapsed
+        self.counts[metric] = self.counts.get(metric, 0) + 1
+
+    def header(self) -> str:
+        """
+        Build the Server-Timing header, durations in milliseconds.
+
+        Returns:
+            str: The header value.
+        """
+        self.durations['total'] = perf_counter() - self.start
+        self.counts['total'] = 1
+        return ', '.join(
+            '{};dur={:.2f};desc="{} ({})"'.format(metric, self.durations[metric] * 1000, METRICS[metric], self.counts[metric])
+            for metric in METRICS if metric in self.durations
+        )
+
+
+# Timings of the current request, None when the timing is disabled: the hooks only pay a lookup
+current: ContextVar[Timings | None] = ContextVar('seedboxsync_timings', default=None)
+
+
+class TimedCache(object):
+    """
+    Proxy of the cache backend timing the lookups and writes.
+    """
+
+    TIMED = ('get', 'set', 'add', 'get_many', 'set_many', 'has', 'delete', 'delete_many')
+
+    def __init__(self, backend: Any):
+        self.__backend = backend
+
+    def __getattr__(self, name: str) -> Any:
+        attribute = getattr(self.__backend, name)
+        if name not in TimedCache.TIMED:
+            return attribute
+
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            timings = current.get()
+            if timings is None:
+                return attribute(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return attribute(*args, **kwargs)
+            finally:
+                timings.add('cache', perf_counter() - start)
+
+        return timed
+
+
+class Timing(object):
+    """
+    Per request timing breakdown (SQLite, cache, serialization, templates) sent as Server-Timing.
+
+    The SQLite queries and the serialization are timed by Database and the
+    API serializer, the cache and templates by this class.
+    """
+
+    def __init__(self, app: Flask):
+        """
+        Register the timing hooks if TIMING_ENABLED.
+
+        Args:
+            app (Flask): The Flask app.
+        """
+        self.__app = app
+        self.__app.extensions['seedboxsync_timing'] = self  # Signals only keep weak references
+        if not self.__app.config.get('TIMING_ENABLED'):
+            return
+
+        self.__app.extensions['cache'][cache] = TimedCache(self.__app.extensions['cache'][cache])
+        before_render_template.connect(self.__before_render, self.__app)
+        template_rendered.connect(self.__rendered, self.__app)
+        self.__app.before_request(self.__start)
+        self.__app.after_request(self.__send)
+        self.__app.teardown_request(self.__stop)
+        self.__app.logger.debug('Server-Timing enabled')
+
+    def __start(self) -> None:
+        """
+        Start the timing of the request (before_request).
+        """
+        current.set(Timings())
+
+    def __send(self, response: Response) -> Response:
+        """
+        Add the Server-Timing header and the optional debug footer (after_request).
+
+        Args:
+            response (Response): The response.
+
+        Returns:
+            Response: The response with the timings.
+        """
+        timings = current.get()
+        if timings is None:
+            return response
+
+        header = timings.header()
+        response.headers['Server-Timing'] = header
+        if self.__app.config.get('TIMING_FOOTER') and response.mimetype == 'text/html' and not response.is_streamed:
+            footer = ' &middot; '.join(
+                '{} {:.2f} ms ({})'.format(METRICS[metric], timings.durations[metric] * 1000, timings.counts[metric])
+                for metric in METRICS if metric in timings.durations
+            )
+            response.set_data(response.get_data().replace(
+                b'</body>', '<div class="container has-text-centered has-text-grey is-size-7 server-timing">{}</div>\n</body>'.format(footer).encode(), 1
+            ))
+        return response
+
+    def __stop(self, exception: BaseException | None = None) -> None:
+        """
+        Stop the timing of the request (teardown_request).
+
+        Args:
+            exception (BaseException | None): Unhandled exception of the request.
+        """
+        current.set(None)  # Threads serve many requests
+
+    def __before_render(self, sender: Flask, **kwargs: Any) -> None:
+        """
+        Template rendering starts (before_render_template signal).
+        """
+        timings = current.get()
+        if timings is not None:
+            timings.render_start.append(perf_counter())
+
+    def __rendered(self, sender: Flask, **kwargs: Any) -> None:
+        """
+        Template rendering ends (template_rendered signal).
+        """
+        timings = current.get()
+        if timings is not None and timings.render_start:
+            timings.add('render', perf_counter() - timings.render_start.pop())
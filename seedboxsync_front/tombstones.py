@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from datetime import datetime, timedelta
+from flask import current_app
+from peewee import chunked, fn, Model
+from seedboxsync_front.sidecar import FrontState, sidecar, Tombstone
+
+PURGED_KEY = 'tombstone_purged_seq'
+BATCH = 500
+
+
+def record_deletions(model: type[Model], ids: list[int]) -> None:
+    """
+    Remember rows deleted by the front, for the clients of the delta sync.
+
+    Tombstones older than TOMBSTONES_RETENTION days are purged.
+
+    Args:
+        model (type[Model]): Model of the deleted rows.
+        ids (list[int]): Identifiers of the deleted rows.
+    """
+    if not current_app.extensions['seedboxsync_sidecar'].enabled or not ids:
+        return
+
+    table = model._meta.table_name
+    with sidecar.connection_context():
+        with sidecar.atomic('IMMEDIATE'):
+            for batch in chunked(ids, BATCH):
+                Tombstone.insert_many([(table, id) for id in batch], fields=[Tombstone.table, Tombstone.row_id]).execute()
+
+            expired = Tombstone.deleted < datetime.now() - timedelta(days=current_app.config['TOMBSTONES_RETENTION'])
+            purged = Tombstone.select(fn.MAX(Tombstone.seq)).where(expired).scalar()
+            if purged is not None:
+                Tombstone.delete().where(Tombstone.seq <= purged).execute()
+                FrontState.set_value(PURGED_KEY, purged)
+
+
+def last_seq() -> int:
+    """
+    Sequence number of the last tombstone.
+
+    Returns:
+        int: The sequence number, 0 if there is none.
+    """
+    if not current_app.extensions['seedboxsync_sidecar'].enabled:
+        return 0
+
+    with sidecar.connection_context():
+        return max(int(Tombstone.select(fn.MAX(Tombstone.seq)).scalar() or 0), int(FrontState.get_value(PURGED_KEY, 0)))
+
+
+def deleted_since(model: type[Model], seq: int) -> tuple[list[int], int, bool]:
+    """
+    Rows deleted by the front after a tombstone sequence number.
+
+    Args:
+        model (type[Model]): Model of the deleted rows.
+        seq (int): Last sequence number already seen.
+
+    Returns:
+        tuple[list[int], int, bool]: Identifiers of the deleted rows, last sequence
+                                     number and False if tombstones after seq were purged.
+    """
+    if not current_app.extensions['seedboxsync_sidecar'].enabled:
+        return [], seq, True
+
+    with sidecar.connection_context():
+        purged = int(FrontState.get_value(PURGED_KEY, 0))
+        last = max(int(Tombstone.select(fn.MAX(Tombstone.seq)).scalar() or 0), purged)
+        complete = seq >= purged
+        ids = list(Tombstone.select(Tombstone.row_id).where(
+            Tombstone.seq > seq,
+            Tombstone.seq <= last,
+            Tombstone.table == model._meta.table_name
+        ).order_by(Tombstone.seq).scalars())
+
+    return ids, max(seq, last), complete
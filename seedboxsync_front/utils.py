@@ -5,7 +5,13 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
+import gettext
+from functools import lru_cache
+from math import log
+from typing import Any, Iterable
 from flask import current_app, flash
+from humanize.filesize import naturalsize as humanize_naturalsize
+from humanize.i18n import get_translation
 
 
 def init_flash() -> None:
@@ -29,3 +35,67 @@ def byte_to_gi(bytes_value: float, suffix: str = 'B') -> str:
     """
     gib = bytes_value / (1024**3)
     return f"{gib:.1f}Gi{suffix}"
+
+
+def naturalsize(value: Any) -> str:
+    """
+    Humanize a size in bytes with binary suffixes (e.g. 3.1 GiB).
+
+    Same output as humanize.filesize.naturalsize(value, True), memoized on
+    the active humanize locale and on the displayed bucket of the value.
+
+    Args:
+        value (Any): Size in bytes, None or invalid values are treated as 0.
+
+    Returns:
+        str: human readable value.
+    """
+    try:
+        num = float(value or 0)
+    except (ValueError, TypeError):
+        num = 0.0
+
+    abs_num = abs(num)
+    if abs_num < 1024:
+        bucket: tuple[int, str] = (0, repr(num))
+    else:
+        # Every value of a bucket is displayed with the same mantissa
+        exp = int(min(log(abs_num, 1024), 10))
+        bucket = (exp, '%.1f' % (num / (1024 ** exp)))
+
+    return _naturalsize_bucket(get_translation(), bucket)
+
+
+@lru_cache(maxsize=4096)
+def _naturalsize_bucket(translation: gettext.NullTranslations, bucket: tuple[int, str]) -> str:
+    """
+    Humanize a bucket for a locale.
+
+    Args:
+        translation (gettext.NullTranslations): Active humanize translation, only used as cache key.
+        bucket (tuple[int, str]): Exponent and displayed mantissa.
+
+    Returns:
+        str: human readable value.
+    """
+    exp, mantissa = bucket
+    return humanize_naturalsize(float(mantissa) * (1024 ** exp), True)
+
+
+def humanize_rows(rows: Iterable[dict[str, Any]], fields: dict[str, str]) -> list[dict[str, Any]]:
+    """
+    Add humanized sizes to query rows in a single pass.
+
+    Args:
+        rows (Iterable[dict[str, Any]]): Rows returned by a query (.dicts()).
+        fields (dict[str, str]): Source field and the humanized field to add.
+
+    Returns:
+        list[dict[str, Any]]: The rows, with the humanized fields.
+    """
+    rows = list(rows)
+    for row in rows:
+        for field, human_field in fields.items():
+            row[human_field] = naturalsize(row.get(field))
+
+    return rows
@@ -7,12 +7,12 @@
 #
 from flask import render_template
 from seedboxsync_front.views import bp
-from seedboxsync_front.cache import cache
+from seedboxsync_front.cache import versioned
 from seedboxsync_front.utils import init_flash
 
 
 @bp.route('/downloaded')
-@cache.cached(timeout=300)
+@versioned()
 def downloaded() -> str:
     """
     Downloaded list view.
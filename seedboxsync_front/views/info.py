@@ -6,18 +6,18 @@
 # file that was distributed with this source code.
 #
 import humanize
-from flask import render_template
-from peewee import fn
+from flask import current_app, render_template
 from datetime import datetime
-from seedboxsync.core.dao import Download, Lock, SeedboxSync
-from seedboxsync_front.cache import cache
+from seedboxsync.core.dao import Lock, SeedboxSync
+from seedboxsync_front.cache import versioned
+from seedboxsync_front.rollup import downloads_summary
 from seedboxsync_front.views import bp
-from seedboxsync_front.utils import init_flash
+from seedboxsync_front.utils import init_flash, naturalsize
 from seedboxsync_front.__version__ import __version__ as version
 
 
 @bp.route('/info')
-@cache.cached(timeout=60)
+@versioned(timeout=60)  # Lock status and connection counters
 def info() -> str:
     """
     Information page view.
@@ -25,9 +25,7 @@ def info() -> str:
     init_flash()
 
     # DL stats
-    query_stats = Download.select().where(Download.finished != 0)
-    total_files = query_stats.count()
-    total_size = sum([d.seedbox_size for d in query_stats if d.seedbox_size])
+    summary = downloads_summary()
     try:
         sync_blackhole = Lock.get(Lock.key == 'sync_blackhole')
     except Lock.DoesNotExist:
@@ -38,22 +36,31 @@ def info() -> str:
         sync_seedbox = False
 
     # First dl stats
-    first_date = (Download.select(fn.MIN(Download.finished)).where(Download.finished != 0).scalar())
+    first_date = summary['first']
     first_delta = ''
     if first_date is not None:
         first_delta = datetime.now() - first_date
         first_delta = humanize.precisedelta(first_delta, minimum_unit='days')
 
+    # DB connection profile
+    database = current_app.extensions['seedboxsync_db']
+
     info = {
-        'stats_total_files': total_files,
-        'stats_total_size': humanize.filesize.naturalsize(total_size, True),
+        'stats_total_files': summary['files'],
+        'stats_total_size': naturalsize(summary['total_size']),
         'stats_first': first_date,
         'stats_first_delta': first_delta,
         'version': version,
         'seedboxsync_version': SeedboxSync.get_version(),
         'seedboxsync_db_version': SeedboxSync.get_db_version(),
         'sync_blackhole': sync_blackhole,
-        'sync_seedbox': sync_seedbox
+        'sync_seedbox': sync_seedbox,
+        'db_file': current_app.config['DATABASE'],
+        'db_read_only': database.read_only,
+        'db_wal': database.wal,
+        'db_mode': database.mode,
+        'db_connects_per_minute': database.db.connects_per_minute(),
+        'db_pragmas': database.get_pragmas(),
     }
 
     return render_template('info.html', info=info)
@@ -0,0 +1,21 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from flask import abort, Response
+from seedboxsync_front.metrics import metrics as registry
+from seedboxsync_front.views import bp
+
+
+@bp.route("/metrics")
+def metrics() -> Response:
+    """
+    Prometheus metrics view, aggregated across the workers
+    """
+    if not registry.enabled:
+        abort(404)
+
+    return Response(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -5,29 +5,25 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
-import humanize
 from flask import render_template
-from seedboxsync.core.dao import Download
 from seedboxsync_front.views import bp
-from seedboxsync_front.cache import cache
-from seedboxsync_front.utils import init_flash
+from seedboxsync_front.cache import versioned
+from seedboxsync_front.rollup import downloads_summary
+from seedboxsync_front.utils import init_flash, naturalsize
 
 
 @bp.route('/stats')
-@cache.cached(timeout=300)
+@versioned()
 def stats() -> str:
     """
     Stats page view.
     """
     init_flash()
 
-    query = Download.select().where(Download.finished != 0)
-    total_files = query.count()
-    total_size = sum([d.seedbox_size for d in query if d.seedbox_size])
-
+    summary = downloads_summary()
     stats_total = {
-        'files': total_files,
-        'total_size': humanize.filesize.naturalsize(total_size, True),
+        'files': summary['files'],
+        'total_size': naturalsize(summary['total_size']),
     }
 
     return render_template('stats.html', stats_total=stats_total)
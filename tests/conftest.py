@@ -20,6 +20,7 @@ def app():
     """
     db_fd, tmp_db = tempfile.mkstemp()
     conf_fd, tmp_conf = tempfile.mkstemp()
+    front_fd, tmp_front = tempfile.mkstemp()
 
     # Copy database
     test_db = os.path.abspath("tests/resources/seedboxsync.db")
@@ -34,6 +35,7 @@ def app():
     app = create_app({
         'TESTING': True,
         'DATABASE': tmp_db,
+        'FRONT_DATABASE': tmp_front,
         'SECRET_KEY': 'pytest',
         'CACHE_TYPE': 'NullCache',
         'BABEL_DEFAULT_LOCALE': 'en',
@@ -44,7 +46,9 @@ def app():
 
     os.close(db_fd)
     os.close(conf_fd)
+    os.close(front_fd)
     os.unlink(tmp_db)
+    os.unlink(tmp_front)
 
 
 @pytest.fixture
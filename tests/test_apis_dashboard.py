@@ -0,0 +1,33 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from seedboxsync.core.dao import Lock
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def test_get_dashboard(client):
+    response = client.get(f'{API_PATH}/dashboard')
+    assert response.status_code == 200
+    assert response.json['type'] == 'Dashboard'
+    data = response.json['data']
+    # Same as the widgets endpoints
+    assert data['in_progress'] == client.get(f'{API_PATH}/downloads?limit=5&finished=false').json['data']
+    assert data['downloads'] == client.get(f'{API_PATH}/downloads?limit=5&finished=true').json['data']
+    assert data['uploads'] == client.get(f'{API_PATH}/uploads?limit=5').json['data']
+    for key in ('sync_blackhole', 'sync_seedbox'):
+        assert data['locks'][key] == client.get(f'{API_PATH}/locks/{key}').json['data']
+
+
+def test_get_dashboard_never_launched(app, client):
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        Lock.delete().where(Lock.key == 'sync_blackhole').execute()
+    response = client.get(f'{API_PATH}/dashboard')
+    assert response.status_code == 200
+    assert response.json['data']['locks']['sync_blackhole'] is None
+    assert response.json['data']['locks']['sync_seedbox']['key'] == 'sync_seedbox'
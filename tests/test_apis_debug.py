@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import logging
+from seedboxsync_front import create_app
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def test_slow_queries(app, caplog):
+    app = create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'NullCache',
+        'SLOW_QUERY_THRESHOLD': 0.000001,  # All the queries
+        'SLOW_QUERY_LOG_SIZE': 50,
+        'SLOW_QUERY_API': True,
+    })
+    client = app.test_client()
+
+    with caplog.at_level(logging.WARNING):
+        response = client.get(f'{API_PATH}/downloads?limit=5&finished=true&search=lorem')
+    assert response.status_code == 200
+    assert any(record.message.startswith('Slow query') for record in caplog.records)
+
+    response = client.get(f'{API_PATH}/debug/slow-queries')
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
+    assert 1 <= len(response.json['data']) <= 50
+    query = next(query for query in response.json['data'] if 'ORDER BY "t1"."finished" DESC' in query['sql'])
+    assert query['endpoint'] == 'api.downloads_downloads_list'
+    assert query['duration'] > 0
+    assert 5 in query['params']
+    assert query['plan']
+    assert any(step.lstrip().startswith(('SCAN', 'SEARCH')) for step in query['plan'])
+
+
+def test_slow_queries_disabled(client):
+    response = client.get(f'{API_PATH}/debug/slow-queries')
+    assert response.status_code == 404
@@ -5,6 +5,18 @@
 # For the full copyright and license information, please view the LICENSE
 # file that was distributed with this source code.
 #
+import csv
+import gzip
+import io
+import json
+import math
+import pytest
+import sqlite3
+from datetime import timedelta
+from seedboxsync.core.dao import Download
+from seedboxsync_front import create_app
+from seedboxsync_front.cache import cache
+from seedboxsync_front.rollup import aggregate_downloads, rollup_by_period
 from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
 
 DEFAULT = 50
@@ -106,3 +118,256 @@ def test_get_downloads_stats_year(client):
     assert response.json['data'][4]['total_size'] == '308.3GiB'
     assert response.json['data'][4]['year'] == '2021'
     assert len(response.json['data']) == 9
+
+
+def test_get_downloads_list_search(client):
+    response = client.get(f'{API_PATH}/downloads?search=Convallis&finished=false')
+    assert response.status_code == 200
+    assert 999 in [d['id'] for d in response.json['data']]
+    assert response.json['data_total'] == len(response.json['data'])
+    # Any part of the path, as with LIKE
+    response = client.get(f'{API_PATH}/downloads?search=convallismor')
+    assert 999 in [d['id'] for d in response.json['data']]
+    response = client.get(f'{API_PATH}/downloads?search=Morbi')
+    assert [d['id'] for d in response.json['data']] == [999]
+    response = client.get(f'{API_PATH}/downloads?search=orbi.do')
+    assert [d['id'] for d in response.json['data']] == [999]
+    # Word too short for the index: fallback to LIKE
+    response = client.get(f'{API_PATH}/downloads?search=Morbi.d')
+    assert [d['id'] for d in response.json['data']] == [999]
+    # Ranked
+    response = client.get(f'{API_PATH}/downloads?search=Quis&sort=rank')
+    assert response.status_code == 200
+    assert 1000 in [d['id'] for d in response.json['data']]
+    # No word: fallback to LIKE
+    response = client.get(f'{API_PATH}/downloads?search=.')
+    assert response.status_code == 200
+    assert response.json['data_total'] > 0
+
+
+def test_get_downloads_list_search_index_upgrade(app):
+    # Index of a previous version, with prefix matching only
+    conn = sqlite3.connect(app.config['FRONT_DATABASE'])
+    conn.execute('DROP TABLE downloadindex')
+    conn.execute("CREATE VIRTUAL TABLE downloadindex USING fts5 (path, prefix='2 3', tokenize='unicode61 remove_diacritics 2')")
+    conn.execute("REPLACE INTO frontstate (key, value) VALUES ('downloadindex_id', '1000')")
+    conn.commit()
+    conn.close()
+
+    # Rebuilt on startup
+    app = create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'NullCache',
+    })
+    response = app.test_client().get(f'{API_PATH}/downloads?search=Morbi')
+    assert [d['id'] for d in response.json['data']] == [999]
+
+
+def test_get_downloads_list_search_index_sync(app, client):
+    response = client.get(f'{API_PATH}/downloads?search=Quis')
+    total = response.json['data_total']
+    # Index only new rows
+    with app.extensions['seedboxsync_db'].db.connection_context():
+        Download.create(path='Quis.New.mkv', seedbox_size=10, local_size=10)
+    response = client.get(f'{API_PATH}/downloads?search=Quis')
+    assert response.json['data_total'] == total + 1
+    assert 'Quis.New.mkv' in [d['path'] for d in response.json['data']]
+    # Deleted rows are not returned
+    client.delete(f'{API_PATH}/downloads/1000')
+    response = client.get(f'{API_PATH}/downloads?search=Quis')
+    assert response.json['data_total'] == total
+    assert 1000 not in [d['id'] for d in response.json['data']]
+    # Ids of the last rows are reused by SeedboxSync
+    new = client.get(f'{API_PATH}/downloads?search=Quis.New').json['data'][0]['id']
+    client.delete(f'{API_PATH}/downloads/{new}')
+    with app.extensions['seedboxsync_db'].db.connection_context():
+        assert Download.create(path='Reused.mkv', seedbox_size=10, local_size=10).id == 1000
+    response = client.get(f'{API_PATH}/downloads?search=Reused')
+    assert [d['id'] for d in response.json['data']] == [1000]
+    assert client.get(f'{API_PATH}/downloads?search=Quis').json['data_total'] == total - 1
+
+
+def test_get_downloads_list_cursor(client):
+    offset_ids = [d['id'] for d in client.get(f'{API_PATH}/downloads?limit=1000').json['data']]
+    # Walk all the pages with the cursor
+    cursor_ids = []
+    response = client.get(f'{API_PATH}/downloads?limit=300')
+    while True:
+        assert response.status_code == 200
+        cursor_ids += [d['id'] for d in response.json['data']]
+        if response.json['next_cursor'] is None:
+            break
+        response = client.get(f'{API_PATH}/downloads?limit=300&cursor={response.json["next_cursor"]}')
+    assert cursor_ids == offset_ids
+    # Same rows as offset mode, in-progress downloads included
+    response = client.get(f'{API_PATH}/downloads?limit=5&finished=false')
+    assert response.json['next_cursor'] is None
+    response = client.get(f'{API_PATH}/downloads?limit=5&finished=true')
+    next_page = client.get(f'{API_PATH}/downloads?limit=5&finished=true&cursor={response.json["next_cursor"]}')
+    assert next_page.json['data'] == client.get(f'{API_PATH}/downloads?limit=5&finished=true&offset=5').json['data']
+    # Invalid
+    assert client.get(f'{API_PATH}/downloads?cursor=invalid').status_code == 400
+    assert client.get(f'{API_PATH}/downloads?search=Quis&sort=rank&cursor={response.json["next_cursor"]}').status_code == 400
+
+
+def test_get_downloads_list_since(app, client):
+    # First delta, in pages ordered by id
+    ids, since = [], '0'
+    while True:
+        response = client.get(f'{API_PATH}/downloads?limit=300&since={since}')
+        assert response.status_code == 200
+        assert response.json['tombstones'] == []
+        ids += [d['id'] for d in response.json['data']]
+        since = response.json['watermark']
+        if len(response.json['data']) < 300:
+            break
+    assert ids == sorted(ids)
+    assert len(ids) == 1000
+    # Nothing changed: the downloads in progress and the last finished are sent again
+    response = client.get(f'{API_PATH}/downloads?limit=300&since={since}')
+    unchanged = {d['id'] for d in response.json['data']}
+    assert len(unchanged) <= 3
+    assert {d['id'] for d in response.json['data'] if d['finished'] == 0} == {999, 1000}
+
+    # Written by SeedboxSync and deleted by the front
+    with sqlite3.connect(app.config['DATABASE']) as conn:
+        conn.execute("INSERT INTO download (id, path, seedbox_size, local_size, started, finished) "
+                     "VALUES (1001, 'Lorem.mkv', 10, 5, '2026-01-01 00:00:00', 0)")
+        conn.execute("UPDATE download SET finished = '2026-01-01 00:00:00' WHERE id = 999")
+    conn.close()
+    assert client.delete(f'{API_PATH}/downloads/12').status_code == 200
+    response = client.get(f'{API_PATH}/downloads?limit=300&since={since}')
+    assert response.status_code == 200
+    assert {1001, 999} <= {d['id'] for d in response.json['data']} <= unchanged | {1001}
+    assert response.json['tombstones'] == [12]
+    since = response.json['watermark']
+    response = client.get(f'{API_PATH}/downloads?limit=300&since={since}')
+    assert response.json['tombstones'] == []
+    assert {d['id'] for d in response.json['data']} == {1000, 1001}
+
+    # Tombstones purged
+    app.config['TOMBSTONES_RETENTION'] = -1
+    assert client.delete(f'{API_PATH}/downloads/13').status_code == 200
+    response = client.get(f'{API_PATH}/downloads?since={since}')
+    assert response.status_code == 410
+    assert response.json['success'] is False
+    assert response.json['status'] == 410
+    assert response.json['title'] == 'The watermark expired, read all the rows again with since=0.'
+    assert {'type', 'timestamp', 'traceId'} <= set(response.json)
+    assert client.get(f'{API_PATH}/downloads?since=0&limit=5').status_code == 200
+    # Invalid
+    assert client.get(f'{API_PATH}/downloads?since=invalid').status_code == 400
+    assert client.get(f'{API_PATH}/downloads?since=0&finished=true').status_code == 400
+
+
+def test_get_downloads_list_count(app, client):
+    cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache'})
+    response = client.get(f'{API_PATH}/downloads?limit=5')
+    assert response.json['data_total'] == 1000
+    assert response.json['data_total_estimated'] is False
+    # No count
+    response = client.get(f'{API_PATH}/downloads?limit=5&count=none')
+    assert response.json['data_total'] is None
+    assert len(response.json['data']) == 5
+    # Estimate: cached per filter until the database changes
+    response = client.get(f'{API_PATH}/downloads?limit=5&finished=false&count=estimate')
+    assert response.json['data_total'] == 2
+    assert response.json['data_total_estimated'] is True
+    client.delete(f'{API_PATH}/downloads/progress')
+    response = client.get(f'{API_PATH}/downloads?limit=5&finished=false&count=estimate')
+    assert response.json['data_total'] == 0
+    assert client.get(f'{API_PATH}/downloads?count=invalid').status_code == 400
+
+
+def test_get_downloads_stats_summary(app, client):
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        finished = list(Download.select().where(Download.finished != 0))
+    response = client.get(f'{API_PATH}/downloads/stats/summary')
+    assert response.status_code == 200
+    assert response.json['data']['files'] == len(finished)
+    assert response.json['data']['total_size'] == sum(d.seedbox_size for d in finished if d.seedbox_size)
+    assert response.json['data']['first'] == min(d.finished for d in finished).isoformat()
+    assert response.json['data']['last'] == max(d.finished for d in finished).isoformat()
+    assert response.json['data']['human_total_size'].endswith('TiB')
+
+
+def test_get_downloads_stats_throughput(app, client):
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        finished = [d for d in Download.select().where(Download.finished != 0) if d.seedbox_size and d.finished > d.started]
+    last = max(d.finished for d in finished)
+
+    # Default: the 30 days before the last download
+    response = client.get(f'{API_PATH}/downloads/stats/throughput?limit=5')
+    assert response.status_code == 200
+    data = response.json['data']
+    assert data['end'] == (last + timedelta(days=1)).strftime('%Y-%m-%dT00:00:00')
+    assert data['bucket'] == 'day'
+    in_range = [d for d in finished if d.finished.isoformat() >= data['start']]
+    rates = sorted(d.seedbox_size / (d.finished - d.started).total_seconds() for d in in_range)
+    assert sum(b['files'] for b in data['buckets']) == len(in_range)
+    assert data['rate'] == pytest.approx(sum(d.seedbox_size for d in in_range) / sum((d.finished - d.started).total_seconds() for d in in_range))
+    assert data['percentiles']['p50'] == pytest.approx(rates[math.ceil(len(rates) * 0.5) - 1])
+    assert data['percentiles']['p99'] == pytest.approx(rates[-1])
+    assert len(data['files']) == 5
+    assert data['files'][0]['finished'] == last.isoformat()
+    assert data['files'][0]['human_rate'].endswith('/s')
+
+    # By hour on a range
+    response = client.get(f'{API_PATH}/downloads/stats/throughput?start=2017-01-01&end=2026-01-01&bucket=hour')
+    assert response.status_code == 200
+    assert sum(b['files'] for b in response.json['data']['buckets']) == len(finished)
+
+    # Empty and invalid ranges
+    response = client.get(f'{API_PATH}/downloads/stats/throughput?start=2000-01-01&end=2000-02-01')
+    assert response.json['data']['buckets'] == []
+    assert response.json['data']['rate'] is None
+    assert response.json['data']['percentiles']['p90'] is None
+    assert client.get(f'{API_PATH}/downloads/stats/throughput?start=2025-02-01&end=2025-01-01').status_code == 400
+    assert client.get(f'{API_PATH}/downloads/stats/throughput?start=invalid').status_code == 400
+    assert client.get(f'{API_PATH}/downloads/stats/throughput?bucket=week').status_code == 400
+
+
+def test_get_downloads_export(client):
+    response = client.get(f'{API_PATH}/downloads/export')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'] == 'application/x-ndjson'
+    lines = [json.loads(line) for line in response.data.splitlines()]
+    assert len(lines) == 1000
+    assert set(lines[0]) == {'id', 'path', 'started', 'finished', 'local_size', 'seedbox_size'}
+    # Filtered, CSV and gzip
+    response = client.get(f'{API_PATH}/downloads/export?format=csv&gzip=true&finished=false')
+    assert response.headers['Content-Disposition'] == 'attachment; filename="downloads.csv.gz"'
+    rows = list(csv.DictReader(io.StringIO(gzip.decompress(response.data).decode())))
+    assert len(rows) == 2
+    assert {row['finished'] for row in rows} == {'0'}
+
+
+def test_post_downloads_bulk_delete(app, client):
+    # Dry run
+    response = client.post(f'{API_PATH}/downloads/bulk-delete', json={'finished_before': '2018-01-01T00:00:00', 'dry_run': True})
+    assert response.status_code == 200
+    deleted = response.json['data']['deleted']
+    assert deleted > 0
+    assert response.json['data']['dry_run'] is True
+    assert client.get(f'{API_PATH}/downloads?limit=5').json['data_total'] == 1000
+    # Delete, the stats rollup is updated
+    client.get(f'{API_PATH}/downloads/stats/day')
+    response = client.post(f'{API_PATH}/downloads/bulk-delete', json={'finished_before': '2018-01-01T00:00:00'})
+    assert response.json['data'] == {'deleted': deleted, 'dry_run': False}
+    assert client.get(f'{API_PATH}/downloads?limit=5').json['data_total'] == 1000 - deleted
+    assert client.get(f'{API_PATH}/downloads/stats/year').json['data'][0]['year'] != '2017'
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        assert rollup_by_period('day') == aggregate_downloads('day')
+    # Criteria are combined
+    response = client.post(f'{API_PATH}/downloads/bulk-delete', json={'ids': [999, 1000], 'search': 'Convallis'})
+    assert response.json['data']['deleted'] == 1
+    # More ids than the SQLite bound variables
+    response = client.post(f'{API_PATH}/downloads/bulk-delete', json={'ids': list(range(1, 250002)), 'dry_run': True})
+    assert response.json['data']['deleted'] == 1000 - deleted - 1
+    # Errors
+    assert client.post(f'{API_PATH}/downloads/bulk-delete', json={}).status_code == 400
+    assert client.post(f'{API_PATH}/downloads/bulk-delete', json={'ids': 'all'}).status_code == 400
+    assert client.post(f'{API_PATH}/downloads/bulk-delete', json={'finished_before': 'yesterday'}).status_code == 400
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import json
+import sqlite3
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def next_event(stream):
+    """
+    Read the next event of a stream, skipping the comments and the retry.
+    """
+    for chunk in stream:
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if chunk.startswith('event: '):
+            event, data = chunk.strip().split('\n')
+            return event[len('event: '):], json.loads(data[len('data: '):])
+    return None
+
+
+def test_events(app):
+    app.config.update({'EVENTS_ENABLED': True, 'EVENTS_INTERVAL': 0.05, 'EVENTS_KEEPALIVE': 0.05, 'EVENTS_MAX_DURATION': 10})
+    client = app.test_client()
+
+    response = client.get(f'{API_PATH}/events', buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    assert 'ETag' not in response.headers
+    stream = iter(response.response)
+    try:
+        event, data = next_event(stream)
+        assert event == 'snapshot'
+        assert len(data['downloads']) == 2
+        assert all(row['finished'] == 0 for row in data['downloads'])
+        assert data['locks']['sync_seedbox']['locked'] is True
+        assert data['locks']['sync_blackhole']['locked'] is False
+        first, second = (row['id'] for row in data['downloads'])
+
+        # Written by SeedboxSync
+        with sqlite3.connect(app.config['DATABASE']) as conn:
+            conn.execute('UPDATE download SET local_size = local_size + 1 WHERE id = ?', (first,))
+            conn.execute("UPDATE download SET finished = '2026-01-01 00:00:00' WHERE id = ?", (second,))
+            conn.execute("UPDATE lock SET locked = 0, unlocked_at = '2026-01-01 00:00:00' WHERE key = 'sync_seedbox'")
+        conn.close()
+
+        event, data = next_event(stream)
+        assert event == 'downloads'
+        assert [row['id'] for row in data['changed']] == [first]
+        assert data['removed'] == [second]
+        event, data = next_event(stream)
+        assert event == 'lock'
+        assert data['key'] == 'sync_seedbox'
+        assert data['lock']['locked'] is False
+    finally:
+        response.close()
+    assert not app.extensions['seedboxsync_events'].subscribers
+
+
+def test_events_disabled(client):
+    response = client.get(f'{API_PATH}/events')
+    assert response.status_code == 404
@@ -59,3 +59,73 @@ def test_delete_uploads_404(client):
     response = client.delete(f'{API_PATH}/uploads/9999999')
     assert response.status_code == 404
     assert response.json['title'] == 'Upload 9999999 doesn\'t exist'
+
+
+def test_get_uploads_list_search(app, client):
+    response = client.get(f'{API_PATH}/uploads?search=Justo')
+    assert response.status_code == 200
+    ids = sorted(u['id'] for u in response.json['data'])
+    assert 100 in ids
+    assert response.json['data_total'] == len(ids)
+    # Same result without the search index
+    app.config['SEARCH_INDEX'] = False
+    response = client.get(f'{API_PATH}/uploads?search=Justo')
+    assert sorted(u['id'] for u in response.json['data']) == ids
+
+
+def test_get_uploads_list_cursor(client):
+    offset_ids = [d['id'] for d in client.get(f'{API_PATH}/uploads?limit=1000').json['data']]
+    cursor_ids = []
+    response = client.get(f'{API_PATH}/uploads?limit=100')
+    while True:
+        assert response.status_code == 200
+        cursor_ids += [d['id'] for d in response.json['data']]
+        if response.json['next_cursor'] is None:
+            break
+        response = client.get(f'{API_PATH}/uploads?limit=100&cursor={response.json["next_cursor"]}')
+    assert cursor_ids == offset_ids
+    assert client.get(f'{API_PATH}/uploads?cursor=invalid').status_code == 400
+
+
+def test_get_uploads_list_since(client):
+    total = client.get(f'{API_PATH}/uploads?limit=5').json['data_total']
+    ids, since = [], '0'
+    while True:
+        response = client.get(f'{API_PATH}/uploads?limit=100&since={since}')
+        assert response.status_code == 200
+        ids += [d['id'] for d in response.json['data']]
+        since = response.json['watermark']
+        if len(response.json['data']) < 100:
+            break
+    assert ids == sorted(ids)
+    assert len(ids) == total
+    # Nothing new, deletions of the front
+    response = client.get(f'{API_PATH}/uploads?since={since}')
+    assert response.json['data'] == []
+    assert response.json['tombstones'] == []
+    client.post(f'{API_PATH}/uploads/bulk-delete', json={'ids': [102, 103]})
+    client.delete(f'{API_PATH}/uploads/104')
+    response = client.get(f'{API_PATH}/uploads?since={since}')
+    assert response.json['data'] == []
+    assert response.json['tombstones'] == [102, 103, 104]
+    assert client.get(f'{API_PATH}/uploads?since={since}&search=Quis').status_code == 400
+
+
+def test_get_uploads_export(client):
+    response = client.get(f'{API_PATH}/uploads/export?format=csv')
+    assert response.status_code == 200
+    assert response.headers['Content-Type'].startswith('text/csv')
+    lines = response.data.decode().splitlines()
+    assert lines[0] == 'id,name,announce,sent'
+    assert len(lines) == client.get(f'{API_PATH}/uploads?limit=5').json['data_total'] + 1
+
+
+def test_post_uploads_bulk_delete(client):
+    total = client.get(f'{API_PATH}/uploads?limit=5').json['data_total']
+    response = client.post(f'{API_PATH}/uploads/bulk-delete', json={'ids': [1, 2, 3], 'dry_run': True})
+    assert response.status_code == 200
+    assert response.json['data'] == {'deleted': 3, 'dry_run': True}
+    response = client.post(f'{API_PATH}/uploads/bulk-delete', json={'ids': [1, 2, 3]})
+    assert response.json['data'] == {'deleted': 3, 'dry_run': False}
+    assert client.get(f'{API_PATH}/uploads?limit=5').json['data_total'] == total - 3
+    assert client.post(f'{API_PATH}/uploads/bulk-delete', json={'dry_run': True}).status_code == 400
@@ -0,0 +1,101 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import sqlite3
+from seedboxsync_front import create_app
+from seedboxsync_front.cache import bump_generation, cache, db_generation, front_generation
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def write(app):
+    conn = sqlite3.connect(app.config['DATABASE'])
+    conn.execute("INSERT INTO download (path, seedbox_size, local_size, started, finished) "
+                 "VALUES ('New.mkv', 1073741824, 1073741824, '2030-01-01 00:00:00', '2030-01-01 01:00:00')")
+    conn.commit()
+    conn.close()
+
+
+def test_db_generation(app):
+    with app.test_request_context():
+        generation = db_generation()
+        assert db_generation() == generation
+        write(app)
+        assert db_generation() != generation
+
+
+def test_bump_generation(app):
+    # A second app on the same files stands for another worker
+    other = create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'NullCache',
+    })
+    with app.test_request_context():
+        generation = db_generation()
+    with other.test_request_context():
+        assert db_generation() == generation
+        bump_generation()
+        generation = db_generation()
+    with app.test_request_context():
+        assert db_generation() == generation
+        # Same value on the SeedboxSync connection
+        with app.extensions['seedboxsync_db'].db.connection_context():
+            assert db_generation() == generation
+
+
+def test_delete_generation(app, client):
+    with app.test_request_context():
+        generation = front_generation()
+    assert client.delete(f'{API_PATH}/downloads/1000').status_code == 200
+    with app.test_request_context():
+        assert front_generation() != generation
+        generation = front_generation()
+    assert client.delete(f'{API_PATH}/uploads/1').status_code == 200
+    with app.test_request_context():
+        assert front_generation() != generation
+
+
+def test_versioned(app, client):
+    cache.init_app(app, config={'CACHE_TYPE': 'SimpleCache'})
+    response = client.get(f'{API_PATH}/downloads/stats/year')
+    assert response.json['data'][-1]['year'] != '2030'
+    assert client.get(f'{API_PATH}/downloads/stats/year').json['traceId'] == response.json['traceId']
+    # Query args and locale are part of the key
+    assert client.get(f'{API_PATH}/downloads?limit=5').json['traceId'] != client.get(f'{API_PATH}/downloads?limit=6').json['traceId']
+    assert client.get('/stats', headers={'Accept-Language': 'fr'}).data != client.get('/stats', headers={'Accept-Language': 'en'}).data
+    # Invalidated by a new row
+    write(app)
+    response = client.get(f'{API_PATH}/downloads/stats/year')
+    assert response.json['data'][-1]['year'] == '2030'
+
+
+def test_conditional(app, client):
+    response = client.get(f'{API_PATH}/downloads?limit=5')
+    etag = response.headers['ETag']
+    last_modified = response.headers['Last-Modified']
+    assert response.headers['Cache-Control'] == 'no-cache'
+    # Same database and query args
+    response = client.get(f'{API_PATH}/downloads?limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    response = client.get(f'{API_PATH}/downloads?limit=5', headers={'If-Modified-Since': last_modified})
+    assert response.status_code == 304
+    # Other query args
+    response = client.get(f'{API_PATH}/downloads?limit=6', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    # Database changed
+    write(app)
+    response = client.get(f'{API_PATH}/downloads?limit=5', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    # No validators on writes and errors
+    assert 'ETag' not in client.delete(f'{API_PATH}/downloads/1000').headers
+    assert 'ETag' not in client.get(f'{API_PATH}/downloads/1000').headers
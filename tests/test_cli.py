@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import pytest
+from peewee import fn, SqliteDatabase
+from seedboxsync.core.dao import Download, Torrent
+
+
+def test_rebuild_stats(app, runner):
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        files = Download.select().where(Download.finished != 0, Download.seedbox_size != 0).count()
+    result = runner.invoke(args=['seedboxsync-front', 'rebuild-stats'])
+    assert result.exit_code == 0
+    assert '{} download(s)'.format(files) in result.output
+    # Disabled
+    app.config['STATS_ROLLUP'] = False
+    result = runner.invoke(args=['seedboxsync-front', 'rebuild-stats'])
+    assert result.exit_code == 1
+
+
+def test_rebuild_search(app, runner):
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        downloads, torrents = Download.select().count(), Torrent.select().count()
+    result = runner.invoke(args=['seedboxsync-front', 'rebuild-search'])
+    assert result.exit_code == 0
+    assert '{} download(s) and {} upload(s)'.format(downloads, torrents) in result.output
+    # Disabled
+    app.config['SEARCH_INDEX'] = False
+    result = runner.invoke(args=['seedboxsync-front', 'rebuild-search'])
+    assert result.exit_code == 1
+
+
+def test_gen_data(runner, tmp_path):
+    path = str(tmp_path / 'synthetic.db')
+    args = ['seedboxsync-front', 'gen-data', path, '--downloads', '1000', '--in-progress', '3', '--start', '2024-01-01', '--end', '2025-01-01']
+    result = runner.invoke(args=args)
+    assert result.exit_code == 0, result.output
+    assert '1000 download, 250 torrent' in result.output
+
+    database = SqliteDatabase(path)
+    with database.bind_ctx([Download, Torrent]):
+        assert Download.select().count() == 1000
+        assert Download.select().where(Download.finished == 0).count() == 3
+        assert Torrent.select().count() == 250
+        first, last = Download.select(fn.MIN(Download.started), fn.MAX(Download.started)).scalar(as_tuple=True)
+        assert '2024-01-01' <= str(first) <= str(last) <= '2025-01-01'
+        rows = list(Download.select().order_by(Download.id).limit(20).tuples())
+    database.close()
+
+    # Deterministic
+    other = str(tmp_path / 'other.db')
+    assert runner.invoke(args=args[:2] + [other] + args[3:]).exit_code == 0
+    database = SqliteDatabase(other)
+    with database.bind_ctx([Download]):
+        assert list(Download.select().order_by(Download.id).limit(20).tuples()) == rows
+    database.close()
+
+    # Existing file
+    result = runner.invoke(args=args)
+    assert result.exit_code == 1
+    assert 'already exists' in result.output
+
+
+def test_serve():
+    pytest.importorskip('gunicorn')
+    from seedboxsync_front.cli import main
+    from seedboxsync_front.serve import Server
+
+    assert {'serve', 'rebuild-stats', 'gen-data'} <= set(main.commands)
+    server = Server({'bind': '127.0.0.1:5000', 'workers': 3, 'threads': None})
+    assert server.cfg.bind == ['127.0.0.1:5000']
+    assert server.cfg.workers == 3
+    assert server.cfg.threads == 8
+    assert server.cfg.worker_class_str == 'gthread'
+    assert server.cfg.preload_app
+    assert server.cfg.max_requests_jitter > 0
+    # The preloaded app is created again on reload
+    server.callable = object()
+    server.reload()
+    assert server.callable is None
@@ -0,0 +1,84 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import gzip
+import json
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def test_compress(client):
+    response = client.get(f'{API_PATH}/downloads?limit=100', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert 'Accept-Encoding' in response.headers['Vary']
+    assert response.headers['ETag'].endswith('-gz"')
+    assert json.loads(gzip.decompress(response.get_data()))['status'] == 200
+
+    # Compressed ETag is valid for conditional requests
+    response = client.get(f'{API_PATH}/downloads?limit=100', headers={'Accept-Encoding': 'gzip', 'If-None-Match': response.headers['ETag']})
+    assert response.status_code == 304
+
+    # Identity
+    response = client.get(f'{API_PATH}/downloads?limit=100')
+    assert 'Content-Encoding' not in response.headers
+    assert response.json['status'] == 200
+
+
+def test_compress_min_size(app):
+    app.config['COMPRESS_MIN_SIZE'] = 10 ** 9
+    response = app.test_client().get('/', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert 'Content-Encoding' not in response.headers
+
+
+def test_dist(app, tmp_path):
+    compress = app.extensions['seedboxsync_compress']
+    compress.dist_path = str(tmp_path)
+    (tmp_path / '.vite').mkdir()
+    (tmp_path / '.vite' / 'manifest.json').write_text(json.dumps({
+        'seedboxsync_front/static/src/main.js': {'file': 'main.abc123.js', 'name': 'main', 'isEntry': True, 'css': ['main.def456.css'],
+                                                 'imports': ['_vendor.js']},
+        '_vendor.js': {'file': 'vendor.789abc.js', 'name': 'vendor', 'assets': ['logo.0f1e2d.png']},
+    }))
+    compress._Compress__load_manifest()
+    (tmp_path / 'main.abc123.js').write_text('console.log("seedboxsync");')
+    (tmp_path / 'main.abc123.js.gz').write_bytes(gzip.compress(b'console.log("seedboxsync");'))
+
+    with app.test_request_context():
+        assert compress.asset_url('main.js') == '/static/dist/main.abc123.js'
+        assert compress.asset_url('main.css') == '/static/dist/main.def456.css'
+        assert compress.asset_url('other.js') == '/static/dist/other.js'
+
+    client = app.test_client()
+    response = client.get('/static/dist/main.abc123.js', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.mimetype in ('application/javascript', 'text/javascript')
+    assert 'immutable' in response.headers['Cache-Control']
+    assert gzip.decompress(response.get_data()) == b'console.log("seedboxsync");'
+    response.close()
+
+    response = client.get('/static/dist/main.abc123.js')
+    assert 'Content-Encoding' not in response.headers
+    assert response.get_data() == b'console.log("seedboxsync");'
+    response.close()
+
+    # Imported chunks and assets are hashed too
+    for name in ('vendor.789abc.js', 'logo.0f1e2d.png', 'other.js'):
+        (tmp_path / name).write_bytes(b'seedboxsync')
+    for name in ('vendor.789abc.js', 'logo.0f1e2d.png'):
+        response = client.get(f'/static/dist/{name}')
+        assert 'immutable' in response.headers['Cache-Control']
+        response.close()
+    response = client.get('/static/dist/other.js')
+    assert 'immutable' not in response.headers.get('Cache-Control', '')
+    response.close()
+
+    response = client.get('/'.join(['/static/dist', 'missing.js']))
+    assert response.status_code == 404
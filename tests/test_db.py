@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import os
+import shutil
+import sqlite3
+from seedboxsync_front import create_app
+from seedboxsync_front.db import Database
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def read_only_app(app):
+    return create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'DATABASE_READ_ONLY': True,
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'NullCache',
+    })
+
+
+def test_pragmas(app):
+    database = app.extensions['seedboxsync_db']
+    with database.db.connection_context():
+        pragmas = database.get_pragmas()
+    assert pragmas['cache_size'] == Database.DEFAULT_PRAGMAS['cache_size']
+    assert pragmas['busy_timeout'] == Database.DEFAULT_PRAGMAS['busy_timeout']
+    assert pragmas['temp_store'] == 2  # memory
+    assert pragmas['query_only'] == 0
+    assert database.read_only is False
+
+
+def test_pragmas_override(app):
+    app = create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'DATABASE_PRAGMAS': {'cache_size': -1024},
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'NullCache',
+    })
+    database = app.extensions['seedboxsync_db']
+    with database.db.connection_context():
+        assert database.get_pragmas()['cache_size'] == -1024
+
+
+def test_read_only(app):
+    app = read_only_app(app)
+    database = app.extensions['seedboxsync_db']
+    with database.db.connection_context():
+        assert database.get_pragmas()['query_only'] == 1
+
+    client = app.test_client()
+    response = client.get(f'{API_PATH}/downloads?limit=5')
+    assert response.status_code == 200
+    response = client.delete(f'{API_PATH}/downloads/1000')
+    assert response.status_code == 403
+    response = client.delete(f'{API_PATH}/uploads/100')
+    assert response.status_code == 403
+    response = client.post(f'{API_PATH}/downloads/bulk-delete', json={'ids': [1000], 'dry_run': True})
+    assert response.status_code == 200
+    response = client.post(f'{API_PATH}/downloads/bulk-delete', json={'ids': [1000]})
+    assert response.status_code == 403
+    # Same envelope as the other API errors
+    assert response.json['success'] is False
+    assert response.json['status'] == 403
+    assert response.json['title'] == 'The database is opened in read-only mode.'
+    assert {'type', 'timestamp', 'traceId'} <= set(response.json)
+
+
+def test_is_wal(app, tmp_path):
+    assert Database.is_wal(app.config['DATABASE']) is False
+    assert Database.is_wal(str(tmp_path / 'missing.db')) is False
+
+    wal_db = tmp_path / 'wal.db'
+    conn = sqlite3.connect(wal_db)
+    conn.execute('PRAGMA journal_mode=wal')
+    conn.execute('CREATE TABLE t (id INTEGER)')
+    conn.close()
+    assert Database.is_wal(str(wal_db)) is True
+
+
+def pool_app(app, recycle=1000):
+    return create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'DATABASE_CONNECTION': 'pool',
+        'DATABASE_POOL_RECYCLE': recycle,
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'NullCache',
+    })
+
+
+def test_request_mode_connects(app, client):
+    database = app.extensions['seedboxsync_db']
+    before = database.db.connects_per_minute()
+    for _ in range(3):
+        assert client.get(f'{API_PATH}/downloads?limit=5').status_code == 200
+    assert database.db.connects_per_minute() == before + 3
+    assert database.db.is_closed()
+
+
+def test_pool_mode(app):
+    app = pool_app(app)
+    database = app.extensions['seedboxsync_db']
+    client = app.test_client()
+    for _ in range(5):
+        assert client.get(f'{API_PATH}/downloads?limit=5').status_code == 200
+    assert database.db.connects_per_minute() == 1
+    assert not database.db.is_closed()
+    database.db.close()
+
+
+def test_pool_mode_recycle(app):
+    app = pool_app(app, recycle=2)
+    database = app.extensions['seedboxsync_db']
+    client = app.test_client()
+    for _ in range(5):
+        assert client.get(f'{API_PATH}/downloads?limit=5').status_code == 200
+    assert database.db.connects_per_minute() == 3
+    database.db.close()
+
+
+def test_pool_mode_file_replaced(app):
+    app = pool_app(app)
+    database = app.extensions['seedboxsync_db']
+    client = app.test_client()
+    assert client.get(f'{API_PATH}/downloads?limit=5').status_code == 200
+
+    # Replace the database file by a copy (new inode)
+    db_file = app.config['DATABASE']
+    shutil.copy(db_file, db_file + '.new')
+    os.replace(db_file + '.new', db_file)
+
+    assert client.get(f'{API_PATH}/downloads?limit=5').status_code == 200
+    assert database.db.connects_per_minute() == 2
+    database.db.close()
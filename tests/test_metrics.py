@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import json
+import os
+from types import SimpleNamespace
+from seedboxsync_front import create_app, gunicorn_config
+from seedboxsync_front.metrics import metrics, MmapStore
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def test_mmap_store(tmp_path):
+    store = MmapStore(str(tmp_path / '1.db'))
+    for i in range(2000):  # Grows the file
+        store.inc('key-{}'.format(i), i)
+    store.inc('key-1', 0.5)
+
+    entries = {key: value for key, value, _ in MmapStore.entries((tmp_path / '1.db').read_bytes())}
+    assert len(entries) == 2000
+    assert entries['key-1'] == 1.5
+    assert entries['key-1999'] == 1999
+
+    # Reopened by the same process
+    assert {key: value for key, value, _ in MmapStore.entries(MmapStore(str(tmp_path / '1.db'))._MmapStore__mmap)} == entries
+
+
+def test_metrics(app, tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'SimpleCache',
+        'BABEL_DEFAULT_LOCALE': 'en',
+        'METRICS_ENABLED': True,
+        'METRICS_DIR': str(tmp_path),
+    })
+    client = app.test_client()
+    client.get(f'{API_PATH}/downloads?limit=5')
+    client.get(f'{API_PATH}/downloads?limit=5')
+
+    # Another worker
+    labels = [['endpoint', 'api.downloads_downloads_list'], ['method', 'GET'], ['status', '200']]
+    MmapStore(str(tmp_path / '99999.db')).inc(json.dumps(['seedboxsync_front_requests_total', labels]), 3)
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    lines = response.get_data(as_text=True).splitlines()
+    assert '# TYPE seedboxsync_front_request_duration_seconds histogram' in lines
+    assert 'seedboxsync_front_requests_total{endpoint="api.downloads_downloads_list",method="GET",status="200"} 5' in lines
+    assert 'seedboxsync_front_request_duration_seconds_bucket{endpoint="api.downloads_downloads_list",method="GET",le="+Inf"} 2' in lines
+    assert 'seedboxsync_front_request_duration_seconds_count{endpoint="api.downloads_downloads_list",method="GET"} 2' in lines
+    assert 'seedboxsync_front_cache_requests_total{result="hit"} 1' in lines
+    assert 'seedboxsync_front_rows_returned_total{endpoint="api.downloads_downloads_list"} 5' in lines
+    assert any(line.startswith('seedboxsync_front_db_query_duration_seconds_count ') for line in lines)
+
+    # The worker exits: its samples are merged and its file removed
+    gunicorn_config.child_exit(None, SimpleNamespace(pid=99999))
+    assert not (tmp_path / '99999.db').exists()
+    assert (tmp_path / 'merged.db').exists()
+    gunicorn_config.worker_exit(None, SimpleNamespace(pid=99999))  # Already merged
+    MmapStore(str(tmp_path / '99998.db')).inc(json.dumps(['seedboxsync_front_requests_total', labels]), 1)
+    metrics.merge(99998)
+    lines = client.get('/metrics').get_data(as_text=True).splitlines()
+    assert 'seedboxsync_front_requests_total{endpoint="api.downloads_downloads_list",method="GET",status="200"} 6' in lines
+    assert sorted(path.name for path in tmp_path.glob('*.db')) == sorted(['merged.db', '{}.db'.format(os.getpid())])
+
+
+def test_metrics_disabled(client):
+    assert client.get('/metrics').status_code == 404
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import math
+from datetime import datetime, timedelta
+from seedboxsync.core.dao import Download
+from seedboxsync_front import progress
+from seedboxsync_front.progress import RateEstimator
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+MIB = 1024 * 1024
+
+
+def row(local_size, started=None, finished=0):
+    return {'id': 1, 'started': started or datetime.now(), 'finished': finished, 'local_size': local_size, 'seedbox_size': 1000 * MIB}
+
+
+def test_rate_estimator(app, monkeypatch):
+    clock = {'now': 1000.0, 'generation': 'a'}
+    monkeypatch.setattr(progress.time, 'monotonic', lambda: clock['now'])
+    monkeypatch.setattr(progress, 'db_generation', lambda: clock['generation'])
+    estimator = RateEstimator()
+
+    with app.app_context():
+        # First read: average rate since the start
+        data = estimator.annotate([row(100 * MIB, datetime.now() - timedelta(seconds=100))])
+        assert math.isclose(data[0]['rate_bps'], MIB, rel_tol=0.01)
+        assert math.isclose(data[0]['eta_seconds'], 900, rel_tol=0.01)
+
+        # Same generation: not sampled again
+        clock['now'] += 10
+        data = estimator.annotate([row(200 * MIB)])
+        assert math.isclose(data[0]['rate_bps'], MIB, rel_tol=0.01)
+
+        # New generation: 100 MiB in 10 s, smoothed
+        clock['generation'] = 'b'
+        data = estimator.annotate([row(200 * MIB)])
+        expected = MIB + (1 - math.exp(-10 / app.config['RATE_SMOOTHING'])) * (10 * MIB - MIB)
+        assert math.isclose(data[0]['rate_bps'], expected, rel_tol=0.01)
+        assert data[0]['eta_seconds'] == int(800 * MIB / data[0]['rate_bps'])
+
+        # Unchanged size: rate kept
+        clock['now'] += 5
+        clock['generation'] = 'c'
+        assert estimator.annotate([row(200 * MIB)])[0]['rate_bps'] == data[0]['rate_bps']
+
+        # Finished downloads are unchanged, forgotten samples
+        assert 'rate_bps' not in estimator.annotate([row(1000 * MIB, finished=datetime.now())])[0]
+        clock['now'] += progress.FORGET_AFTER + 1
+        estimator.annotate([dict(row(0), id=2)])
+        assert list(estimator.samples) == [2]
+        assert estimator.annotate([dict(row(0), id=2)])[0]['eta_seconds'] is None
+
+
+def test_get_downloads_rate(app, client):
+    progress.rates.samples.clear()  # Ids are reused by the databases of the other tests
+    with app.app_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        download = Download.create(path='InProgress.mkv', seedbox_size=2048 * MIB, local_size=1024 * MIB, started=datetime.now() - timedelta(seconds=1024))
+
+    response = client.get(f'{API_PATH}/downloads/{download.id}')
+    assert math.isclose(response.json['data']['rate_bps'], MIB, rel_tol=0.01)
+    assert math.isclose(response.json['data']['eta_seconds'], 1024, rel_tol=0.01)
+    row = next(row for row in client.get(f'{API_PATH}/downloads?finished=false').json['data'] if row['id'] == download.id)
+    assert row['eta_seconds'] is not None
+    # Finished downloads have no rate
+    data = client.get(f'{API_PATH}/downloads?finished=true&limit=5').json['data']
+    assert all(row['rate_bps'] is None and row['eta_seconds'] is None for row in data)
@@ -0,0 +1,127 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import pytest
+from datetime import datetime
+from peewee import fn, OperationalError
+from seedboxsync.core.dao import Download
+from seedboxsync_front import rollup
+from seedboxsync_front.apis.downloads import stats_by_period
+from seedboxsync_front.rollup import aggregate_downloads, forget_downloads, rebuild_rollup, rollup_by_period, sync_rollup
+from seedboxsync_front.sidecar import DownloadPending, sidecar
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def connection(app):
+    return app.extensions['seedboxsync_db'].db.connection_context()
+
+
+def test_rollup(app):
+    with app.app_context(), connection(app):
+        for period in ('day', 'week', 'month', 'year'):
+            assert rollup_by_period(period) == aggregate_downloads(period)
+        # Already synced
+        assert sync_rollup() == 0
+
+
+def test_rollup_sync(app):
+    with app.app_context(), connection(app):
+        rollup_by_period('day')
+        # New finished download, new download in progress
+        Download.create(path='Finished.mkv', seedbox_size=1024, local_size=1024, finished=datetime(2030, 1, 2, 3, 4, 5))
+        in_progress = Download.create(path='InProgress.mkv', seedbox_size=2048, local_size=1024)
+        assert sync_rollup() == 1
+        assert rollup_by_period('year')[-1] == ('2030', 1, 1024, 1024)
+        # Pending download finished
+        in_progress.local_size = 2048
+        in_progress.finished = datetime(2030, 1, 2, 5, 0, 0)
+        in_progress.save()
+        assert sync_rollup() == 1
+        assert rollup_by_period('day')[-1] == ('2030-01-02', 2, 3072, 3072)
+        assert rollup_by_period('day') == aggregate_downloads('day')
+        # Rebuild
+        Download.delete().where(Download.path == 'Finished.mkv').execute()
+        assert rollup_by_period('day') != aggregate_downloads('day')
+        rebuild_rollup()
+        assert rollup_by_period('day') == aggregate_downloads('day')
+
+
+def test_rollup_sync_batches(app, monkeypatch):
+    monkeypatch.setattr(rollup, 'SYNC_BATCH', 2)
+    with app.app_context(), connection(app):
+        rollup_by_period('day')
+        in_progress = []
+        for i in range(5):
+            Download.create(path='Finished{}.mkv'.format(i), seedbox_size=1024, local_size=1024, finished=datetime(2030, 1, 2, 3, 4, 5))
+            in_progress.append(Download.create(path='InProgress{}.mkv'.format(i), seedbox_size=2048, local_size=1024))
+        assert sync_rollup() == 5
+        assert rollup_by_period('day') == aggregate_downloads('day')
+        with sidecar.connection_context():
+            assert {download.id for download in in_progress} <= set(DownloadPending.select(DownloadPending.id).scalars())
+
+
+def test_rollup_unchanged(app, monkeypatch):
+    with app.app_context(), connection(app):
+        Download.create(path='InProgress.mkv', seedbox_size=2048, local_size=1024)
+        rollup_by_period('day')
+
+        # Pending downloads still in progress: no write lock
+        def atomic(*args, **kwargs):
+            raise AssertionError('Rollup locked')
+        monkeypatch.setattr(rollup.sidecar, 'atomic', atomic)
+        assert sync_rollup() == 0
+
+
+def test_rollup_read_only(app):
+    with app.app_context(), connection(app):
+        rollup_by_period('day')
+        Download.create(path='Finished.mkv', seedbox_size=1024, local_size=1024, finished=datetime(2030, 1, 2, 3, 4, 5))
+        app.config['DATABASE_READ_ONLY'] = True
+        # Outdated: aggregated in SQL, the rollup is not synced
+        assert rollup_by_period('day') == aggregate_downloads('day')
+        with sidecar.connection_context():
+            assert rollup.rollup_outdated(Download.select(fn.MAX(Download.id)).scalar())
+
+
+def test_rollup_delete(app, client):
+    with app.app_context(), connection(app):
+        rollup_by_period('day')
+        download = Download.select().where(Download.finished != 0, Download.seedbox_size > 0).first()
+    assert client.delete(f'{API_PATH}/downloads/{download.id}').status_code == 200
+    with app.app_context(), connection(app):
+        assert rollup_by_period('day') == aggregate_downloads('day')
+
+
+def test_rollup_delete_failed(app):
+    with app.app_context(), connection(app):
+        rollup = rollup_by_period('day')
+        download = Download.select().where(Download.finished != 0, Download.seedbox_size > 0).first()
+        with pytest.raises(OperationalError):
+            with forget_downloads([download.id]):
+                raise OperationalError('database is locked')
+        assert rollup_by_period('day') == rollup
+
+
+def test_rollup_disabled(app):
+    with app.app_context(), connection(app):
+        expected = stats_by_period('month')
+        app.config['STATS_ROLLUP'] = False
+        assert stats_by_period('month') == expected
+
+
+def test_get_downloads_stats_day(app, client):
+    with app.app_context(), connection(app):
+        days = aggregate_downloads('day')
+    response = client.get(f'{API_PATH}/downloads/stats/day')
+    assert response.status_code == 200
+    assert response.json['data'][0]['day'] == days[0][0]
+    assert len(response.json['data']) == len(days)
+    response = client.get(f'{API_PATH}/downloads/stats/week')
+    assert response.status_code == 200
+    assert sum(w['files'] for w in response.json['data']) == sum(d[1] for d in days)
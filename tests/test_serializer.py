@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import json
+from flask_restx import marshal
+from flask_restx.representations import output_json
+from peewee import fn
+from seedboxsync.core.dao import Download, Torrent
+from seedboxsync_front.apis import Resource
+from seedboxsync_front.apis.downloads import download_list_envelope, download_envelope, HUMANIZED_FIELDS
+from seedboxsync_front.apis.uploads import upload_list_envelope
+from seedboxsync_front.apis.serializer import compile_model
+from seedboxsync_front.utils import humanize_rows
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def downloads():
+    rows = humanize_rows(Download.select(
+        Download.id,
+        Download.path,
+        Download.started,
+        Download.finished,
+        Download.local_size,
+        Download.seedbox_size,
+        fn.round((Download.local_size.cast('REAL') / Download.seedbox_size.cast('REAL')) * 100, 2).alias('progress')
+    ).dicts(), HUMANIZED_FIELDS)
+    rows[0]['finished'] = 0  # In progress
+    rows[1]['progress'] = None  # No seedbox size
+    del rows[2]['path']  # Missing key
+    return rows
+
+
+def assert_identical(app, model, data):
+    with app.test_request_context():
+        expected = output_json(marshal(data, model), 200).get_data()
+        assert output_json(compile_model(model)(data), 200).get_data() == expected
+
+
+def test_compile_model(app):
+    with app.test_request_context(), app.extensions['seedboxsync_db'].db.connection_context():
+        rows = downloads()
+        uploads = list(Torrent.select().dicts())
+
+    resource = Resource()
+    with app.test_request_context():
+        assert_identical(app, download_list_envelope, resource.build_envelope(rows, data_total=len(rows), data_total_estimated=False, next_cursor='abc'))
+        assert_identical(app, download_list_envelope, resource.build_envelope([], data_total=0))
+        assert_identical(app, download_envelope, resource.build_envelope(rows[0]))
+        assert_identical(app, upload_list_envelope, resource.build_envelope(uploads, data_total=len(uploads)))
+
+
+def test_marshal_with(client):
+    client.application.config['FAST_JSON'] = False
+    response = client.get(f'{API_PATH}/downloads?limit=5', headers={'X-Fields': 'data{id}'})
+    assert response.json == {'data': [{'id': row['id']} for row in response.json['data']]}
+
+    swagger = client.get(f'{API_PATH}/swagger.json').json
+    get = swagger['paths']['/downloads']['get']
+    assert get['responses']['200']['schema'] == {'$ref': '#/definitions/Envelope%5BDownloadList%5D'}
+    assert any(param['name'] == 'X-Fields' for param in get['parameters'])
+
+
+def test_fast_json(client):
+    client.application.config['FAST_JSON'] = True
+    fast = client.get(f'{API_PATH}/downloads?limit=100')
+    client.application.config['FAST_JSON'] = False
+    slow = client.get(f'{API_PATH}/downloads?limit=100')
+
+    assert fast.get_data().endswith(b'\n')
+    fast_json, slow_json = json.loads(fast.get_data()), json.loads(slow.get_data())
+    for response in (fast_json, slow_json):
+        del response['timestamp'], response['traceId']
+    assert fast_json == slow_json
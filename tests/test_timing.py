@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+from seedboxsync_front import create_app
+from seedboxsync_front.timing import current
+from seedboxsync_front.__version__ import __api_path_version__ as api_path_version
+
+API_PATH = f'/api/{api_path_version}'
+
+
+def metrics(response):
+    return {metric.split(';')[0] for metric in response.headers['Server-Timing'].split(', ')}
+
+
+def test_timing(app):
+    app = create_app({
+        'TESTING': True,
+        'DATABASE': app.config['DATABASE'],
+        'FRONT_DATABASE': app.config['FRONT_DATABASE'],
+        'SECRET_KEY': 'pytest',
+        'CACHE_TYPE': 'SimpleCache',
+        'BABEL_DEFAULT_LOCALE': 'en',
+        'TIMING_ENABLED': True,
+        'TIMING_FOOTER': True,
+    })
+    client = app.test_client()
+
+    response = client.get(f'{API_PATH}/downloads?limit=5')
+    assert response.status_code == 200
+    assert metrics(response) == {'db', 'cache', 'marshal', 'total'}
+    assert 'db;dur=' in response.headers['Server-Timing']
+    assert b'server-timing' not in response.get_data()
+
+    response = client.get('/')
+    assert response.status_code == 200
+    assert {'cache', 'render', 'total'} <= metrics(response)
+    assert b'<div class="container has-text-centered has-text-grey is-size-7 server-timing">' in response.get_data()
+
+    assert current.get() is None
+
+
+def test_timing_disabled(client):
+    response = client.get(f'{API_PATH}/downloads?limit=5')
+    assert response.status_code == 200
+    assert 'Server-Timing' not in response.headers
@@ -0,0 +1,37 @@
+# -*- coding: utf-8 -*-
+#
+# Copyright (C) 2025-2026 Guillaume Kulakowski <guillaume@kulakowski.fr>
+#
+# For the full copyright and license information, please view the LICENSE
+# file that was distributed with this source code.
+#
+import humanize
+from seedboxsync_front.utils import byte_to_gi, humanize_rows, naturalsize
+
+SIZES = [0, 1, 2, 1.5, 1023, 1024, 1025, 1048575, 1048576, 1004650709, 3912090693, 1024**3 * 1023.96, 10**40]
+
+
+def test_byte_to_gi():
+    assert byte_to_gi(3912090693) == '3.6GiB'
+
+
+def test_naturalsize():
+    for size in SIZES:
+        assert naturalsize(size) == humanize.filesize.naturalsize(size, True)
+    assert naturalsize(None) == '0 Bytes'
+    assert naturalsize('_ERROR_') == '0 Bytes'
+
+
+def test_naturalsize_locale():
+    try:
+        humanize.i18n.activate('fr')
+        for size in SIZES:
+            assert naturalsize(size) == humanize.filesize.naturalsize(size, True)
+    finally:
+        humanize.i18n.deactivate()
+    assert naturalsize(1004650709) == '958.1 MiB'
+
+
+def test_humanize_rows():
+    rows = humanize_rows(iter([{'size': 3912090693}, {'size': None}]), {'size': 'human_size'})
+    assert rows == [{'size': 3912090693, 'human_size': '3.6 GiB'}, {'size': None, 'human_size': '0 Bytes'}]
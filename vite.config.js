@@ -1,17 +1,50 @@
 import { defineConfig } from "vite";
 import { resolve } from "path";
+import { readdirSync, readFileSync, writeFileSync } from "fs";
+import { brotliCompressSync, constants, gzipSync } from "zlib";
+
+const outDir = resolve(__dirname, "seedboxsync_front/static/dist");
+
+/**
+ * Write .gz and .br siblings of the text assets, served as is by Flask.
+ * @returns {import("vite").Plugin}
+ */
+function precompress() {
+  const compressible = /\.(js|css|svg|json|txt)$/;
+  return {
+    name: "precompress",
+    apply: "build",
+    closeBundle() {
+      for (const file of readdirSync(outDir, { recursive: true })) {
+        if (!compressible.test(file)) continue;
+        const path = resolve(outDir, file);
+        const data = readFileSync(path);
+        writeFileSync(`${path}.gz`, gzipSync(data, { level: 9 }));
+        writeFileSync(
+          `${path}.br`,
+          brotliCompressSync(data, {
+            params: { [constants.BROTLI_PARAM_QUALITY]: 11 },
+          }),
+        );
+      }
+    },
+  };
+}
 
 export default defineConfig({
   base: "/static/dist/",
+  plugins: [precompress()],
   build: {
-    outDir: resolve(__dirname, "seedboxsync_front/static/dist"),
+    outDir,
     emptyOutDir: true,
+    manifest: true,
     rollupOptions: {
       input: resolve(__dirname, "seedboxsync_front/static/src/main.js"),
       output: {
-        entryFileNames: `[name].js`,
-        chunkFileNames: `[name].js`,
-        assetFileNames: `[name].[ext]`,
+        // Hashed names are cached forever, see seedboxsync_front/compress.py
+        entryFileNames: `[name].[hash].js`,
+        chunkFileNames: `[name].[hash].js`,
+        assetFileNames: `[name].[hash].[ext]`,
       },
     },
   },